@@ -3,17 +3,25 @@ Simple demo prediction script.
 - Loads the first available model from `models/saved_models/` (*.pkl)
 - Accepts an optional input CSV path (features or raw) and creates features using `FeatureEngineer`
 - Writes predictions to `models/predictions/predictions_demo.csv`
+- With `--batch`, streams the input in chunks across worker processes (using the
+  feature pipeline saved at training time) and writes only id columns and scores
+- With `--batch --top-k K`, keeps only the K most likely hits per decade (optionally
+  among songs matching `--decades` / `--range` filters) and writes them as a ranked table
 
 Usage:
     python models/predictions/predict_demo.py [--input path/to/songs.csv] [--model models/saved_models/svm.pkl]
+    python models/predictions/predict_demo.py --per-decade "Random Forest"   # route songs to per-decade models
+    python models/predictions/predict_demo.py --batch --input catalog.csv --workers 8   # stream a large catalog
+    python models/predictions/predict_demo.py --batch --input catalog.csv --cache   # re-runs only score new songs
+    python models/predictions/predict_demo.py --batch --input catalog.csv --top-k 1000 --range tempo 100 140
 
 If no input is provided, two sample songs are used.
 """
 
 import argparse
+import logging
 import sys
 from pathlib import Path
-import joblib
 import pandas as pd
 
 # Add project root to path so we can import src modules
@@ -22,7 +30,10 @@ repo_root = Path(__file__).resolve().parents[2]
 if str(repo_root) not in sys.path:
     sys.path.insert(0, str(repo_root))
 
-from src.features.feature_engineer import FeatureEngineer
+from src.models.artifacts import load_artifact
+from src.serving.batch import BatchScorer
+from src.utils.config import load_config
+from src.utils.resources import ResourceGovernor
 
 
 def find_first_model(models_dir: Path):
@@ -40,7 +51,7 @@ def find_first_model(models_dir: Path):
 
 def load_model(path: Path):
     try:
-        return joblib.load(path)
+        return load_artifact(path)
     except Exception as e:
         print(f"Error loading model {path}: {e}")
         return None
@@ -75,31 +86,120 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--input", help="Path to input CSV with song rows (optional)")
     parser.add_argument("--model", help="Path to model .pkl to use (optional)")
+    parser.add_argument("--per-decade", metavar="MODEL_NAME", help="Score each song with its decade's model (trained with src/main.py --per-decade)")
+    parser.add_argument("--batch", action="store_true", help="Stream --input in chunks across worker processes, writing only ids and scores")
+    parser.add_argument("--output", help="Output CSV for --batch (default: models/predictions/batch_scores.csv)")
+    parser.add_argument("--fused", action="store_true", help="In --batch mode, score with the model's fused raw-column scorer (Logistic Regression)")
+    parser.add_argument("--cache", nargs="?", const="models/cache/predictions.sqlite", default=None, metavar="PATH",
+                        help="In --batch mode, keep scores in an on-disk prediction cache (default path: models/cache/predictions.sqlite)")
+    parser.add_argument("--cache-entries", type=int, default=100000, help="In-memory prediction cache size per worker with --cache")
+    parser.add_argument("--chunk-rows", type=int, default=50000, help="Songs per chunk in --batch mode")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes in --batch mode (default: the scoring thread budget)")
+    parser.add_argument("--id-columns", nargs="+", default=None, help="Input columns copied to the --batch output (default: id/uri/track/artist where present)")
+    parser.add_argument("--top-k", type=int, default=None, metavar="K",
+                        help="In --batch mode, keep only the K most likely hits per --partition (written to models/predictions/top_hits.csv by default)")
+    parser.add_argument("--partition", default="decade", help="Column --top-k ranks within ('none' ranks the whole catalog)")
+    parser.add_argument("--decades", nargs="+", default=None, help="With --top-k, only consider songs from these decades")
+    parser.add_argument("--range", nargs=3, action="append", default=[], metavar=("COLUMN", "LOW", "HIGH"),
+                        help="With --top-k, only consider songs with LOW <= COLUMN <= HIGH ('-' leaves a side open); repeatable")
+    parser.add_argument("--columns", nargs="+", default=None, help="Extra input columns copied to the --top-k table")
+    parser.add_argument("--cores", type=int, default=None, help="Total CPU cores scoring may use")
+    parser.add_argument("--blas-threads", type=int, default=None, help="Thread limit for BLAS/OpenMP libraries")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    resources = ResourceGovernor.from_config(load_config(), total_cores=args.cores, blas_threads=args.blas_threads)
+    resources.apply()
 
     models_dir = Path(repo_root) / "models" / "saved_models"
     output_dir = Path(repo_root) / "models" / "predictions"
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    model_path = Path(args.model) if args.model else None
-    if not model_path:
-        first = find_first_model(models_dir)
-        if not first:
+    if args.batch:
+        model_path = Path(args.model) if args.model else find_first_model(models_dir)
+        if not args.input or not Path(args.input).exists():
+            print("--batch needs an existing --input CSV.")
+            return
+        if not model_path:
             print(f"No models found in {models_dir}. Please train or add a model first.")
             return
-        model_path = first
-
-    model = load_model(model_path)
-    if model is None:
+        scorer = BatchScorer(model_path, models_dir, n_workers=args.workers, chunk_rows=args.chunk_rows,
+                             id_columns=args.id_columns, resources=resources, fused=args.fused,
+                             cache_entries=args.cache_entries if args.cache else 0,
+                             cache_path=Path(repo_root) / args.cache if args.cache else None)
+        if args.top_k:
+            output_file = Path(args.output) if args.output else output_dir / 'top_hits.csv'
+            values = {'decade': args.decades} if args.decades else None
+            ranges = {column: tuple(None if bound == '-' else float(bound) for bound in (low, high))
+                      for column, low, high in args.range}
+            partition = None if args.partition.lower() == 'none' else args.partition
+            try:
+                table, summary = scorer.top_k(args.input, args.top_k, partition, values, ranges, args.columns)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error during top-k scoring: {e}")
+                return
+            table.to_csv(output_file, index=False, float_format='%.6f')
+            print(f"Scored {summary['rows']} songs in {summary['seconds']:.1f}s, "
+                  f"peak RSS {summary['worker_peak_memory_mb'] or 0:.0f} MB per worker; kept the top {args.top_k}"
+                  f"{f' per {partition}' if partition else ''} ({summary['selected']} songs)")
+            print(table.head(10).to_string(index=False))
+            print(f"Ranked table saved to: {output_file}")
+            return
+        output_file = Path(args.output) if args.output else output_dir / 'batch_scores.csv'
+        try:
+            summary = scorer.score_csv(args.input, output_file)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error during batch scoring: {e}")
+            return
+        print(f"Scored {summary['rows']} songs in {summary['seconds']:.1f}s "
+              f"({summary['rows_per_second'] or 0:.0f} songs/s, {summary['workers']} workers, "
+              f"peak RSS {summary['worker_peak_memory_mb'] or 0:.0f} MB per worker, "
+              f"{summary['peak_memory_mb']:.0f} MB parent)")
+        if 'cache' in summary:
+            print(f"Prediction cache: {summary['cache']['misses']} songs scored, "
+                  f"hit rate {summary['cache']['hit_rate'] or 0:.1%}")
+        print(f"Scores saved to: {output_file}")
         return
 
+    if args.per_decade:
+        from src.models.partitioned import DecadeRouter
+
+        try:
+            model = DecadeRouter(args.per_decade, models_dir / "partitions")
+        except FileNotFoundError as e:
+            print(f"{e}. Train per-decade models with `python src/main.py --per-decade` first.")
+            return
+    else:
+        model_path = Path(args.model) if args.model else None
+        if not model_path:
+            first = find_first_model(models_dir)
+            if not first:
+                print(f"No models found in {models_dir}. Please train or add a model first.")
+                return
+            model_path = first
+
+        model = load_model(model_path)
+        if model is None:
+            return
+        resources.configure_model(model, 'scoring')
+
     # Prepare input
     input_path = Path(args.input) if args.input else None
     raw_df = prepare_input(input_path)
 
     # Feature engineering
-    fe = FeatureEngineer()
-    features_df = fe.create_features(raw_df)
+    from src.features.feature_engineer import FeatureEngineer
+
+    if args.per_decade:
+        # Partition models were trained on the saved training pipeline's features
+        fe_file = models_dir / 'preprocessing' / 'feature_engineer.pkl'
+        if not fe_file.exists():
+            print(f"No fitted feature pipeline at {fe_file}. Train with `python src/main.py --per-decade` first.")
+            return
+        features_df = FeatureEngineer.load(fe_file).transform(raw_df)
+    else:
+        fe = FeatureEngineer()
+        features_df = fe.create_features(raw_df)
 
     # Decide feature columns (exclude non-feature cols)
     exclude_cols = ['target', 'decade', 'uri', 'track', 'artist', 'id']
@@ -108,7 +208,10 @@ def main():
 
     # If model needs scaling or special handling, try to detect
     try:
-        if any(k in model.__class__.__name__.lower() for k in ['svc', 'svm', 'neural']):
+        if args.per_decade:
+            # The router picks (and scales for) each song's decade model itself
+            X_proc = features_df
+        elif any(k in model.__class__.__name__.lower() for k in ['svc', 'svm', 'neural']):
             from sklearn.preprocessing import StandardScaler
             scaler = StandardScaler()
             X_proc = scaler.fit_transform(X)
@@ -119,8 +222,9 @@ def main():
 
     # Predict
     try:
-        preds = model.predict(X_proc)
-        probs = model.predict_proba(X_proc)[:, 1] if hasattr(model, 'predict_proba') else [None] * len(preds)
+        with resources.limit('scoring'):
+            preds = model.predict(X_proc)
+            probs = model.predict_proba(X_proc)[:, 1] if hasattr(model, 'predict_proba') else [None] * len(preds)
     except Exception as e:
         print(f"Error during prediction: {e}")
         return
@@ -0,0 +1,251 @@
+"""
+Benchmark how training cost of every configured model scales with catalog size
+and feature width.
+
+This script:
+- Builds datasets at increasing row counts (at a fixed width) and increasing
+  feature widths (at a fixed row count), either subsampled from the engineered
+  training data or synthetic (`make_classification`).
+- Trains every model from `ModelTrainer.initialize_models()` through the
+  trainer's own fit path and records fit time, predict time, peak memory and
+  iterations used.
+- Fits an empirical scaling exponent per model (slope of log time vs log size
+  over the largest sizes) and extrapolates the catalog size at which a fit exceeds a time budget.
+- Saves `scalability.json` and `scalability.png` under the output directory.
+
+Usage:
+    python scripts/benchmark_scaling.py
+    python scripts/benchmark_scaling.py --source synthetic --rows 1000 4000 16000 64000 --widths 16 64 256
+    python scripts/benchmark_scaling.py --models "Random Forest" XGBoost --budget-seconds 600
+
+"""
+
+import argparse
+import json
+import logging
+from pathlib import Path
+import numpy as np
+import sys
+import matplotlib.pyplot as plt
+from sklearn.base import clone
+from sklearn.datasets import make_classification
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler
+
+# Make repo root importable
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from src.data.data_loader import DataLoader
+from src.features.feature_engineer import FeatureEngineer
+from src.models.model_trainer import ModelTrainer, SCALED_MODELS
+from src.utils.config import load_config
+from src.utils.resources import ResourceGovernor
+from src.utils.telemetry import TrainingTelemetry
+
+
+def load_base_matrix(source):
+    """Engineered feature matrix and target of the processed data, or None for synthetic data."""
+    if source == 'synthetic':
+        return None
+    combined_df, _, _ = DataLoader().load_processed_data()
+    features_df = FeatureEngineer().create_features(combined_df)
+    trainer = ModelTrainer()
+    matrix = trainer.build_training_matrix(features_df, train_indices=features_df.index, test_indices=[])
+    return matrix.X, matrix.y
+
+
+def make_dataset(base, n_rows, n_features, random_state=42):
+    """A (n_rows, n_features) float32 dataset with a binary target.
+
+    Real data is resampled with replacement past its own size; widths beyond the
+    engineered feature count are padded with jittered copies of existing columns.
+    """
+    rng = np.random.default_rng(random_state)
+    if base is None:
+        X, y = make_classification(
+            n_samples=n_rows, n_features=n_features, n_informative=max(2, min(10, n_features // 2)),
+            random_state=random_state
+        )
+        return X.astype(np.float32), y
+
+    X_base, y_base = base
+    rows = rng.choice(len(X_base), size=n_rows, replace=n_rows > len(X_base))
+    X = X_base[rows]
+    if n_features <= X.shape[1]:
+        X = X[:, :n_features]
+    else:
+        extra = rng.integers(X.shape[1], size=n_features - X.shape[1])
+        noise = rng.standard_normal((n_rows, len(extra)), dtype=np.float32) * X[:, extra].std(axis=0)
+        X = np.hstack([X, X[:, extra] + 0.1 * noise])
+    return np.ascontiguousarray(X, dtype=np.float32), y_base[rows]
+
+
+def benchmark_model(trainer, name, template, X, y, telemetry):
+    """Fit and score one fresh copy of a model; returns the measured run."""
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42, stratify=y)
+    if name in SCALED_MODELS:
+        scaler = StandardScaler()
+        X_train = scaler.fit_transform(X_train)
+        X_test = scaler.transform(X_test)
+
+    model = clone(template)
+    with trainer.resources.limit('training'), telemetry.measure(name, 'fit', shape=X_train.shape) as fit:
+        trainer._fit_model(name, model, X_train, y_train)
+        fit['n_iterations'] = trainer._iterations_used(model)
+    with trainer.resources.limit('evaluation'), telemetry.measure(name, 'predict', shape=X_test.shape) as predict:
+        predictions = model.predict(X_test)
+
+    return {
+        'model': name,
+        'rows': len(X),
+        'features': X.shape[1],
+        'fit_seconds': fit['wall_seconds'],
+        'fit_cpu_seconds': fit['cpu_seconds'],
+        'predict_seconds': predict['wall_seconds'],
+        'peak_rss_mb': max(fit['peak_rss_mb'], predict['peak_rss_mb']),
+        'rss_growth_mb': fit['peak_rss_mb'] - (fit['rss_start_mb'] or 0),
+        'n_iterations': fit['n_iterations'],
+        'accuracy': float((predictions == y_test).mean())
+    }
+
+
+def scaling_exponent(sizes, seconds, tail=3):
+    """Slope and intercept of log(seconds) against log(size); None with fewer than two points.
+
+    Only the `tail` largest sizes are used: at small sizes fixed overhead
+    dominates and flattens the curve, which would overstate feasibility.
+    """
+    order = np.argsort(sizes)[-tail:]
+    sizes, seconds = np.asarray(sizes, dtype=float)[order], np.asarray(seconds, dtype=float)[order]
+    keep = seconds > 0
+    if keep.sum() < 2:
+        return None
+    slope, intercept = np.polyfit(np.log(sizes[keep]), np.log(seconds[keep]), 1)
+    return float(slope), float(intercept)
+
+
+def summarize(runs, budget_seconds):
+    """Per-model exponents for fit/predict time over rows and width, plus extrapolated limits."""
+    scaling = {}
+    for name in dict.fromkeys(run['model'] for run in runs):
+        entry = {}
+        for sweep, size_key in (('rows', 'rows'), ('width', 'features')):
+            points = [run for run in runs if run['model'] == name and run['sweep'] == sweep and not run.get('skipped')]
+            sizes = [run[size_key] for run in points]
+            for measure in ('fit_seconds', 'predict_seconds'):
+                fit = scaling_exponent(sizes, [run[measure] for run in points])
+                entry[f'{sweep}_{measure.split("_")[0]}_exponent'] = None if fit is None else round(fit[0], 3)
+                if sweep == 'rows' and measure == 'fit_seconds' and fit is not None:
+                    # Rows at which one fit would take `budget_seconds`. Every fit reads
+                    # each row at least once, so growth is assumed to be at least linear.
+                    slope, intercept = fit
+                    largest = max(sizes)
+                    seconds_at_largest = np.exp(intercept) * largest ** slope
+                    entry['rows_at_budget'] = int(largest * (budget_seconds / seconds_at_largest) ** (1 / max(slope, 1.0)))
+        scaling[name] = entry
+    return scaling
+
+
+def plot_scaling(runs, scaling, path):
+    fig, axes = plt.subplots(1, 2, figsize=(14, 5))
+    for ax, sweep, size_key, label in ((axes[0], 'rows', 'rows', 'Rows'), (axes[1], 'width', 'features', 'Features')):
+        for name, entry in scaling.items():
+            points = [run for run in runs if run['model'] == name and run['sweep'] == sweep and not run.get('skipped')]
+            if not points:
+                continue
+            exponent = entry.get(f'{sweep}_fit_exponent')
+            legend = name if exponent is None else f'{name} (~n^{exponent:.2f})'
+            ax.loglog([run[size_key] for run in points], [run['fit_seconds'] for run in points], 'o-', label=legend)
+        ax.set_xlabel(label)
+        ax.set_ylabel('Fit time (s)')
+        ax.set_title(f'Fit time vs {label.lower()}')
+        ax.grid(True, which='both', alpha=0.3)
+        ax.legend(fontsize=8)
+    plt.tight_layout()
+    plt.savefig(path, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def run_benchmark(rows, widths, base_rows, base_width, output_dir: Path, source='real',
+                  models=None, max_seconds=300.0, budget_seconds=3600.0, resources=None):
+    output_dir.mkdir(parents=True, exist_ok=True)
+    trainer = ModelTrainer(resources=resources)
+    trainer.initialize_models()
+    templates = {name: model for name, model in trainer.models.items() if not models or name in models}
+
+    base = load_base_matrix(source)
+    telemetry = TrainingTelemetry()
+    sweeps = {
+        'rows': [(n, base_width) for n in sorted(rows)],
+        'width': [(base_rows, w) for w in sorted(widths)]
+    }
+
+    runs = []
+    for sweep, points in sweeps.items():
+        datasets = {point: make_dataset(base, *point) for point in points}
+        for name, template in templates.items():
+            too_slow = False
+            for n_rows, n_features in points:
+                if too_slow:
+                    # Larger sizes only get slower; record them as infeasible instead of running
+                    runs.append({'model': name, 'sweep': sweep, 'rows': n_rows, 'features': n_features, 'skipped': True})
+                    continue
+                print(f"{name}: {n_rows} rows x {n_features} features...")
+                try:
+                    run = benchmark_model(trainer, name, template, *datasets[(n_rows, n_features)], telemetry)
+                except Exception as e:
+                    print(f"Error benchmarking {name}: {e}")
+                    continue
+                runs.append({**run, 'sweep': sweep})
+                too_slow = run['fit_seconds'] > max_seconds
+
+    scaling = summarize(runs, budget_seconds)
+    results = {
+        'config': {
+            'source': source, 'rows': sorted(rows), 'widths': sorted(widths), 'base_rows': base_rows,
+            'base_width': base_width, 'max_seconds': max_seconds, 'budget_seconds': budget_seconds
+        },
+        'runs': runs,
+        'scaling': scaling
+    }
+    json_path = output_dir / 'scalability.json'
+    with open(json_path, 'w') as f:
+        json.dump(results, f, indent=2)
+    plot_scaling(runs, scaling, output_dir / 'scalability.png')
+
+    for name, entry in scaling.items():
+        print(f"{name}: fit ~ rows^{entry.get('rows_fit_exponent')}, features^{entry.get('width_fit_exponent')}; "
+              f"{budget_seconds:.0f}s budget reached at ~{entry.get('rows_at_budget', 'n/a')} rows")
+    print(f"Scalability results saved under {output_dir}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--source', choices=['real', 'synthetic'], default='real', help='Subsample the processed data or generate synthetic data')
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 2000, 4000, 8000, 16000], help='Row counts for the row sweep')
+    parser.add_argument('--widths', type=int, nargs='+', default=[16, 32, 64, 128], help='Feature counts for the width sweep')
+    parser.add_argument('--base-rows', type=int, default=4000, help='Row count used in the width sweep')
+    parser.add_argument('--base-width', type=int, default=64, help='Feature count used in the row sweep')
+    parser.add_argument('--models', nargs='+', default=None, help='Only benchmark these models (names as in ModelTrainer)')
+    parser.add_argument('--max-seconds', type=float, default=300.0, help='Stop growing a model once one fit takes longer than this')
+    parser.add_argument('--budget-seconds', type=float, default=3600.0, help='Training window used to extrapolate the largest feasible catalog')
+    parser.add_argument('--output-dir', default='reports/benchmarks', help='Directory for scalability.json and scalability.png')
+    parser.add_argument('--cores', type=int, default=None, help='Total CPU cores the benchmark may use')
+    parser.add_argument('--blas-threads', type=int, default=None, help='Thread limit for BLAS/OpenMP libraries')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    resources = ResourceGovernor.from_config(load_config(), total_cores=args.cores, blas_threads=args.blas_threads)
+    resources.apply()
+    run_benchmark(
+        args.rows, args.widths, args.base_rows, args.base_width, Path(args.output_dir),
+        source=args.source, models=args.models, max_seconds=args.max_seconds,
+        budget_seconds=args.budget_seconds, resources=resources
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -4,8 +4,13 @@ Generate a full evaluation report: metrics table, plots, and a markdown summary.
 This script:
 - Loads trained models from `models/saved_models/`.
 - Loads processed test data using `DataLoader`.
-- Applies `FeatureEngineer` to create features.
-- Runs each model on the test set and computes metrics with `ModelEvaluator`.
+- Applies the `FeatureEngineer` fitted at training time (`preprocessing/feature_engineer.pkl`)
+  to create features; one is fitted on the test data only when none was saved.
+- Scores the test set with all models at once (`MultiModelScorer`: one shared
+  feature matrix, one scaled copy for the SVM / neural network, models run
+  concurrently) and computes metrics with `ModelEvaluator`.
+- Collects predictions and probabilities in a columnar `ResultsStore` (one shared
+  `y_test`, float32 probability columns) spilled to `reports/final_report/results/`.
 - Saves a CSV (`reports/final_report/metrics_summary.csv`) and a markdown table
   (`reports/final_report/metrics_summary.md`) with the results.
 - Calls existing Plotter/ModelEvaluator to create confusion matrices, ROC curves,
@@ -18,9 +23,8 @@ Usage:
 """
 
 import argparse
+import logging
 from pathlib import Path
-import pandas as pd
-import joblib
 import sys
 
 # Make repo root importable
@@ -31,14 +35,22 @@ if str(repo_root) not in sys.path:
 from src.data.data_loader import DataLoader
 from src.features.feature_engineer import FeatureEngineer
 from src.models.model_evaluator import ModelEvaluator
+from src.models.artifacts import load_artifact
+from src.models.results_store import ResultsStore
+from src.serving.multi_model import MultiModelScorer, load_scalers
 from src.visualization.plotter import Plotter
+from src.utils.config import load_config
+from src.utils.resources import ResourceGovernor
+
+logger = logging.getLogger(__name__)
 
 
 def find_models(models_dir: Path):
     return sorted(models_dir.glob('*.pkl'))
 
 
-def run_evaluation(models_dir: Path, output_dir: Path):
+def run_evaluation(models_dir: Path, output_dir: Path, resources=None):
+    resources = resources or ResourceGovernor()
     output_dir.mkdir(parents=True, exist_ok=True)
     figures_dir = Path('reports/figures')
     figures_dir.mkdir(parents=True, exist_ok=True)
@@ -53,11 +65,18 @@ def run_evaluation(models_dir: Path, output_dir: Path):
     else:
         data_df = combined_df.sample(frac=0.25, random_state=42)
 
-    fe = FeatureEngineer()
-    features_df = fe.create_features(data_df)
+    # The pipeline fitted at training time, so the saved scalers and models see
+    # the features they were trained on
+    fe_file = models_dir / 'preprocessing' / 'feature_engineer.pkl'
+    if fe_file.exists():
+        fe = FeatureEngineer.load(fe_file)
+        features_df = fe.transform(data_df)
+    else:
+        logger.warning(f"No saved feature pipeline at {fe_file}; fitting one on the evaluation data")
+        fe = FeatureEngineer()
+        features_df = fe.create_features(data_df)
 
-    exclude_cols = ['target', 'decade', 'uri', 'track', 'artist', 'id']
-    feature_columns = [c for c in features_df.columns if c not in exclude_cols]
+    feature_columns = fe.feature_columns
     X_test = features_df[feature_columns]
     y_test = features_df['target']
 
@@ -69,46 +88,48 @@ def run_evaluation(models_dir: Path, output_dir: Path):
     evaluator = ModelEvaluator()
     plotter = Plotter()
 
-    rows = []
-    results = {}
+    results = ResultsStore(spill_path=output_dir / 'results')
 
+    models = {}
     for model_file in model_files:
-        name = model_file.stem
-        print(f"Evaluating {name}...")
         try:
-            model = joblib.load(model_file)
+            models[model_file.stem] = load_artifact(model_file)
         except Exception as e:
             print(f"Failed to load {model_file}: {e}")
-            continue
+    if not models:
+        print("No model could be evaluated")
+        return
 
-        # Handle scaling if necessary
-        X_proc = X_test
-        if any(k in name.lower() for k in ['svm', 'neural']):
-            from sklearn.preprocessing import StandardScaler
-            scaler = StandardScaler()
-            X_proc = scaler.fit_transform(X_test)
+    # Saved input scalers (one fitted on the test set for the SVM / neural network otherwise)
+    scalers = load_scalers(models, X_test, models_dir)
+    scorer = MultiModelScorer(models, scalers, feature_columns, resources=resources, stage='evaluation')
+    print(f"Evaluating {', '.join(models)}...")
+    scored = scorer.run(X_test, labels=True)
 
-        try:
-            y_pred = model.predict(X_proc)
-            y_proba = model.predict_proba(X_proc)[:, 1] if hasattr(model, 'predict_proba') else None
-        except Exception as e:
-            print(f"Error predicting with {name}: {e}")
+    for name, model in models.items():
+        if name not in scored:
+            print(f"Error predicting with {name}")
             continue
+        y_proba, y_pred = scored[name]
+        y_proba = y_proba if hasattr(model, 'predict_proba') else None
 
         metrics = evaluator.calculate_metrics(y_test, y_pred, y_proba)
-        rows.append({
-            'model': name,
-            **metrics
-        })
-
-        # Save per-model results for plotting
-        results[name] = {'model': model, 'y_pred': y_pred, 'y_proba': y_proba, 'accuracy': metrics.get('accuracy', 0.0), 'cv_mean': metrics.get('accuracy', 0.0)}
+        results.add(
+            name, model=model, y_test=y_test, predictions=y_pred, probabilities=y_proba,
+            feature_importance=getattr(model, 'feature_importances_', None), **metrics
+        )
 
         # Save detailed visuals
-        evaluator.generate_detailed_report(y_test, y_pred, y_proba, name)
+        stored = results[name]
+        evaluator.generate_detailed_report(stored['y_test'], stored['predictions'], stored['probabilities'], name)
+
+    if not results:
+        print("No model could be evaluated")
+        return
+    results.spill()
 
     # Create summary table
-    summary_df = pd.DataFrame(rows).sort_values('accuracy', ascending=False)
+    summary_df = results.metrics_frame().sort_values('accuracy', ascending=False)
     csv_path = output_dir / 'metrics_summary.csv'
     md_path = output_dir / 'metrics_summary.md'
     summary_df.to_csv(csv_path, index=False)
@@ -127,7 +148,9 @@ def run_evaluation(models_dir: Path, output_dir: Path):
                 f.write('| ' + ' | '.join([str(row[c]) for c in cols]) + ' |\n')
         f.write('\n')
 
-    # Create comparative plots using plotter
+    # Create comparative plots using plotter (no CV here: compare test accuracy only)
+    for metrics in results.metrics.values():
+        metrics.setdefault('cv_mean', metrics['accuracy'])
     plotter.create_comprehensive_plots(features_df, results)
 
     # Create a small report file referencing outputs
@@ -148,9 +171,14 @@ def main():
     parser = argparse.ArgumentParser()
     parser.add_argument('--models-dir', default='models/saved_models', help='Directory with saved models')
     parser.add_argument('--output-dir', default='reports/final_report', help='Directory to put summary and report')
+    parser.add_argument('--cores', type=int, default=None, help='Total CPU cores evaluation may use')
+    parser.add_argument('--blas-threads', type=int, default=None, help='Thread limit for BLAS/OpenMP libraries')
     args = parser.parse_args()
 
-    run_evaluation(Path(args.models_dir), Path(args.output_dir))
+    logging.basicConfig(level=logging.INFO)
+    resources = ResourceGovernor.from_config(load_config(), total_cores=args.cores, blas_threads=args.blas_threads)
+    resources.apply()
+    run_evaluation(Path(args.models_dir), Path(args.output_dir), resources=resources)
 
 
 if __name__ == '__main__':
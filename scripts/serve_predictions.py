@@ -0,0 +1,77 @@
+"""
+Run the local HTTP scoring service.
+
+This script:
+- Loads the fitted feature pipeline, one saved model and its scaler once
+- Serves hit probabilities over HTTP, coalescing concurrent requests into
+  micro-batches (at most `--max-batch-size` songs, waiting at most `--max-wait-ms`)
+- Caches scores per raw song row (in memory, plus on disk with `--cache-path`)
+- Reports request throughput, p50/p99 latency and cache hit rates at `/stats` and on shutdown
+
+Usage:
+    python scripts/serve_predictions.py
+    python scripts/serve_predictions.py --model XGBoost --port 8080 --max-wait-ms 2
+    python scripts/serve_predictions.py --model "Logistic Regression" --fused
+
+    curl -s localhost:8000/predict -d '{"songs": [{"danceability": 0.8, "energy": 0.9, ...}]}'
+    curl -s localhost:8000/stats
+
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Make repo root importable
+repo_root = Path(__file__).resolve().parents[1]
+if str(repo_root) not in sys.path:
+    sys.path.insert(0, str(repo_root))
+
+from src.serving.service import ScoringServer, SongScorer
+from src.utils.config import load_config
+from src.utils.resources import ResourceGovernor
+
+
+def main():
+    config = load_config()
+    serving = config.get('serving') or {}
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--model', default=serving.get('model', 'Random Forest'), help='Model name (as in ModelTrainer) or path to a saved .pkl')
+    parser.add_argument('--fused', action='store_true', help="Score with the model's fused raw-column scorer (Logistic Regression)")
+    parser.add_argument('--models-dir', default='models/saved_models', help='Directory with saved models and preprocessing/')
+    parser.add_argument('--host', default=serving.get('host', '127.0.0.1'))
+    parser.add_argument('--port', type=int, default=serving.get('port', 8000))
+    parser.add_argument('--max-batch-size', type=int, default=serving.get('max_batch_size', 512), help='Score a batch as soon as this many songs are queued')
+    parser.add_argument('--max-wait-ms', type=float, default=serving.get('max_wait_ms', 5), help='Longest a request waits for others to join its batch')
+    parser.add_argument('--cache-entries', type=int, default=serving.get('cache_entries', 100000), help='In-memory prediction cache size (0 disables)')
+    parser.add_argument('--cache-path', default=serving.get('cache_path'), help='SQLite file for the persistent prediction cache tier')
+    parser.add_argument('--cores', type=int, default=None, help='Total CPU cores scoring may use')
+    parser.add_argument('--blas-threads', type=int, default=None, help='Thread limit for BLAS/OpenMP libraries')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    resources = ResourceGovernor.from_config(config, total_cores=args.cores, blas_threads=args.blas_threads)
+    resources.apply()
+
+    try:
+        scorer = SongScorer(args.model, args.models_dir, resources=resources, fused=args.fused,
+                            cache_entries=args.cache_entries, cache_path=args.cache_path)
+    except FileNotFoundError as e:
+        print(f"{e}. Train models with `python src/main.py` first.")
+        return
+
+    server = ScoringServer(scorer, args.host, args.port, args.max_batch_size, args.max_wait_ms)
+    print(f"Scoring service for {scorer.model_name} listening on http://{args.host}:{args.port} "
+          f"(batches of up to {args.max_batch_size} songs, {args.max_wait_ms} ms max wait)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
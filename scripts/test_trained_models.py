@@ -3,13 +3,11 @@ Test trained models and make predictions.
 """
 
 import pandas as pd
-import numpy as np
 from pathlib import Path
 import sys
-import joblib
-from sklearn.metrics import classification_report, confusion_matrix, accuracy_score
-import matplotlib.pyplot as plt
-import seaborn as sns
+import argparse
+import logging
+from sklearn.metrics import accuracy_score
 
 # Ensure repository root is on sys.path so we can import `src` (script may be run from scripts/)
 repo_root = Path(__file__).resolve().parents[1]
@@ -19,6 +17,10 @@ if str(repo_root) not in sys.path:
 from src.data.data_loader import DataLoader
 from src.features.feature_engineer import FeatureEngineer
 from src.models.model_evaluator import ModelEvaluator
+from src.models.artifacts import load_artifact
+from src.serving.multi_model import MultiModelScorer, load_scalers
+
+logger = logging.getLogger(__name__)
 
 def load_trained_models():
     """Load all trained models from the models directory."""
@@ -39,7 +41,7 @@ def load_trained_models():
     for model_file in model_files:
         try:
             model_name = model_file.stem.replace('_', ' ').title()
-            model = joblib.load(model_file)
+            model = load_artifact(model_file)
             models[model_name] = model
             print(f"   ✅ {model_name}")
         except Exception as e:
@@ -47,123 +49,88 @@ def load_trained_models():
     
     return models
 
-def test_models_on_data(models, X_test, y_test, feature_columns):
-    """Test all models on test data and return results."""
+def test_models_on_data(models, X_test, y_test, feature_columns, scalers=None):
+    """Test all models on test data and return results.
+
+    The feature matrix is built (and scaled) once and all models score it concurrently.
+    """
     results = {}
     evaluator = ModelEvaluator()
     
     print(f"\n🎯 Testing Models on {len(X_test)} samples")
     print("=" * 50)
+
+    scorer = MultiModelScorer(models, scalers, feature_columns)
+    scored = scorer.run(X_test, labels=True)
     
     for model_name, model in models.items():
         print(f"\n🧪 Testing {model_name}...")
-        
-        try:
-            # Prepare features (scale if needed for SVM/Neural Network)
-            if any(keyword in model_name.lower() for keyword in ['svm', 'neural']):
-                from sklearn.preprocessing import StandardScaler
-                scaler = StandardScaler()
-                X_test_scaled = scaler.fit_transform(X_test)
-                y_pred = model.predict(X_test_scaled)
-                y_pred_proba = model.predict_proba(X_test_scaled)[:, 1] if hasattr(model, "predict_proba") else None
-            else:
-                y_pred = model.predict(X_test)
-                y_pred_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+        if model_name not in scored:
+            print(f"   ❌ Error testing {model_name} (see log)")
+            continue
+        y_pred_proba, y_pred = scored[model_name]
+        if not hasattr(model, "predict_proba"):
+            y_pred_proba = None
             
-            # Calculate metrics
-            accuracy = accuracy_score(y_test, y_pred)
-            
-            # Store results
-            results[model_name] = {
-                'model': model,
-                'accuracy': accuracy,
-                'predictions': y_pred,
-                'probabilities': y_pred_proba,
-                'y_test': y_test
-            }
-            
-            print(f"   ✅ Accuracy: {accuracy:.3f}")
-            
-            # Generate detailed report for the best performing models
-            if accuracy > 0.6:  # Only for reasonably good models
-                evaluator.generate_detailed_report(y_test, y_pred, y_pred_proba, model_name)
-            
-        except Exception as e:
-            print(f"   ❌ Error testing {model_name}: {e}")
+        # Calculate metrics
+        accuracy = accuracy_score(y_test, y_pred)
+        
+        # Store results
+        results[model_name] = {
+            'model': model,
+            'accuracy': accuracy,
+            'predictions': y_pred,
+            'probabilities': y_pred_proba,
+            'y_test': y_test
+        }
+        
+        print(f"   ✅ Accuracy: {accuracy:.3f} ({scorer.timings[model_name]:.2f}s)")
+        
+        # Generate detailed report for the best performing models
+        if accuracy > 0.6:  # Only for reasonably good models
+            evaluator.generate_detailed_report(y_test, y_pred, y_pred_proba, model_name)
     
     return results
 
-def make_predictions_on_new_data(models, feature_engineer, reference_feature_columns):
-    """Make predictions on new sample data."""
+SAMPLE_SONGS = [
+    {
+        'danceability': 0.8, 'energy': 0.9, 'loudness': -5.0,
+        'speechiness': 0.05, 'acousticness': 0.1, 'instrumentalness': 0.0,
+        'liveness': 0.2, 'valence': 0.9, 'tempo': 120, 'duration_ms': 200000,
+        'chorus_hit': 45.2, 'sections': 4, 'decade': '10s'
+    },
+    {
+        'danceability': 0.3, 'energy': 0.4, 'loudness': -15.0,
+        'speechiness': 0.8, 'acousticness': 0.9, 'instrumentalness': 0.1,
+        'liveness': 0.1, 'valence': 0.3, 'tempo': 80, 'duration_ms': 300000,
+        'chorus_hit': 20.1, 'sections': 6, 'decade': '10s'
+    }
+]
+
+def score_songs(models, feature_engineer, songs, reference_feature_columns, scalers=None, ensemble='mean'):
+    """Hit probability of every song under every model, as a table (one row per song).
+
+    Features are engineered once for all songs with the already fitted pipeline and
+    the models score the shared matrix concurrently; `hit_votes` counts the models
+    voting hit and `ensemble` is their mean probability (or vote share with 'vote').
+    """
+    scorer = MultiModelScorer(models, scalers, reference_feature_columns, ensemble=ensemble,
+                              feature_engineer=feature_engineer)
+    return scorer.score_songs(songs)
+
+def make_predictions_on_new_data(models, feature_engineer, reference_feature_columns, songs=None, scalers=None):
+    """Make predictions on new songs (the built-in sample songs by default)."""
     print(f"\n🎵 Making Predictions on Sample Songs")
     print("=" * 50)
-    
-    # Create sample song data
-    sample_songs = [
-        {
-            'danceability': 0.8, 'energy': 0.9, 'loudness': -5.0, 
-            'speechiness': 0.05, 'acousticness': 0.1, 'instrumentalness': 0.0,
-            'liveness': 0.2, 'valence': 0.9, 'tempo': 120, 'duration_ms': 200000,
-            'chorus_hit': 45.2, 'sections': 4, 'decade': '10s'
-        },
-        {
-            'danceability': 0.3, 'energy': 0.4, 'loudness': -15.0,
-            'speechiness': 0.8, 'acousticness': 0.9, 'instrumentalness': 0.1,
-            'liveness': 0.1, 'valence': 0.3, 'tempo': 80, 'duration_ms': 300000,
-            'chorus_hit': 20.1, 'sections': 6, 'decade': '10s'
-        }
-    ]
-    
-    sample_df = pd.DataFrame(sample_songs)
-    
-    # Apply feature engineering
-    sample_features = feature_engineer.create_features(sample_df)
 
-    # Ensure the sample features have the same columns that models were trained on
-    # Missing columns (e.g., one-hot decade columns) will be filled with zeros
-    X_sample = sample_features.reindex(columns=reference_feature_columns, fill_value=0)
-    
-    print("Sample Song 1 (High energy, danceable):")
-    for model_name, model in models.items():
-        try:
-            if any(keyword in model_name.lower() for keyword in ['svm', 'neural']):
-                from sklearn.preprocessing import StandardScaler
-                scaler = StandardScaler()
-                X_scaled = scaler.fit_transform(X_sample)
-                # X_scaled is a numpy array; index with [[]]
-                prediction = model.predict(X_scaled[[0]])[0]
-                probability = model.predict_proba(X_scaled[[0]])[0, 1] if hasattr(model, "predict_proba") else None
-            else:
-                # For tree-based models, pass a DataFrame row
-                prediction = model.predict(X_sample.iloc[[0]])[0]
-                probability = model.predict_proba(X_sample.iloc[[0]])[0, 1] if hasattr(model, "predict_proba") else None
-            
-            result = "HIT 🎵" if prediction == 1 else "Non-hit"
-            confidence = f" ({probability:.1%})" if probability is not None else ""
-            print(f"   {model_name}: {result}{confidence}")
-            
-        except Exception as e:
-            print(f"   {model_name}: Error - {e}")
-    
-    print("\nSample Song 2 (Low energy, acoustic):")
-    for model_name, model in models.items():
-        try:
-            if any(keyword in model_name.lower() for keyword in ['svm', 'neural']):
-                from sklearn.preprocessing import StandardScaler
-                scaler = StandardScaler()
-                X_scaled = scaler.fit_transform(X_sample)
-                prediction = model.predict(X_scaled[[1]])[0]
-                probability = model.predict_proba(X_scaled[[1]])[0, 1] if hasattr(model, "predict_proba") else None
-            else:
-                prediction = model.predict(X_sample.iloc[[1]])[0]
-                probability = model.predict_proba(X_sample.iloc[[1]])[0, 1] if hasattr(model, "predict_proba") else None
-            
-            result = "HIT 🎵" if prediction == 1 else "Non-hit"
-            confidence = f" ({probability:.1%})" if probability is not None else ""
-            print(f"   {model_name}: {result}{confidence}")
-            
-        except Exception as e:
-            print(f"   {model_name}: Error - {e}")
+    songs = SAMPLE_SONGS if songs is None else songs
+    table = score_songs(models, feature_engineer, songs, reference_feature_columns, scalers)
+
+    print(f"Hit probability per model ({len(table)} songs, {len(models)} models):")
+    print(table.head(20).to_string(float_format=lambda p: f"{p:.1%}"))
+    if len(table) > 20:
+        print(f"   ... {len(table) - 20} more songs")
+    return table
 
 def analyze_feature_importance(models, feature_columns):
     """Analyze feature importance for tree-based models."""
@@ -186,6 +153,10 @@ def analyze_feature_importance(models, feature_columns):
                 print(f"   {row['feature']}: {row['importance']:.3f}")
             
             # Plot feature importance
+            import matplotlib.pyplot as plt
+            import seaborn as sns
+
+            Path('reports/figures').mkdir(parents=True, exist_ok=True)
             plt.figure(figsize=(10, 6))
             sns.barplot(data=importance_df.head(15), x='importance', y='feature')
             plt.title(f'Top 15 Feature Importance - {model_name}')
@@ -195,6 +166,11 @@ def analyze_feature_importance(models, feature_columns):
             plt.close()
 
 def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--songs", help="CSV of candidate songs to score (default: two built-in sample songs)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
     print("🎵 Testing Trained Hit Song Prediction Models")
     print("=" * 60)
     
@@ -217,19 +193,28 @@ def main():
         from sklearn.model_selection import train_test_split
         test_data = combined_df.sample(frac=0.25, random_state=42)
     
-    # Feature engineering
-    feature_engineer = FeatureEngineer()
-    features_df = feature_engineer.create_features(test_data)
+    # Feature engineering with the pipeline fitted at training time, so the saved
+    # scalers and models see the features they were trained on
+    fe_file = Path("models/saved_models/preprocessing/feature_engineer.pkl")
+    if fe_file.exists():
+        feature_engineer = FeatureEngineer.load(fe_file)
+        features_df = feature_engineer.transform(test_data)
+    else:
+        logger.warning(f"No saved feature pipeline at {fe_file}; fitting one on the test split")
+        feature_engineer = FeatureEngineer()
+        features_df = feature_engineer.create_features(test_data)
     
     # Prepare features for testing
-    exclude_cols = ['target', 'decade', 'uri', 'track', 'artist', 'id']
-    feature_columns = [col for col in features_df.columns if col not in exclude_cols]
+    feature_columns = feature_engineer.feature_columns
     
     X_test = features_df[feature_columns]
     y_test = features_df['target']
     
+    # Scalers are loaded (or fitted) once and shared by every scoring call
+    scalers = load_scalers(models, X_test)
+
     # Test models
-    results = test_models_on_data(models, X_test, y_test, feature_columns)
+    results = test_models_on_data(models, X_test, y_test, feature_columns, scalers)
     
     if results:
         # Find best model
@@ -243,7 +228,8 @@ def main():
         analyze_feature_importance(models, feature_columns)
         
         # Make predictions on sample data
-        make_predictions_on_new_data(models, feature_engineer, feature_columns)
+        songs = pd.read_csv(args.songs) if args.songs else None
+        make_predictions_on_new_data(models, feature_engineer, feature_columns, songs, scalers)
 
         print(f"\n✅ Model testing completed!")
         print(f"📊 Check 'reports/figures/' for detailed analysis charts")
@@ -6,10 +6,16 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import StandardScaler
 from sklearn.decomposition import PCA
+import joblib
 import logging
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+# Audio features combined pairwise into ratio features
+INTERACTION_FEATURES = ['danceability', 'energy', 'valence', 'acousticness',
+                        'instrumentalness', 'liveness', 'speechiness']
+
 class FeatureEngineer:
     def __init__(self):
         self.scaler = StandardScaler()
@@ -20,10 +26,7 @@ class FeatureEngineer:
         features_df = df.copy()
         
         # Audio feature interactions
-        audio_features = ['danceability', 'energy', 'valence', 'acousticness', 
-                         'instrumentalness', 'liveness', 'speechiness']
-        
-        available_audio = [f for f in audio_features if f in df.columns]
+        available_audio = [f for f in INTERACTION_FEATURES if f in df.columns]
         
         for feat in available_audio:
             for other_feat in available_audio:
@@ -78,6 +81,7 @@ class FeatureEngineer:
         # Scale only numerical features
         numerical_features = features_df[feature_columns].select_dtypes(include=[np.number]).columns
         features_df[numerical_features] = self.scaler.fit_transform(features_df[numerical_features])
+        self.scaled_columns = list(numerical_features)
         
         return features_df
     
@@ -109,4 +113,51 @@ class FeatureEngineer:
         self.feature_columns = feature_columns
         logger.info(f"Feature engineering complete. Final dataset shape: {features_df.shape}")
         
-        return features_df
\ No newline at end of file
+        return features_df
+    
+    def input_columns(self):
+        """Raw columns the fitted pipeline reads to build its feature columns
+        (the decade column is optional: its indicators are then all zero)."""
+        sources = {f'{a}_{b}_ratio': [a, b] for a in INTERACTION_FEATURES for b in INTERACTION_FEATURES if a != b}
+        sources['energy_dance_composite'] = ['energy', 'danceability']
+        sources['acoustic_energy_ratio'] = ['acousticness', 'energy']
+        for column in ['duration_minutes', 'is_short_song', 'is_medium_song', 'is_long_song']:
+            sources[column] = ['duration_ms']
+
+        columns = []
+        for column in self.feature_columns:
+            if column.startswith('decade_'):
+                continue
+            columns.extend(c for c in sources.get(column, [column]) if c not in columns)
+        return columns
+
+    def transform(self, df):
+        """Apply the already fitted pipeline to new rows, keeping the training feature layout."""
+        if not hasattr(self, 'feature_columns'):
+            raise ValueError("FeatureEngineer has not been fitted; call create_features first")
+        
+        features_df = self.create_interaction_features(df)
+        features_df = self.create_temporal_features(features_df)
+        features_df = self.create_decade_features(features_df)
+        
+        # Decades unseen in this batch become all-zero dummy columns
+        passthrough = [col for col in features_df.columns if col not in self.feature_columns]
+        features_df = pd.concat([
+            features_df[passthrough],
+            features_df.reindex(columns=self.feature_columns, fill_value=0)
+        ], axis=1)
+        features_df[self.scaled_columns] = self.scaler.transform(features_df[self.scaled_columns])
+        
+        return features_df
+    
+    def save(self, path):
+        """Save the fitted feature pipeline."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        logger.info(f"Saved feature engineer: {path}")
+    
+    @staticmethod
+    def load(path):
+        """Load a fitted feature pipeline saved with `save`."""
+        return joblib.load(path)
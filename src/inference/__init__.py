@@ -0,0 +1,9 @@
+"""
+Lightweight inference runtime that depends only on NumPy.
+"""
+
+from .trees import CompactTreeEnsemble
+from .linear import FusedLinearScorer
+from .runtime import InferenceBundle
+
+__all__ = ["CompactTreeEnsemble", "FusedLinearScorer", "InferenceBundle"]
\ No newline at end of file
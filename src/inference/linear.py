@@ -0,0 +1,82 @@
+"""
+Fused feature-engineering + linear scoring with NumPy only.
+
+A logistic regression trained on `FeatureEngineer` output is a weighted sum of
+engineered features, each of which is a simple function of the raw song
+columns. Folding the fitted standardization into the weights turns the whole
+pipeline into one pass over the raw columns:
+
+    margin = intercept
+           + X @ linear                                   raw columns
+           + sum_j (X @ ratio[:, j]) / (X[:, den_j] + eps)  ratio features
+           + sum_k w_k * X[:, a_k] * X[:, b_k]            product features
+           + duration[short / medium / long]               duration categories
+           + categories[decade]                            decade one-hot columns
+
+The scorer is stored as one JSON file (`<stem>.fused.json`).
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+
+from src.inference.songs import raw_columns
+
+FORMAT_VERSION = 1
+EPSILON = 1e-8
+
+
+class FusedLinearScorer:
+    def __init__(self, meta):
+        self.meta = meta
+        self.inputs = meta['inputs']
+        self.intercept = meta['intercept']
+        self.linear = np.array(meta['linear'], dtype=np.float64)
+        self.ratio_denominators = np.array(meta['ratio_denominators'], dtype=np.int64)
+        self.ratio = np.array(meta['ratio'], dtype=np.float64).reshape(len(self.inputs), -1)
+        self.products = [(int(a), int(b), float(w)) for a, b, w in meta['products']]
+        self.duration = meta.get('duration')
+        self.category_column = meta.get('category_column')
+        self.categories = meta.get('categories', {})
+        self.classes_ = np.array(meta.get('classes', [0, 1]))
+
+    def decision_function(self, songs):
+        """Logistic-regression margin for every song, straight from the raw columns."""
+        X, category = raw_columns(songs, self.inputs, self.category_column)
+        margin = X @ self.linear + self.intercept
+        if len(self.ratio_denominators):
+            margin += ((X @ self.ratio) / (X[:, self.ratio_denominators] + EPSILON)).sum(axis=1)
+        for a, b, weight in self.products:
+            margin += weight * X[:, a] * X[:, b]
+        if self.duration is not None:
+            minutes = X[:, self.duration['input']] / 60000
+            # Short (< 3 min), medium (3-5 min inclusive) and long (> 5 min) songs
+            margin += self.duration['short'] * (minutes < 3)
+            margin += self.duration['medium'] * ((minutes >= 3) & (minutes <= 5))
+            margin += self.duration['long'] * (minutes > 5)
+        if self.categories and category is not None:
+            values, inverse = np.unique(category, return_inverse=True)
+            margin += np.array([self.categories.get(v, 0.0) for v in values])[inverse]
+        return margin
+
+    def predict_proba(self, songs):
+        proba = 1 / (1 + np.exp(-self.decision_function(songs)))
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, songs):
+        return self.classes_[(self.decision_function(songs) > 0).astype(int)]
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({**self.meta, 'format_version': FORMAT_VERSION}, f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported fused linear format: {meta.get('format_version')}")
+        return cls(meta)
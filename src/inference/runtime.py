@@ -0,0 +1,229 @@
+"""
+Dependency-light scoring runtime: raw song rows in, hit probabilities out,
+with NumPy as the only dependency.
+
+An inference bundle (`<stem>.bundle/`, written by `src.models.bundle_export`)
+holds everything between the raw CSV columns and the probability:
+
+    bundle.json   format version, the feature spec and the model parameters
+                  (logistic regression, neural network or RBF SVM)
+    trees/        compact tree-ensemble artifact (`src.inference.trees`) for
+                  random forests, gradient boosting and XGBoost
+
+The feature spec replays `FeatureEngineer.transform`: every engineered column
+is a raw input, a ratio or product of two inputs, a duration feature or a
+decade indicator. The fitted standardization and the model's own input scaler
+follow, with the same float64 / float32 steps as the training code, so the
+probabilities match the pickled pipeline.
+
+    bundle = InferenceBundle.load('models/saved_models/random_forest.bundle')
+    bundle.predict_proba(songs)[:, 1]     # songs: list of dicts or a DataFrame
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+
+from src.inference.trees import CompactTreeEnsemble
+from src.inference.songs import raw_columns
+
+FORMAT_VERSION = 1
+EPSILON = 1e-8
+# Rows per block for the (rows x support vectors) kernel matrix
+KERNEL_BLOCK_ROWS = 1024
+
+
+def _logistic(margin):
+    return 1 / (1 + np.exp(-margin))
+
+
+class FeatureSpec:
+    """NumPy replay of the fitted feature pipeline (plus a model's input scaler).
+
+    `spec['features']` lists `[column, kind, *args]` in model input order, where
+    kind is 'input' (raw column index), 'ratio' / 'product' (two input
+    indices), 'minutes' / 'short' / 'medium' / 'long' (duration input index)
+    or 'category' (decade value).
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.inputs = spec['inputs']
+        self.category_column = spec.get('category_column')
+        self.columns = [feature[0] for feature in spec['features']]
+        self.mean = np.array(spec['mean'], dtype=np.float64)
+        self.scale = np.array(spec['scale'], dtype=np.float64)
+        self.model_mean = np.array(spec['model_mean']) if spec.get('model_mean') is not None else None
+        self.model_scale = np.array(spec['model_scale']) if spec.get('model_scale') is not None else None
+
+        groups = {}
+        for position, (_, kind, *args) in enumerate(spec['features']):
+            groups.setdefault(kind, []).append([position, *args])
+        as_index = lambda kind, width: np.array(groups.get(kind, []), dtype=np.int64).reshape(-1, width)
+        self._input = as_index('input', 2)
+        self._ratio = as_index('ratio', 3)
+        self._product = as_index('product', 3)
+        self._duration = {kind: as_index(kind, 2) for kind in ('minutes', 'short', 'medium', 'long')}
+        self._category = [(position, str(value)) for position, value in groups.get('category', [])]
+
+    def transform(self, songs):
+        """Model input matrix (float32, model column order) for raw song rows."""
+        X, category = raw_columns(songs, self.inputs, self.category_column)
+        features = np.zeros((len(X), len(self.columns)), dtype=np.float64)
+        features[:, self._input[:, 0]] = X[:, self._input[:, 1]]
+        features[:, self._ratio[:, 0]] = X[:, self._ratio[:, 1]] / (X[:, self._ratio[:, 2]] + EPSILON)
+        features[:, self._product[:, 0]] = X[:, self._product[:, 1]] * X[:, self._product[:, 2]]
+
+        minutes = {kind: X[:, index[:, 1]] / 60000 for kind, index in self._duration.items()}
+        features[:, self._duration['minutes'][:, 0]] = minutes['minutes']
+        # Short (< 3 min), medium (3-5 min inclusive) and long (> 5 min) songs
+        features[:, self._duration['short'][:, 0]] = minutes['short'] < 3
+        features[:, self._duration['medium'][:, 0]] = (minutes['medium'] >= 3) & (minutes['medium'] <= 5)
+        features[:, self._duration['long'][:, 0]] = minutes['long'] > 5
+        if category is not None:
+            for position, value in self._category:
+                features[:, position] = category == value
+
+        X = ((features - self.mean) / self.scale).astype(np.float32)
+        if self.model_mean is not None:
+            # Same float32 rounding as a StandardScaler applied to float32 input
+            X = (X - self.model_mean).astype(np.float32)
+            X = (X / self.model_scale).astype(np.float32)
+        return X
+
+
+class LinearModel:
+    """Binary linear classifier with a logistic link (logistic regression)."""
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.coef = np.array(meta['coef'], dtype=np.float64)
+        self.intercept = float(meta['intercept'])
+
+    def predict_proba(self, X):
+        proba = _logistic(X @ self.coef + self.intercept)
+        return np.column_stack([1 - proba, proba])
+
+
+class NeuralNetwork:
+    """Forward pass of a fitted binary multilayer perceptron (logistic output unit)."""
+
+    ACTIVATIONS = {
+        'relu': lambda z: np.maximum(z, 0),
+        'tanh': np.tanh,
+        'logistic': _logistic,
+        'identity': lambda z: z
+    }
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.weights = [np.array(w, dtype=np.float64) for w in meta['weights']]
+        self.biases = [np.array(b, dtype=np.float64) for b in meta['biases']]
+        self.activation = self.ACTIVATIONS[meta['activation']]
+
+    def predict_proba(self, X):
+        hidden = X
+        for weights, bias in zip(self.weights[:-1], self.biases[:-1]):
+            hidden = self.activation(hidden @ weights + bias)
+        proba = _logistic(hidden @ self.weights[-1] + self.biases[-1])[:, 0]
+        return np.column_stack([1 - proba, proba])
+
+
+class KernelSVM:
+    """RBF support vector classifier with libsvm's Platt-scaled probabilities."""
+
+    MIN_PROBABILITY = 1e-7
+
+    def __init__(self, meta):
+        self.meta = meta
+        self.support_vectors = np.array(meta['support_vectors'], dtype=np.float64)
+        self.dual_coef = np.array(meta['dual_coef'], dtype=np.float64)
+        self.intercept = float(meta['intercept'])
+        self.gamma = float(meta['gamma'])
+        self.prob_a, self.prob_b = float(meta['prob_a']), float(meta['prob_b'])
+        self._sv_norms = (self.support_vectors ** 2).sum(axis=1)
+
+    def decision_values(self, X):
+        """libsvm decision values (positive towards the first class)."""
+        X = np.asarray(X, dtype=np.float64)
+        output = np.empty(len(X))
+        for start in range(0, len(X), KERNEL_BLOCK_ROWS):
+            block = X[start:start + KERNEL_BLOCK_ROWS]
+            distances = (block ** 2).sum(axis=1)[:, None] + self._sv_norms - 2 * block @ self.support_vectors.T
+            output[start:start + len(block)] = np.exp(-self.gamma * np.maximum(distances, 0)) @ self.dual_coef
+        return output + self.intercept
+
+    def predict_proba(self, X):
+        # Platt sigmoid for the first class against the second, clipped as in libsvm
+        margin = self.decision_values(X) * self.prob_a + self.prob_b
+        r = np.where(margin >= 0, np.exp(-np.abs(margin)), 1.0) / (1 + np.exp(-np.abs(margin)))
+        r = np.clip(r, self.MIN_PROBABILITY, 1 - self.MIN_PROBABILITY)
+        return self._couple(r)
+
+    @staticmethod
+    def _couple(r):
+        """libsvm's pairwise coupling for two classes, with its early stop (eps = 0.005 / k)."""
+        p = np.full((len(r), 2), 0.5)
+        Q = np.empty((len(r), 2, 2))
+        Q[:, 0, 0], Q[:, 1, 1] = (1 - r) ** 2, r ** 2
+        Q[:, 0, 1] = Q[:, 1, 0] = -(1 - r) * r
+        active = np.ones(len(r), dtype=bool)
+        for _ in range(100):
+            Qp = np.einsum('nij,nj->ni', Q, p)
+            pQp = (p * Qp).sum(axis=1)
+            active &= np.abs(Qp - pQp[:, None]).max(axis=1) >= 0.0025
+            if not active.any():
+                break
+            for t in range(2):
+                diff = np.where(active, (pQp - Qp[:, t]) / Q[:, t, t], 0.0)
+                p[:, t] += diff
+                pQp = (pQp + diff * (diff * Q[:, t, t] + 2 * Qp[:, t])) / (1 + diff) ** 2
+                Qp = (Qp + diff[:, None] * Q[:, t, :]) / (1 + diff)[:, None]
+                p /= (1 + diff)[:, None]
+        return p
+
+
+MODEL_KINDS = {'linear': LinearModel, 'neural_network': NeuralNetwork, 'svm': KernelSVM}
+
+
+class InferenceBundle:
+    def __init__(self, features, model, meta):
+        self.features = features
+        self.model = model
+        self.meta = meta
+        self.classes_ = np.array(meta.get('classes', [0, 1]))
+
+    def predict_proba(self, songs):
+        """Class probabilities for raw song rows."""
+        return self.model.predict_proba(self.features.transform(songs))
+
+    def predict(self, songs):
+        return self.classes_[(self.predict_proba(songs)[:, 1] > 0.5).astype(int)]
+
+    def save(self, path, compress=False):
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        meta = {**self.meta, 'features': self.features.spec, 'format_version': FORMAT_VERSION}
+        if isinstance(self.model, CompactTreeEnsemble):
+            meta['kind'] = 'trees'
+            self.model.save(path / 'trees', compress=compress)
+        else:
+            meta['kind'] = next(kind for kind, cls in MODEL_KINDS.items() if isinstance(self.model, cls))
+            meta['model'] = self.model.meta
+        with open(path / 'bundle.json', 'w') as f:
+            json.dump(meta, f)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load a bundle directory; tree arrays are memory-mapped when `mmap`."""
+        path = Path(path)
+        with open(path / 'bundle.json') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported inference bundle format: {meta.get('format_version')}")
+        if meta['kind'] == 'trees':
+            model = CompactTreeEnsemble.load(path / 'trees', mmap=mmap)
+        else:
+            model = MODEL_KINDS[meta['kind']](meta.pop('model'))
+        return cls(FeatureSpec(meta.pop('features')), model, meta)
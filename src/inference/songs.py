@@ -0,0 +1,21 @@
+"""
+Raw song input shared by the NumPy-only scorers.
+"""
+
+import numpy as np
+
+
+def raw_columns(songs, inputs, category_column=None):
+    """Raw input matrix (n_rows, len(inputs)) and the category column from a mapping
+    of columns (e.g. a DataFrame) or a list of song dicts."""
+    if isinstance(songs, (list, tuple)):
+        columns = inputs + ([category_column] if category_column else [])
+        songs = {c: [song.get(c) for song in songs] for c in columns}
+    missing = [c for c in inputs if c not in songs]
+    if missing:
+        raise KeyError(f"Missing input columns: {missing}")
+    X = np.column_stack([np.asarray(songs[c], dtype=np.float64) for c in inputs])
+    category = None
+    if category_column is not None and category_column in songs:
+        category = np.asarray(songs[category_column]).astype(str)
+    return X, category
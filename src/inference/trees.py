@@ -0,0 +1,143 @@
+"""
+Compact tree-ensemble artifacts and NumPy-only batch scoring.
+
+All trees of an ensemble are stored as flat node arrays with narrowed dtypes:
+
+    feature    int16 (int32 for very wide inputs)   split feature, 0 at leaves
+    threshold  float32                               go left when x <= threshold
+    left       int32                                 global index of left child;
+                                                     the right child is left + 1
+    missing    int32                                 child taken when x is NaN
+    value      float32                               leaf output
+    roots      int32                                 root node of each tree
+
+Leaves point to themselves and have an infinite threshold, so one level of the
+traversal is `node = left[node] + (x > threshold[node])` for every (row, tree)
+pair at once. Every other level, pairs that have reached a leaf are dropped
+from the active set, so deep but unbalanced trees (random forests) only cost
+about as many steps as each path is long.
+
+`meta['aggregation']` says how leaf outputs combine: 'mean' averages class-1
+probabilities (random forests), 'logistic' sums margins onto
+`meta['base_score']` and applies the sigmoid (gradient boosting, XGBoost).
+
+On disk an artifact is a directory of `.npy` files plus `meta.json`; these can
+be memory-mapped so several scoring processes share one copy of the pages.
+With compression the arrays go into a single `arrays.npz` instead, which is
+smaller but has to be read into memory. Scoring imports only NumPy.
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+
+# Version 1 (separate right-child array, random forests only) is no longer read;
+# `load_artifact` falls back to the pickled model for such artifacts
+FORMAT_VERSION = 2
+ARRAYS = ('feature', 'threshold', 'left', 'missing', 'value', 'roots')
+# Levels stepped between removals of (row, tree) pairs that have reached a leaf
+COMPACT_EVERY = 2
+
+
+class CompactTreeEnsemble:
+    def __init__(self, feature, threshold, left, missing, value, roots, meta):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.missing = missing
+        self.value = value
+        self.roots = roots
+        self.meta = meta
+        self.n_features_in_ = meta['n_features']
+        self.classes_ = np.array(meta.get('classes', [0, 1]))
+        if meta.get('feature_importances') is not None:
+            self.feature_importances_ = np.array(meta['feature_importances'])
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    @property
+    def n_nodes(self):
+        return len(self.feature)
+
+    def _leaf_values(self, X):
+        """Leaf output of every tree for every row, shape (n_rows, n_trees)."""
+        n_rows, n_features = X.shape
+        n_trees = len(self.roots)
+        node = np.tile(self.roots, n_rows)
+        # Offset of each (row, tree) pair's row in the flattened input
+        index_dtype = np.int32 if X.size < np.iinfo(np.int32).max else np.int64
+        row_offset = np.repeat(np.arange(n_rows, dtype=index_dtype) * n_features, n_trees)
+        flat = X.ravel()
+        has_nan = np.isnan(flat).any()
+
+        # Active pairs: their index, current node and row offset, compacted together
+        active = np.flatnonzero(self.left[node] != node)
+        current, offset = node[active], row_offset[active]
+        level = 0
+        while len(active):
+            x = flat[offset + self.feature[current]]
+            step = self.left[current] + (x > self.threshold[current])
+            current = np.where(np.isnan(x), self.missing[current], step) if has_nan else step
+            level += 1
+            if level % COMPACT_EVERY == 0:
+                node[active] = current
+                internal = self.left[current] != current
+                active, current, offset = active[internal], current[internal], offset[internal]
+        return self.value[node].reshape(n_rows, n_trees)
+
+    def decision_function(self, X, block_rows=1024):
+        """Aggregated ensemble output: mean leaf probability, or the summed margin for boosted models."""
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        output = np.empty(len(X), dtype=np.float64)
+        reduce = np.mean if self.meta.get('aggregation', 'mean') == 'mean' else np.sum
+        for start in range(0, len(X), block_rows):
+            block = X[start:start + block_rows]
+            output[start:start + len(block)] = reduce(self._leaf_values(block), axis=1, dtype=np.float64)
+        return output + self.meta.get('base_score', 0.0)
+
+    def predict_proba(self, X, block_rows=1024):
+        """Class probabilities, scored in row blocks to bound the (rows x trees) work arrays."""
+        output = self.decision_function(X, block_rows)
+        proba = output if self.meta.get('aggregation', 'mean') == 'mean' else 1 / (1 + np.exp(-output))
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, X):
+        return self.classes_[(self.predict_proba(X)[:, 1] > 0.5).astype(int)]
+
+    def save(self, path, compress=False):
+        """Write the artifact directory (optionally as one compressed archive)."""
+        path = Path(path)
+        path.mkdir(parents=True, exist_ok=True)
+        arrays = {name: getattr(self, name) for name in ARRAYS}
+        for stale in list(path.glob('*.npy')) + list(path.glob('*.npz')):
+            stale.unlink()
+        if compress:
+            np.savez_compressed(path / 'arrays.npz', **arrays)
+        else:
+            for name, array in arrays.items():
+                np.save(path / f'{name}.npy', array)
+        with open(path / 'meta.json', 'w') as f:
+            json.dump({**self.meta, 'format_version': FORMAT_VERSION}, f)
+        return path
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """Load an artifact directory; uncompressed arrays are memory-mapped when `mmap`."""
+        path = Path(path)
+        with open(path / 'meta.json') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != FORMAT_VERSION:
+            raise ValueError(f"Unsupported compact tree format: {meta.get('format_version')}")
+
+        if (path / 'arrays.npz').exists():
+            with np.load(path / 'arrays.npz') as archive:
+                arrays = {name: archive[name] for name in ARRAYS}
+        else:
+            mode = 'r' if mmap else None
+            arrays = {name: np.load(path / f'{name}.npy', mmap_mode=mode) for name in ARRAYS}
+        return cls(meta=meta, **arrays)
+
+    def nbytes(self):
+        return sum(getattr(self, name).nbytes for name in ARRAYS)
@@ -16,35 +16,107 @@ from src.data.data_loader import DataLoader
 from src.features.feature_engineer import FeatureEngineer
 from src.models.model_trainer import ModelTrainer
 from src.visualization.plotter import Plotter
-
-# Optional import for report generation (script provides run_evaluation)
-try:
-    from scripts.generate_report import run_evaluation
-except Exception:
-    run_evaluation = None
+from src.utils.config import load_config
+from src.utils.resources import ResourceGovernor
+from src.utils.telemetry import TrainingTelemetry
 
 import argparse
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# ModelTrainer options read from the `model` config section
+TRAINING_CONFIG_KEYS = ['early_stopping', 'early_stopping_rounds', 'validation_fraction', 'hist_boosting',
+                        'coreset_size', 'coreset_method']
+
+def training_options(config, args):
+    """ModelTrainer options from the `model` config section; CLI flags that were given win."""
+    settings = dict((config or {}).get('model') or {})
+    overrides = {
+        'early_stopping': args.early_stopping,
+        'hist_boosting': args.hist_boosting,
+        'coreset_size': args.coreset_size,
+        'coreset_method': args.coreset_method
+    }
+    settings.update({k: v for k, v in overrides.items() if v is not None})
+    return {k: settings[k] for k in TRAINING_CONFIG_KEYS if k in settings}
+
 def main():
     parser = argparse.ArgumentParser(description='Run full hit-song prediction pipeline')
     parser.add_argument('--no-report', action='store_true', help='Skip report generation step')
     parser.add_argument('--models-dir', default='models/saved_models', help='Directory containing saved models')
     parser.add_argument('--report-out', default='reports/final_report', help='Output directory for generated report')
+    parser.add_argument('--no-early-stopping', dest='early_stopping', action='store_false', default=None, help='Run iterative models for their full iteration counts (overrides model.early_stopping)')
+    parser.add_argument('--hist-boosting', action='store_true', default=None, help='Use histogram-based gradient boosting instead of the exact learner (overrides model.hist_boosting)')
+    parser.add_argument('--force-retrain', action='store_true', help='Retrain every model even if its saved artifact fingerprint matches')
+    parser.add_argument('--incremental', metavar='NEW_SONGS_CSV', help='Continue training the saved models on a batch of new labelled songs')
+    parser.add_argument('--replay-fraction', type=float, default=0.0, help='Fraction of historical songs replayed alongside the new batch in incremental mode')
+    parser.add_argument('--out-of-core', metavar='CATALOG_CSV', help='Stream a catalog too large for memory into the out-of-core learners')
+    parser.add_argument('--validation-csv', default=None, help='Held-out CSV for out-of-core early stopping and accuracy')
+    parser.add_argument('--memory-budget-mb', type=float, default=None, help='Peak memory budget for out-of-core chunks (default: a quarter of the memory limit, else 1024)')
+    parser.add_argument('--coreset-size', type=int, default=None, help='Fit the SVM and neural network on a weighted coreset of this many rows (overrides model.coreset_size)')
+    parser.add_argument('--coreset-method', choices=['cluster', 'margin', 'random'], default=None, help='How coreset rows are chosen within each target/decade stratum (default: model.coreset_method, else cluster)')
+    parser.add_argument('--coreset-baseline', action='store_true', help='Also fit the coreset models on all rows and report accuracy lost vs time saved')
+    parser.add_argument('--svm-kernel-cache', action='store_true', help='Train the SVM and its CV folds on one precomputed RBF Gram matrix')
+    parser.add_argument('--kernel-memory-mb', type=float, default=2048, help='Memory budget for the SVM Gram matrix; larger training sets fall back to normal fits')
+    parser.add_argument('--per-decade', action='store_true', help='Train one model family per decade partition in parallel processes')
+    parser.add_argument('--partition-workers', type=int, default=None, help='Worker processes for --per-decade (default: one per decade)')
+    parser.add_argument('--config', default=None, help='Path to config YAML (default: config/config.yaml)')
+    parser.add_argument('--cores', type=int, default=None, help='Total CPU cores the pipeline may use')
+    parser.add_argument('--training-threads', type=int, default=None, help='Thread budget for model training')
+    parser.add_argument('--evaluation-threads', type=int, default=None, help='Thread budget for evaluation and report generation')
+    parser.add_argument('--scoring-threads', type=int, default=None, help='Thread budget for scoring')
+    parser.add_argument('--blas-threads', type=int, default=None, help='Thread limit for BLAS/OpenMP libraries')
+    parser.add_argument('--memory-limit-gb', type=float, default=None, help='Memory budget for the process in GB (see --memory-limit-mode)')
+    parser.add_argument('--memory-limit-mode', choices=['rss', 'address_space'], default=None,
+                        help="'rss' (default) warns when a training phase's resident memory exceeds the budget; "
+                             "'address_space' sets a hard RLIMIT_AS cap on virtual memory, which threaded BLAS/XGBoost arenas can hit well below the RSS target")
+    parser.add_argument('--trace-memory', action='store_true', help='Also record tracemalloc peaks in the training telemetry (slower)')
     args = parser.parse_args()
 
+    logging.basicConfig(level=logging.INFO)
+    config = load_config(args.config)
+    trainer_options = training_options(config, args)
+    resources = ResourceGovernor.from_config(
+        config,
+        total_cores=args.cores,
+        training_threads=args.training_threads,
+        evaluation_threads=args.evaluation_threads,
+        scoring_threads=args.scoring_threads,
+        blas_threads=args.blas_threads,
+        memory_limit_gb=args.memory_limit_gb,
+        memory_limit_mode=args.memory_limit_mode
+    )
+    resources.apply()
+
     logger.info("🎵 Hit Song Prediction Pipeline")
     logger.info("Starting pipeline...")
 
     # Initialize components
     data_loader = DataLoader()
     feature_engineer = FeatureEngineer()
-    model_trainer = ModelTrainer()
+    model_trainer = ModelTrainer(
+        resources=resources,
+        force_retrain=args.force_retrain,
+        telemetry=TrainingTelemetry(
+            trace_memory=args.trace_memory,
+            memory_budget_mb=resources.memory_limit_bytes / 1024 ** 2 if resources.memory_limit_bytes else None
+        ),
+        coreset_baseline=args.coreset_baseline,
+        svm_kernel_cache=args.svm_kernel_cache,
+        kernel_memory_mb=args.kernel_memory_mb,
+        **trainer_options
+    )
     plotter = Plotter()
 
+    if args.incremental:
+        run_incremental(args, data_loader, model_trainer)
+        return
+
+    if args.out_of_core:
+        run_out_of_core(args, model_trainer, resources)
+        return
+
     try:
         # Step 1: Load processed data (train/test) if available
         logger.info("📁 Step 1: Loading processed data (or raw files)...")
@@ -56,10 +128,21 @@ def main():
         # Step 2: Feature engineering
         logger.info("🔧 Step 2: Feature engineering...")
         features_df = feature_engineer.create_features(df)
+        feature_engineer.save(model_trainer.preprocessing_path / 'feature_engineer.pkl')
+
+        if args.per_decade:
+            run_per_decade(args, features_df, resources, trainer_options)
+            return
 
         # Step 3: Train models
         logger.info("🤖 Step 3: Training models...")
         results = model_trainer.train_all_models(features_df)
+        try:
+            model_trainer.build_stacked_ensemble()
+        except Exception as e:
+            logger.exception("Could not build stacked ensemble: %s", e)
+        export_fused_scorer(model_trainer, feature_engineer)
+        export_inference_bundles(model_trainer)
 
         # Step 4: Generate visualizations
         logger.info("📊 Step 4: Generating visualizations...")
@@ -71,9 +154,14 @@ def main():
         # Step 5: Generate report (optional)
         if not args.no_report:
             logger.info("📑 Step 5: Generating final report...")
+            # Optional import for report generation (script provides run_evaluation)
+            try:
+                from scripts.generate_report import run_evaluation
+            except Exception:
+                run_evaluation = None
             if run_evaluation is not None:
                 try:
-                    run_evaluation(Path(args.models_dir), Path(args.report_out))
+                    run_evaluation(Path(args.models_dir), Path(args.report_out), resources=resources)
                 except Exception as e:
                     logger.exception("Report generation failed: %s", e)
             else:
@@ -90,5 +178,94 @@ def main():
     except Exception as e:
         logger.exception("❌ Error in pipeline: %s", e)
 
+def export_fused_scorer(model_trainer, feature_engineer, name='Logistic Regression'):
+    """Save the fused raw-column scorer for the trained logistic regression."""
+    from src.models.linear_export import save_fused_linear
+
+    try:
+        model = model_trainer.load_model(name)
+        path = model_trainer.models_path / f"{name.lower().replace(' ', '_')}.fused.json"
+        save_fused_linear(feature_engineer, model, path, scaler=model_trainer.load_scaler(name))
+    except FileNotFoundError:
+        logger.info("No saved %s model; skipping fused scorer export", name)
+    except Exception as e:
+        logger.exception("Could not export fused %s scorer: %s", name, e)
+
+def export_inference_bundles(model_trainer):
+    """Save NumPy-only inference bundles (feature spec + model parameters) for the saved models."""
+    from src.models.bundle_export import export_saved_models
+
+    try:
+        export_saved_models(model_trainer.models_path)
+    except Exception as e:
+        logger.exception("Could not export inference bundles: %s", e)
+
+def run_incremental(args, data_loader, model_trainer):
+    """Warm-start the saved models on a new batch instead of retraining from scratch."""
+    logger.info("🔁 Incremental update from %s", args.incremental)
+
+    try:
+        feature_engineer = FeatureEngineer.load(model_trainer.preprocessing_path / 'feature_engineer.pkl')
+        new_df = pd.read_csv(args.incremental)
+        if 'decade' not in new_df.columns:
+            logger.warning("%s has no decade column; its decade indicators will all be zero", args.incremental)
+        new_features = feature_engineer.transform(new_df)
+
+        replay_features = None
+        if args.replay_fraction > 0:
+            combined_df, _, _ = data_loader.load_processed_data()
+            replay_df = combined_df.sample(frac=args.replay_fraction, random_state=42)
+            replay_features = feature_engineer.transform(replay_df)
+
+        model_trainer.update_models(new_features, replay_features, feature_engineer.feature_columns)
+        export_fused_scorer(model_trainer, feature_engineer)
+        export_inference_bundles(model_trainer)
+        logger.info("🎉 Incremental update completed!")
+
+    except Exception as e:
+        logger.exception("❌ Error in incremental update: %s", e)
+
+def run_out_of_core(args, model_trainer, resources):
+    """Train the streaming-capable models on a catalog read from disk in chunks."""
+    from src.models.out_of_core import OutOfCoreTrainer
+
+    budget_mb = args.memory_budget_mb
+    if budget_mb is None:
+        limit = resources.memory_limit_bytes
+        budget_mb = limit / 4 / 1024 ** 2 if limit else 1024
+    logger.info("💾 Out-of-core training on %s (%.0f MB budget)", args.out_of_core, budget_mb)
+
+    try:
+        # Own folder and feature pipeline: the in-memory artifacts stay consistent
+        trainer = OutOfCoreTrainer(memory_budget_mb=budget_mb, resources=resources,
+                                   models_path=model_trainer.models_path / 'out_of_core')
+        results = trainer.train(args.out_of_core, validation_path=args.validation_csv)
+        for name, result in results.items():
+            logger.info("%s: %.0f rows/s, peak RSS %.0f MB", name, result['rows_per_second'], result['peak_memory_mb'])
+        export_fused_scorer(trainer.trainer, trainer.feature_engineer)
+        export_inference_bundles(trainer.trainer)
+        logger.info("🎉 Out-of-core training completed!")
+
+    except Exception as e:
+        logger.exception("❌ Error in out-of-core training: %s", e)
+
+def run_per_decade(args, features_df, resources, trainer_options):
+    """Train one model family per decade partition concurrently across processes."""
+    from src.models.partitioned import PartitionedTrainer
+
+    logger.info("🗂️ Per-decade training...")
+    try:
+        trainer = PartitionedTrainer(
+            n_workers=args.partition_workers,
+            resources=resources,
+            force_retrain=args.force_retrain,
+            **trainer_options
+        )
+        trainer.train(features_df)
+        logger.info("🎉 Per-decade training completed! Score with src.models.partitioned.DecadeRouter")
+
+    except Exception as e:
+        logger.exception("❌ Error in per-decade training: %s", e)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,7 +2,19 @@
 Model training and evaluation modules.
 """
 
-from .model_trainer import ModelTrainer
-from .model_evaluator import ModelEvaluator
+from importlib import import_module
 
-__all__ = ["ModelTrainer", "ModelEvaluator"]
\ No newline at end of file
+# Exports are imported on first access, so light modules such as `artifacts`
+# can be used without loading scikit-learn, XGBoost and matplotlib
+_EXPORTS = {
+    'ModelTrainer': '.model_trainer',
+    'ModelEvaluator': '.model_evaluator',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,121 @@
+"""
+Model artifacts: fingerprints recording the data, features, hyperparameters
+and library versions behind each saved model, and artifact loading.
+"""
+
+import hashlib
+import json
+import platform
+import logging
+from datetime import datetime, timezone
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.inference.trees import CompactTreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+# Parameters that change how fast a model trains, not what it learns
+RUNTIME_PARAMS = {'n_jobs', 'nthread', 'verbose', 'verbosity'}
+
+
+def hash_data(*arrays):
+    """Content hash of feature matrices / target vectors (DataFrame, Series or ndarray)."""
+    digest = hashlib.sha256()
+    for data in arrays:
+        if isinstance(data, (pd.DataFrame, pd.Series)):
+            digest.update(pd.util.hash_pandas_object(data, index=False).values.tobytes())
+            if isinstance(data, pd.DataFrame):
+                digest.update(json.dumps(list(map(str, data.columns))).encode())
+        else:
+            data = np.ascontiguousarray(data)
+            digest.update(str((data.shape, data.dtype.str)).encode())
+            digest.update(memoryview(data).cast('B'))
+    return digest.hexdigest()
+
+
+def hash_files(*paths):
+    """Content hash of saved artifact files, read in blocks so large models are never loaded whole."""
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, 'rb') as f:
+            digest.update(hashlib.file_digest(f, 'sha256').digest())
+    return digest.hexdigest()
+
+
+def library_versions():
+    """Versions of the libraries that determine what a fitted model looks like."""
+    import sklearn
+    import xgboost
+
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scikit-learn': sklearn.__version__,
+        'xgboost': xgboost.__version__
+    }
+
+
+def model_params(model):
+    """Hyperparameters of an (unfitted) estimator, minus runtime-only settings."""
+    params = model.get_params(deep=False)
+    return {k: params[k] for k in sorted(params) if k not in RUNTIME_PARAMS}
+
+
+def fingerprint(data_hash, feature_columns, params, **extra):
+    """Build the fingerprint record for one model artifact."""
+    components = {
+        'data': data_hash,
+        'features': list(feature_columns),
+        'params': params,
+        'versions': library_versions(),
+        **extra
+    }
+    encoded = json.dumps(components, sort_keys=True, default=str)
+    return {
+        'fingerprint': hashlib.sha256(encoded.encode()).hexdigest(),
+        'components': json.loads(encoded)
+    }
+
+
+def write_metadata(path, record, metrics=None):
+    """Write the JSON sidecar stored next to a model artifact."""
+    metadata = dict(record)
+    metadata['metrics'] = {k: _to_builtin(v) for k, v in (metrics or {}).items()}
+    metadata['created'] = datetime.now(timezone.utc).isoformat()
+    with open(path, 'w') as f:
+        json.dump(metadata, f, indent=2, default=str)
+
+
+def read_metadata(path):
+    """Read an artifact's JSON sidecar, or None if it is missing or unreadable."""
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_artifact(path, mmap=True):
+    """Load a saved model, preferring its compact tree artifact (`<stem>.trees/`) when present.
+
+    A compact artifact older than the pickle was left by an earlier model and is ignored.
+    """
+    path = Path(path)
+    compact = path.with_suffix('.trees')
+    meta = compact / 'meta.json'
+    if meta.exists() and meta.stat().st_mtime < path.stat().st_mtime:
+        logger.warning(f"Ignoring stale compact artifact {compact}; it predates {path.name}")
+    elif compact.is_dir():
+        try:
+            return CompactTreeEnsemble.load(compact, mmap=mmap)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load compact artifact {compact}: {e}; falling back to {path}")
+    return joblib.load(path)
+
+
+def _to_builtin(value):
+    return value.item() if isinstance(value, np.generic) else value
@@ -0,0 +1,134 @@
+"""
+Export fitted models, together with the fitted `FeatureEngineer` and their
+input scalers, as NumPy-only inference bundles (`src.inference.runtime`).
+
+Supported: random forests, gradient boosting, histogram gradient boosting and
+XGBoost (as compact tree ensembles), logistic regression, multilayer
+perceptrons and RBF support vector machines, all binary.
+"""
+
+import logging
+from pathlib import Path
+
+import joblib
+import numpy as np
+from sklearn.linear_model import LogisticRegression, SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.svm import SVC
+
+from src.features.feature_engineer import FeatureEngineer
+from src.inference.runtime import FeatureSpec, InferenceBundle, KernelSVM, LinearModel, NeuralNetwork
+from src.inference.trees import CompactTreeEnsemble
+from src.models.linear_export import CATEGORY_COLUMN, DURATION_BINS, DURATION_INPUT, ratio_pairs
+from src.models.tree_export import export_tree_ensemble
+
+logger = logging.getLogger(__name__)
+
+DURATION_KINDS = {'duration_minutes': 'minutes', **DURATION_BINS}
+PRODUCT_FEATURES = {'energy_dance_composite': ('energy', 'danceability')}
+
+
+def feature_spec(feature_engineer, scaler=None):
+    """Feature spec replaying `feature_engineer.transform` (and `scaler`) for the runtime."""
+    columns = list(feature_engineer.feature_columns)
+    ratios = ratio_pairs()
+    inputs = []
+
+    def input_index(column):
+        if column not in inputs:
+            inputs.append(column)
+        return inputs.index(column)
+
+    features = []
+    for column in columns:
+        if column in ratios:
+            features.append([column, 'ratio', *map(input_index, ratios[column])])
+        elif column in PRODUCT_FEATURES:
+            features.append([column, 'product', *map(input_index, PRODUCT_FEATURES[column])])
+        elif column in DURATION_KINDS:
+            features.append([column, DURATION_KINDS[column], input_index(DURATION_INPUT)])
+        elif column.startswith(f'{CATEGORY_COLUMN}_'):
+            features.append([column, 'category', column[len(CATEGORY_COLUMN) + 1:]])
+        else:
+            features.append([column, 'input', input_index(column)])
+
+    # Columns the pipeline does not standardize (decade indicators) keep mean 0, scale 1
+    mean, scale = np.zeros(len(columns)), np.ones(len(columns))
+    position = {c: i for i, c in enumerate(columns)}
+    for i, column in enumerate(feature_engineer.scaled_columns):
+        if column in position:
+            mean[position[column]] = feature_engineer.scaler.mean_[i]
+            scale[position[column]] = feature_engineer.scaler.scale_[i]
+
+    return {
+        'inputs': inputs,
+        'category_column': CATEGORY_COLUMN if any(f[1] == 'category' for f in features) else None,
+        'features': features,
+        'mean': mean.tolist(),
+        'scale': scale.tolist(),
+        'model_mean': scaler.mean_.tolist() if scaler is not None else None,
+        'model_scale': scaler.scale_.tolist() if scaler is not None else None
+    }
+
+
+def export_model(model):
+    """Runtime form of a fitted binary model, or None if the model type is not supported."""
+    if isinstance(model, CompactTreeEnsemble):
+        return model
+    if len(getattr(model, 'classes_', [])) != 2:
+        return None
+    if isinstance(model, LogisticRegression) or (isinstance(model, SGDClassifier) and model.loss == 'log_loss'):
+        return LinearModel({'coef': model.coef_[0].tolist(), 'intercept': float(model.intercept_[0])})
+    if isinstance(model, MLPClassifier) and model.out_activation_ == 'logistic':
+        return NeuralNetwork({
+            'activation': model.activation,
+            'weights': [w.tolist() for w in model.coefs_],
+            'biases': [b.tolist() for b in model.intercepts_]
+        })
+    if isinstance(model, SVC) and model.kernel == 'rbf' and model.probability:
+        # libsvm's own sign convention (`_dual_coef_`, `_intercept_`) is what its probabilities use
+        return KernelSVM({
+            'support_vectors': model.support_vectors_.tolist(),
+            'dual_coef': model._dual_coef_[0].tolist(),
+            'intercept': float(model._intercept_[0]),
+            'gamma': float(model._gamma),
+            'prob_a': float(model._probA[0]),
+            'prob_b': float(model._probB[0])
+        })
+    return export_tree_ensemble(model)
+
+
+def export_bundle(feature_engineer, model, scaler=None):
+    """Inference bundle for `model` trained on `feature_engineer` output, or None if unsupported."""
+    runtime_model = export_model(model)
+    if runtime_model is None:
+        return None
+    meta = {'model_type': type(model).__name__, 'classes': np.asarray(model.classes_).tolist()}
+    return InferenceBundle(FeatureSpec(feature_spec(feature_engineer, scaler)), runtime_model, meta)
+
+
+def save_bundle(feature_engineer, model, path, scaler=None, compress=False):
+    """Export and save the bundle; returns its path or None if the model is unsupported."""
+    bundle = export_bundle(feature_engineer, model, scaler)
+    if bundle is None:
+        return None
+    path = bundle.save(path, compress=compress)
+    logger.info(f"Saved inference bundle: {path} ({type(bundle.model).__name__}, {len(bundle.features.inputs)} raw inputs)")
+    return path
+
+
+def export_saved_models(models_path="models/saved_models"):
+    """Write `<stem>.bundle/` next to every saved model; returns the bundle paths."""
+    models_path = Path(models_path)
+    preprocessing = models_path / 'preprocessing'
+    feature_engineer = FeatureEngineer.load(preprocessing / 'feature_engineer.pkl')
+    paths = []
+    for model_file in sorted(models_path.glob('*.pkl')):
+        scaler_file = preprocessing / f'{model_file.stem}_scaler.pkl'
+        scaler = joblib.load(scaler_file) if scaler_file.exists() else None
+        path = save_bundle(feature_engineer, joblib.load(model_file), model_file.with_suffix('.bundle'), scaler)
+        if path is None:
+            logger.info(f"No inference bundle for {model_file.name} (unsupported model type)")
+        else:
+            paths.append(path)
+    return paths
@@ -0,0 +1,110 @@
+"""
+Coreset selection: a small weighted subset of the training rows that stands in
+for the full set when fitting learners whose cost grows super-linearly with
+the number of rows (the SVM and the MLP).
+
+Rows are stratified by target and decade and every stratum gets a share of
+the budget proportional to its size. Within a stratum rows are chosen by
+
+- 'cluster': k-means with one centroid per budgeted row; the row nearest each
+  centroid is kept and weighted by its cluster's size.
+- 'margin': half the budget goes to the rows closest to a linear decision
+  boundary (the ones that become support vectors), the rest is a uniform
+  sample weighted up to cover the remaining rows.
+- 'random': a uniform sample weighted by the stratum's sampling rate.
+
+Weights sum to the stratum sizes, so class and decade balance are preserved.
+"""
+
+import inspect
+import logging
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.linear_model import SGDClassifier
+
+logger = logging.getLogger(__name__)
+
+METHODS = ('cluster', 'margin', 'random')
+
+
+class CoresetSelector:
+    def __init__(self, size=5000, method='cluster', random_state=42):
+        if method not in METHODS:
+            raise ValueError(f"Unknown coreset method {method!r}; expected one of {METHODS}")
+        self.size = size
+        self.method = method
+        self.random_state = random_state
+
+    def _allocate(self, strata):
+        """Rows of the budget per stratum, proportional to stratum size (at least one each)."""
+        keys, counts = np.unique(strata, return_counts=True)
+        budget = np.maximum(1, np.floor(counts * self.size / counts.sum())).astype(int)
+        return dict(zip(keys, np.minimum(budget, counts)))
+
+    def select(self, X, y, groups=None):
+        """Indices into X and per-row sample weights of the coreset.
+
+        Returns all rows with unit weights when X already fits in the budget.
+        """
+        n = len(X)
+        if n <= self.size:
+            return np.arange(n), np.ones(n)
+
+        y = np.asarray(y)
+        strata = y.astype(str) if groups is None else np.char.add(y.astype(str), np.asarray(groups).astype(str))
+        rng = np.random.default_rng(self.random_state)
+        scores = self._margins(X, y) if self.method == 'margin' else None
+
+        indices, weights = [], []
+        for key, budget in self._allocate(strata).items():
+            rows = np.flatnonzero(strata == key)
+            if budget >= len(rows):
+                chosen, weight = rows, np.ones(len(rows))
+            elif self.method == 'cluster':
+                chosen, weight = self._cluster(X, rows, budget)
+            elif self.method == 'margin':
+                chosen, weight = self._margin(rows, budget, scores, rng)
+            else:
+                chosen = rng.choice(rows, size=budget, replace=False)
+                weight = np.full(budget, len(rows) / budget)
+            indices.append(chosen)
+            weights.append(weight)
+
+        indices, weights = np.concatenate(indices), np.concatenate(weights)
+        order = np.argsort(indices)
+        logger.info(f"Selected {self.method} coreset: {len(indices)} of {n} rows")
+        return indices[order], weights[order]
+
+    def _cluster(self, X, rows, budget):
+        kmeans = MiniBatchKMeans(n_clusters=budget, random_state=self.random_state, n_init=1,
+                                 batch_size=max(1024, 3 * budget))
+        labels = kmeans.fit_predict(X[rows])
+        distances = np.linalg.norm(X[rows] - kmeans.cluster_centers_[labels], axis=1)
+        # Row nearest its centroid represents each (non-empty) cluster
+        order = np.lexsort((distances, labels))
+        first = order[np.r_[True, labels[order][1:] != labels[order][:-1]]]
+        return rows[first], np.bincount(labels)[labels[first]].astype(float)
+
+    def _margins(self, X, y):
+        """Distance of every row to a cheap linear decision boundary."""
+        linear = SGDClassifier(loss='hinge', random_state=self.random_state, max_iter=20, tol=None)
+        linear.fit(X, y)
+        return np.abs(linear.decision_function(X))
+
+    def _margin(self, rows, budget, scores, rng):
+        n_boundary = budget // 2
+        boundary = rows[np.argsort(scores[rows], kind='stable')[:n_boundary]]
+        rest = np.setdiff1d(rows, boundary, assume_unique=True)
+        sampled = rng.choice(rest, size=budget - n_boundary, replace=False)
+        weight = np.r_[np.ones(n_boundary), np.full(len(sampled), len(rest) / max(len(sampled), 1))]
+        return np.r_[boundary, sampled], weight
+
+
+def fit_weighted(model, X, y, sample_weight, random_state=42):
+    """Fit with sample weights; estimators without them get a weight-proportional resample."""
+    if 'sample_weight' in inspect.signature(model.fit).parameters:
+        return model.fit(X, y, sample_weight=sample_weight)
+    rng = np.random.default_rng(random_state)
+    rows = rng.choice(len(X), size=len(X), p=sample_weight / sample_weight.sum())
+    return model.fit(X[rows], np.asarray(y)[rows])
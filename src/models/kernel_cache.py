@@ -0,0 +1,94 @@
+"""
+Precomputed RBF kernel cache for the SVM.
+
+The Gram matrix over the (scaled) training rows is computed once, in row
+blocks written straight into the cached array, and every SVM fit in training,
+cross-validation and `C` tuning slices it instead of recomputing kernel
+values. Fits use `SVC(kernel='precomputed')`; the final model is converted
+back into an ordinary RBF `SVC` over its support vectors, so saved artifacts
+score raw feature rows as before.
+
+`gamma='scale'` is resolved once from all training rows rather than per fold.
+"""
+
+import logging
+
+import numpy as np
+from sklearn.base import clone
+
+logger = logging.getLogger(__name__)
+
+# Bytes of one cached kernel value (libsvm works in float64)
+KERNEL_BYTES = 8
+
+
+class KernelCache:
+    def __init__(self, X, y=None, gamma='scale', block_rows=1024):
+        self.X = np.asarray(X, dtype=np.float64)
+        self.y = None if y is None else np.asarray(y)
+        self.gamma = self.resolve_gamma(gamma, self.X)
+        self.block_rows = block_rows
+        self._sq_norms = np.einsum('ij,ij->i', self.X, self.X)
+        self.gram = self.kernel(self.X)
+
+    @staticmethod
+    def resolve_gamma(gamma, X):
+        """Numeric RBF gamma, following SVC's 'scale' / 'auto' conventions."""
+        if gamma == 'scale':
+            variance = X.var()
+            return 1.0 / (X.shape[1] * variance) if variance > 0 else 1.0
+        if gamma == 'auto':
+            return 1.0 / X.shape[1]
+        return float(gamma)
+
+    @staticmethod
+    def required_mb(n_rows, fit_fraction=0.8):
+        """Memory for the cached Gram matrix plus the largest per-fit slice of it."""
+        return (n_rows ** 2 + (fit_fraction * n_rows) ** 2) * KERNEL_BYTES / 1024 ** 2
+
+    def kernel(self, X_new):
+        """RBF kernel between `X_new` and the cached rows, filled block by block."""
+        X_new = np.asarray(X_new, dtype=np.float64)
+        sq_new = np.einsum('ij,ij->i', X_new, X_new)
+        K = np.empty((len(X_new), len(self.X)))
+        for start in range(0, len(X_new), self.block_rows):
+            stop = min(start + self.block_rows, len(X_new))
+            block = K[start:stop]
+            np.matmul(X_new[start:stop], self.X.T, out=block)
+            block *= -2
+            block += sq_new[start:stop, None]
+            block += self._sq_norms[None, :]
+            np.maximum(block, 0, out=block)
+            block *= -self.gamma
+            np.exp(block, out=block)
+        return K
+
+    @property
+    def nbytes(self):
+        return self.gram.nbytes
+
+    def block(self, rows, cols=None):
+        """Kernel values between cached rows `rows` and `cols` (default: `rows`)."""
+        cols = rows if cols is None else cols
+        return self.gram[np.ix_(rows, cols)]
+
+    def fit(self, model, y, rows=None, sample_weight=None):
+        """Fit a copy of an RBF `SVC` on the cached kernel of `rows` (default: all rows).
+
+        Returns the precomputed-kernel SVC; predict with `block(new_rows, rows)`.
+        """
+        svc = clone(model).set_params(kernel='precomputed')
+        return svc.fit(self.gram if rows is None else self.block(rows), y, sample_weight=sample_weight)
+
+    def to_rbf(self, svc, model, rows=None):
+        """Turn a precomputed-kernel fit on `rows` into a fitted RBF SVC with `model`'s parameters."""
+        rows = np.arange(len(self.X)) if rows is None else rows
+        rbf = clone(model)
+        for attr, value in vars(svc).items():
+            if attr.endswith('_') or attr.startswith('_'):
+                setattr(rbf, attr, value)
+        rbf.support_vectors_ = self.X[rows[svc.support_]]
+        rbf._gamma = self.gamma
+        rbf.shape_fit_ = (len(rows), self.X.shape[1])
+        rbf.n_features_in_ = self.X.shape[1]
+        return rbf
@@ -0,0 +1,112 @@
+"""
+Export a fitted logistic regression plus the fitted `FeatureEngineer` into the
+fused raw-column scorer in `src.inference.linear`.
+
+Every engineered feature column is mapped back to the raw columns it is
+computed from, and the feature pipeline's standardization (plus an optional
+model scaler) is folded into the weights and the intercept.
+"""
+
+import logging
+
+import numpy as np
+
+from src.features.feature_engineer import INTERACTION_FEATURES
+from src.inference.linear import FusedLinearScorer
+
+logger = logging.getLogger(__name__)
+
+DURATION_INPUT = 'duration_ms'
+DURATION_BINS = {'is_short_song': 'short', 'is_medium_song': 'medium', 'is_long_song': 'long'}
+CATEGORY_COLUMN = 'decade'
+
+
+def ratio_pairs():
+    """Ratio feature name -> (numerator, denominator), as built by the feature pipeline."""
+    pairs = {
+        f'{a}_{b}_ratio': (a, b)
+        for a in INTERACTION_FEATURES for b in INTERACTION_FEATURES if a != b
+    }
+    pairs['acoustic_energy_ratio'] = ('acousticness', 'energy')
+    return pairs
+
+
+def _folded_weights(feature_engineer, model, scaler=None):
+    """Per-feature weights and intercept on unscaled engineered features."""
+    columns = list(feature_engineer.feature_columns)
+    weights = model.coef_[0].astype(np.float64)
+    intercept = float(model.intercept_[0])
+
+    # Model scaler (if any) is applied last, so it is folded first
+    if scaler is not None:
+        intercept -= float(np.sum(weights * scaler.mean_ / scaler.scale_))
+        weights = weights / scaler.scale_
+
+    fe_scaler = feature_engineer.scaler
+    position = {c: i for i, c in enumerate(columns)}
+    for i, column in enumerate(feature_engineer.scaled_columns):
+        j = position.get(column)
+        if j is None:
+            continue
+        intercept -= weights[j] * fe_scaler.mean_[i] / fe_scaler.scale_[i]
+        weights[j] = weights[j] / fe_scaler.scale_[i]
+    return dict(zip(columns, weights)), intercept
+
+
+def export_fused_linear(feature_engineer, model, scaler=None):
+    """Fused scorer for a binary linear model trained on `feature_engineer` output."""
+    if len(getattr(model, 'classes_', [])) != 2:
+        raise ValueError("Only binary linear models can be fused")
+    weights, intercept = _folded_weights(feature_engineer, model, scaler)
+    ratios = ratio_pairs()
+
+    derived = set(ratios) | set(DURATION_BINS) | {'energy_dance_composite', 'duration_minutes'}
+    inputs = [c for c in weights if c not in derived and not c.startswith(f'{CATEGORY_COLUMN}_')]
+    for a, b in [ratios[c] for c in weights if c in ratios] + [('energy', 'danceability')]:
+        inputs += [x for x in (a, b) if x not in inputs]
+    if any(c in weights for c in DURATION_BINS) or 'duration_minutes' in weights:
+        inputs += [DURATION_INPUT] if DURATION_INPUT not in inputs else []
+    index = {c: i for i, c in enumerate(inputs)}
+
+    linear = np.zeros(len(inputs))
+    ratio = {}
+    products, duration, categories = [], {}, {}
+    for column, weight in weights.items():
+        if column in ratios:
+            a, b = ratios[column]
+            ratio.setdefault(b, np.zeros(len(inputs)))[index[a]] += weight
+        elif column == 'energy_dance_composite':
+            products.append([index['energy'], index['danceability'], weight])
+        elif column == 'duration_minutes':
+            linear[index[DURATION_INPUT]] += weight / 60000
+        elif column in DURATION_BINS:
+            duration[DURATION_BINS[column]] = weight
+        elif column.startswith(f'{CATEGORY_COLUMN}_'):
+            categories[column[len(CATEGORY_COLUMN) + 1:]] = weight
+        else:
+            linear[index[column]] += weight
+
+    denominators = list(ratio)
+    meta = {
+        'model_type': type(model).__name__,
+        'inputs': inputs,
+        'intercept': intercept,
+        'linear': linear.tolist(),
+        'ratio_denominators': [index[b] for b in denominators],
+        'ratio': np.column_stack([ratio[b] for b in denominators]).ravel().tolist() if denominators else [],
+        'products': products,
+        'duration': {'input': index[DURATION_INPUT], **{k: duration.get(k, 0.0) for k in DURATION_BINS.values()}}
+                    if duration else None,
+        'category_column': CATEGORY_COLUMN if categories else None,
+        'categories': categories,
+        'classes': model.classes_.tolist()
+    }
+    return FusedLinearScorer(meta)
+
+
+def save_fused_linear(feature_engineer, model, path, scaler=None):
+    """Export and save the fused scorer; returns its path."""
+    scorer = export_fused_linear(feature_engineer, model, scaler)
+    path = scorer.save(path)
+    logger.info(f"Saved fused linear scorer: {path} ({len(scorer.inputs)} raw inputs)")
+    return path
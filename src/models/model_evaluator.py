@@ -7,19 +7,21 @@ import numpy as np
 from sklearn.metrics import (accuracy_score, precision_score, recall_score, 
                            f1_score, confusion_matrix, classification_report, 
                            roc_auc_score, roc_curve, precision_recall_curve)
-import matplotlib.pyplot as plt
-import seaborn as sns
 from pathlib import Path
 import logging
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 class ModelEvaluator:
     def __init__(self):
         self.figures_path = Path("reports/figures")
+    
+    def _pyplot(self):
+        """matplotlib's pyplot, imported on the first plot."""
+        import matplotlib.pyplot as plt
+        
         self.figures_path.mkdir(parents=True, exist_ok=True)
+        return plt
     
     def calculate_metrics(self, y_true, y_pred, y_proba=None):
         """Calculate comprehensive evaluation metrics."""
@@ -40,6 +42,9 @@ class ModelEvaluator:
     
     def plot_confusion_matrix(self, y_true, y_pred, model_name):
         """Plot confusion matrix."""
+        import seaborn as sns
+        
+        plt = self._pyplot()
         cm = confusion_matrix(y_true, y_pred)
         
         plt.figure(figsize=(8, 6))
@@ -61,6 +66,7 @@ class ModelEvaluator:
             logger.warning(f"No probabilities available for ROC curve - {model_name}")
             return 0.0
             
+        plt = self._pyplot()
         fpr, tpr, _ = roc_curve(y_true, y_proba)
         roc_auc = roc_auc_score(y_true, y_proba)
         
@@ -4,46 +4,120 @@ Model training for hit song prediction.
 
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier, GradientBoostingClassifier, HistGradientBoostingClassifier
 from sklearn.svm import SVC
-from sklearn.linear_model import LogisticRegression
+from sklearn.linear_model import LogisticRegression, SGDClassifier
 from sklearn.neural_network import MLPClassifier
-from sklearn.model_selection import train_test_split, cross_val_score
-from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, train_test_split
+from sklearn.metrics import accuracy_score
 from sklearn.preprocessing import StandardScaler
 import xgboost as xgb
 import joblib
 import logging
+import shutil
 from pathlib import Path
 
-# Setup logging
-logging.basicConfig(level=logging.INFO)
+from src.models.training_matrix import TrainingMatrix
+from src.models.xgb_data import XGBDataCache
+from src.models.coreset import CoresetSelector, fit_weighted
+from src.models.kernel_cache import KernelCache
+from src.models.stacking import StackedEnsemble
+from src.models.results_store import ResultsStore
+from src.models.tree_export import save_compact
+from src.models.artifacts import fingerprint, hash_data, model_params, read_metadata, write_metadata
+from src.utils.resources import ResourceGovernor
+from src.utils.telemetry import TrainingTelemetry
+
 logger = logging.getLogger(__name__)
 
+# Models trained on standardized inputs
+SCALED_MODELS = ['SVM', 'Neural Network']
+
+# Super-linear learners that can train on a weighted coreset
+CORESET_MODELS = ['SVM', 'Neural Network']
+
+# Identifier / label columns that are never used as features
+EXCLUDE_COLUMNS = ['target', 'decade', 'uri', 'track', 'artist', 'id']
+
 class ModelTrainer:
-    def __init__(self):
+    def __init__(self, early_stopping=True, hist_boosting=False,
+                 validation_fraction=0.1, early_stopping_rounds=10, resources=None,
+                 force_retrain=False, compact_artifacts='mmap', telemetry=None,
+                 models_path="models/saved_models", coreset_size=None, coreset_method='cluster',
+                 coreset_baseline=False, svm_kernel_cache=False, kernel_memory_mb=2048,
+                 results_memory_mb=256):
         self.models = {}
-        self.results = {}
-        self.models_path = Path("models/saved_models")
-        self.models_path.mkdir(parents=True, exist_ok=True)
+        self.scalers = {}
+        self.xgb_cache = None
+        self.early_stopping = early_stopping
+        self.hist_boosting = hist_boosting
+        self.validation_fraction = validation_fraction
+        self.early_stopping_rounds = early_stopping_rounds
+        self.resources = resources or ResourceGovernor()
+        self.force_retrain = force_retrain
+        self.telemetry = telemetry or TrainingTelemetry()
+        # With a coreset size, CORESET_MODELS fit on a weighted subset of that
+        # many rows; the baseline option also fits them on all rows to report
+        # the accuracy lost against the fit time saved
+        self.coreset_size = coreset_size
+        self.coreset_method = coreset_method
+        self.coreset_baseline = coreset_baseline
+        # The SVM can train on a precomputed RBF Gram matrix shared by its fit,
+        # CV folds and C tuning, when it fits in `kernel_memory_mb`
+        self.svm_kernel_cache = svm_kernel_cache
+        self.kernel_memory_mb = kernel_memory_mb
+        self.kernel_cache = None
+        # Tree ensembles are also written in the compact flat-array format:
+        # 'mmap' (memory-mappable .npy files), 'compressed' or None to skip
+        self.compact_artifacts = compact_artifacts
+        self.models_path = Path(models_path)
+        # Fitted scalers and feature pipeline live in a subdirectory so that
+        # scripts globbing `*.pkl` only ever see models
+        self.preprocessing_path = self.models_path / "preprocessing"
+        self.oof_path = self.models_path / "oof"
+        self.ensemble_path = self.models_path / "ensemble"
+        # Test-set predictions/probabilities, spilled to disk past `results_memory_mb`
+        self.results = ResultsStore(spill_path=self.models_path / "results", max_memory_mb=results_memory_mb)
         
     def initialize_models(self):
         """Initialize all machine learning models."""
+        # Iterative learners monitor a held-out validation split and stop once
+        # it stops improving for `early_stopping_rounds` iterations.
+        stopping = self.early_stopping_rounds if self.early_stopping else None
+        validation = {'validation_fraction': self.validation_fraction}
+        
+        if self.hist_boosting:
+            gradient_boosting = HistGradientBoostingClassifier(
+                max_iter=100, random_state=42, early_stopping=self.early_stopping,
+                n_iter_no_change=self.early_stopping_rounds, **validation
+            )
+        else:
+            gradient_boosting = GradientBoostingClassifier(
+                n_estimators=100, random_state=42, n_iter_no_change=stopping, **validation
+            )
+        
         self.models = {
             'Logistic Regression': LogisticRegression(random_state=42, max_iter=1000),
             'Random Forest': RandomForestClassifier(n_estimators=100, random_state=42),
-            'Gradient Boosting': GradientBoostingClassifier(n_estimators=100, random_state=42),
+            'Gradient Boosting': gradient_boosting,
             'SVM': SVC(probability=True, random_state=42),
-            'Neural Network': MLPClassifier(hidden_layer_sizes=(100, 50), random_state=42, max_iter=1000),
-            'XGBoost': xgb.XGBClassifier(n_estimators=100, random_state=42, eval_metric='logloss')
+            'Neural Network': MLPClassifier(
+                hidden_layer_sizes=(100, 50), random_state=42, max_iter=1000,
+                early_stopping=self.early_stopping, n_iter_no_change=self.early_stopping_rounds, **validation
+            ),
+            'XGBoost': xgb.XGBClassifier(
+                n_estimators=100, random_state=42, eval_metric='logloss', early_stopping_rounds=stopping
+            )
         }
+        for model in self.models.values():
+            self.resources.configure_model(model, 'training')
         logger.info(f"Initialized {len(self.models)} models")
     
     def prepare_features(self, df):
         """Prepare features and target for modeling."""
         # Exclude non-feature columns
-        exclude_cols = ['target', 'decade', 'uri', 'track', 'artist', 'id']
-        feature_columns = [col for col in df.columns if col not in exclude_cols]
+        feature_columns = [col for col in df.columns if col not in EXCLUDE_COLUMNS]
         
         X = df[feature_columns]
         y = df['target']
@@ -54,142 +128,556 @@ class ModelTrainer:
         logger.info(f"Prepared features: {X.shape[1]} features, {len(y)} samples")
         return X, y, feature_columns
     
-    def train_all_models(self, df, train_indices=None, test_indices=None):
-        """Train all models and evaluate performance."""
+    def build_training_matrix(self, df, train_indices=None, test_indices=None):
+        """Build the float32 training matrix, using the given split or a new stratified one."""
+        feature_columns = [col for col in df.columns if col not in EXCLUDE_COLUMNS]
+        return TrainingMatrix.from_frame(df, feature_columns, train_indices, test_indices,
+                                         test_size=0.25, random_state=42)
+    
+    def train_all_models(self, df, train_indices=None, test_indices=None, model_names=None):
+        """Train all models (or only `model_names`) and evaluate performance."""
         self.initialize_models()
+        if model_names is not None:
+            self.models = {name: model for name, model in self.models.items() if name in model_names}
         
-        # Prepare data
-        X, y, feature_columns = self.prepare_features(df)
+        # Prepare data (pre-defined split or a new stratified split)
+        matrix = self.build_training_matrix(df, train_indices, test_indices)
         
-        # Use pre-defined split or create new split
-        if train_indices is not None and test_indices is not None:
-            X_train = X.iloc[train_indices]
-            X_test = X.iloc[test_indices]
-            y_train = y.iloc[train_indices]
-            y_test = y.iloc[test_indices]
-            logger.info(f"Using pre-split data: Train={X_train.shape[0]}, Test={X_test.shape[0]}")
-        else:
-            X_train, X_test, y_train, y_test = train_test_split(
-                X, y, test_size=0.25, random_state=42, stratify=y
-            )
-            logger.info(f"Created new split: Train={X_train.shape[0]}, Test={X_test.shape[0]}")
+        return self._train_and_evaluate(matrix)
+    
+    def train_with_pre_split_data(self, features_df, train_indices, test_indices):
+        """Train models with pre-defined train/test split."""
+        self.initialize_models()
+        
+        matrix = self.build_training_matrix(features_df, train_indices, test_indices)
         
-        # Train and evaluate each model
-        for name, model in self.models.items():
+        return self._train_and_evaluate(matrix)
+    
+    def _train_and_evaluate(self, matrix):
+        """Fit, score and save every initialized model on a training matrix."""
+        data_hash = hash_data(matrix.X, matrix.y, np.array([matrix.n_train]))
+        X_train, X_test = matrix.X_train, matrix.X_test
+        y_train, y_test = matrix.y_train, matrix.y_test
+        
+        for name, model in list(self.models.items()):
             logger.info(f"Training {name}...")
             
             try:
-                # Use scaled features for SVM and Neural Network
-                if name in ['SVM', 'Neural Network']:
-                    scaler = StandardScaler()
-                    X_train_scaled = scaler.fit_transform(X_train)
-                    X_test_scaled = scaler.transform(X_test)
-                    
-                    model.fit(X_train_scaled, y_train)
-                    y_pred = model.predict(X_test_scaled)
-                    y_pred_proba = model.predict_proba(X_test_scaled)[:, 1] if hasattr(model, "predict_proba") else None
+                extra = {'scaled': name in SCALED_MODELS, 'training': self._training_options(name)}
+                if self._uses_coreset(name):
+                    extra['coreset'] = {'size': self.coreset_size, 'method': self.coreset_method}
+                record = fingerprint(data_hash, matrix.feature_columns, model_params(model), **extra)
+                coreset_report = None
+                cached = None
+                if not self.force_retrain and StackedEnsemble(self.oof_path).has_predictions(name, data_hash):
+                    cached = self._load_if_unchanged(name, record['fingerprint'])
+                
+                if cached is not None:
+                    model, saved_metrics = cached
+                    self.models[name] = model
+                    X_test_fit = self.scalers[name].transform(X_test) if name in SCALED_MODELS else X_test
+                    logger.info(f"{name} unchanged (fingerprint {record['fingerprint'][:12]}), loaded saved artifact")
                 else:
-                    model.fit(X_train, y_train)
-                    y_pred = model.predict(X_test)
-                    y_pred_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
+                    # Use scaled features for SVM and Neural Network
+                    if name in SCALED_MODELS:
+                        scaler = StandardScaler()
+                        X_train_fit, X_test_fit = matrix.scaled(scaler)
+                        self.scalers[name] = scaler
+                    else:
+                        X_train_fit = X_train
+                        X_test_fit = X_test
+                    
+                    rows = None
+                    if self._uses_coreset(name):
+                        with self.telemetry.measure(name, 'coreset', shape=X_train_fit.shape) as selection:
+                            rows, weights = self._select_coreset(X_train_fit, y_train, matrix.groups_train)
+                    
+                    if name == 'SVM':
+                        self.kernel_cache = self._build_kernel_cache(X_train_fit, y_train, model)
+                    
+                    fit_shape = X_train_fit.shape if rows is None else (len(rows), X_train_fit.shape[1])
+                    with self.resources.limit('training'), \
+                            self.telemetry.measure(name, 'fit', shape=fit_shape) as stats:
+                        if name == 'SVM' and self.kernel_cache is not None:
+                            svc = self.kernel_cache.fit(model, y_train if rows is None else y_train[rows], rows,
+                                                        None if rows is None else weights)
+                            model = self.models[name] = self.kernel_cache.to_rbf(svc, model, rows)
+                        elif rows is None:
+                            self._fit_model(name, model, X_train_fit, y_train)
+                        else:
+                            fit_weighted(model, X_train_fit[rows], y_train[rows], weights)
+                        stats['n_iterations'] = self._iterations_used(model)
+                    
+                    if rows is not None:
+                        coreset_report = self._coreset_report(name, model, rows, selection, stats,
+                                                              X_train_fit, y_train, X_test_fit, y_test)
+                
+                with self.resources.limit('evaluation'), self.telemetry.measure(name, 'predict', shape=X_test_fit.shape):
+                    y_pred = model.predict(X_test_fit)
+                    y_pred_proba = model.predict_proba(X_test_fit)[:, 1] if hasattr(model, "predict_proba") else None
                 
                 # Calculate metrics
                 accuracy = accuracy_score(y_test, y_pred)
-                cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy')
+                if cached is not None:
+                    cv_mean, cv_std = saved_metrics['cv_mean'], saved_metrics['cv_std']
+                else:
+                    with self.resources.limit('training'), \
+                            self.telemetry.measure(name, 'cv', shape=X_train.shape):
+                        cv_scores, oof_proba = self._cross_validate(name, model, matrix)
+                    cv_mean, cv_std = cv_scores.mean(), cv_scores.std()
+                    if y_pred_proba is not None:
+                        StackedEnsemble(self.oof_path).save_predictions(
+                            name, oof_proba, y_pred_proba, y_train, y_test, data_hash
+                        )
+                n_iterations = self._iterations_used(model)
                 
                 # Store results
-                self.results[name] = {
-                    'model': model,
-                    'accuracy': accuracy,
-                    'cv_mean': cv_scores.mean(),
-                    'cv_std': cv_scores.std(),
-                    'predictions': y_pred,
-                    'probabilities': y_pred_proba,
-                    'feature_importance': getattr(model, 'feature_importances_', None),
-                    'y_test': y_test
-                }
+                self.results.add(
+                    name,
+                    model=model,
+                    accuracy=accuracy,
+                    cv_mean=cv_mean,
+                    cv_std=cv_std,
+                    n_iterations=n_iterations,
+                    predictions=y_pred,
+                    probabilities=y_pred_proba,
+                    feature_importance=getattr(model, 'feature_importances_', None),
+                    y_test=y_test,
+                    **({'coreset': coreset_report} if coreset_report is not None else {})
+                )
                 
                 # Save model
-                self.save_model(model, name)
+                if cached is None:
+                    metrics = {'accuracy': accuracy, 'cv_mean': cv_mean, 'cv_std': cv_std, 'n_iterations': n_iterations}
+                    if coreset_report is not None:
+                        metrics['coreset_rows'] = coreset_report['rows']
+                    self.save_model(model, name, record, metrics)
                 
-                logger.info(f"{name} - Accuracy: {accuracy:.3f}, CV: {cv_scores.mean():.3f}")
+                logger.info(f"{name} - Accuracy: {accuracy:.3f}, CV: {cv_mean:.3f}, Iterations: {n_iterations}")
                 
             except Exception as e:
                 logger.error(f"Error training {name}: {e}")
         
+        self.telemetry.save(self.models_path / 'telemetry.json')
+        self.telemetry.log_summary()
         return self.results
     
-    def train_with_pre_split_data(self, features_df, train_indices, test_indices):
-        """Train models with pre-defined train/test split."""
-        self.initialize_models()
+    def _cross_validate(self, name, model, matrix, n_splits=5):
+        """Stratified CV over fold views of the training matrix.
         
-        # Prepare features
-        exclude_cols = ['target', 'decade', 'uri', 'track', 'artist', 'id']
-        feature_columns = [col for col in features_df.columns if col not in exclude_cols]
+        Returns the per-fold accuracies and the out-of-fold hit probabilities
+        for every training row (cached for the stacked ensemble).
+        """
+        if name == 'XGBoost':
+            # Early-stopped XGBoost is pinned to its best round count
+            return self._cross_validate_xgboost(
+                model.get_xgb_params(), self._iterations_used(model), self.xgb_cache, n_splits
+            )
         
-        X = features_df[feature_columns]
-        y = features_df['target']
+        scores = []
+        oof_proba = np.zeros(matrix.n_train, dtype=np.float32)
+        folds = matrix.folds(n_splits, scaled=name in SCALED_MODELS)
+        for fold, (X_fit, y_fit, X_val, y_val, val_idx) in enumerate(folds):
+            with self.telemetry.measure(name, 'fold', fold=fold, shape=X_fit.shape) as stats:
+                # Fit rows are the train rows outside the fold, in order
+                fit_idx = np.setdiff1d(np.arange(matrix.n_train), val_idx)
+                rows, weights = None, None
+                if self._uses_coreset(name):
+                    groups = None if matrix.groups is None else matrix.groups_train[fit_idx]
+                    rows, weights = self._select_coreset(X_fit, y_fit, groups)
+                
+                if name == 'SVM' and self.kernel_cache is not None:
+                    fit_rows = fit_idx if rows is None else fit_idx[rows]
+                    estimator = self.kernel_cache.fit(model, matrix.y_train[fit_rows], fit_rows, weights)
+                    X_val = self.kernel_cache.block(val_idx, fit_rows)
+                else:
+                    estimator = clone(model)
+                    if rows is None:
+                        estimator.fit(X_fit, y_fit)
+                    else:
+                        fit_weighted(estimator, X_fit[rows], y_fit[rows], weights)
+                scores.append(accuracy_score(y_val, estimator.predict(X_val)))
+                if hasattr(estimator, 'predict_proba'):
+                    oof_proba[val_idx] = estimator.predict_proba(X_val)[:, 1]
+                stats['n_iterations'] = self._iterations_used(estimator)
+        return np.array(scores), oof_proba
+    
+    def _build_kernel_cache(self, X_train, y_train, model):
+        """Gram matrix of the SVM's training rows, or None if disabled or over the memory budget."""
+        if not self.svm_kernel_cache:
+            return None
+        required = KernelCache.required_mb(len(X_train))
+        if required > self.kernel_memory_mb:
+            logger.warning(f"SVM kernel cache needs {required:.0f} MB > {self.kernel_memory_mb} MB budget; "
+                           f"training without it (a coreset keeps the Gram matrix small)")
+            return None
+        with self.telemetry.measure('SVM', 'kernel', shape=X_train.shape):
+            cache = KernelCache(X_train, y_train, gamma=model.gamma)
+        logger.info(f"Cached SVM kernel: {len(X_train)} x {len(X_train)} ({cache.nbytes / 1024 ** 2:.0f} MB)")
+        return cache
+    
+    def _training_options(self, name):
+        """Trainer options that change how `name` is fitted beyond its own parameters
+        (e.g., the validation split XGBoost early-stops on)."""
+        options = {
+            'early_stopping': self.early_stopping,
+            'early_stopping_rounds': self.early_stopping_rounds,
+            'validation_fraction': self.validation_fraction,
+            'hist_boosting': self.hist_boosting
+        }
+        if name == 'SVM':
+            options.update(svm_kernel_cache=self.svm_kernel_cache, kernel_memory_mb=self.kernel_memory_mb)
+        return options
+    
+    def _uses_coreset(self, name):
+        return bool(self.coreset_size) and name in CORESET_MODELS
+    
+    def _select_coreset(self, X, y, groups=None):
+        """Row indices and sample weights of the coreset of (X, y), stratified by target and group."""
+        return CoresetSelector(self.coreset_size, self.coreset_method).select(X, y, groups)
+    
+    def _coreset_report(self, name, model, rows, selection, fit, X_train, y_train, X_test, y_test):
+        """Coreset size and cost; with `coreset_baseline`, accuracy lost vs fit time saved."""
+        seconds = selection['wall_seconds'] + fit['wall_seconds']
+        report = {
+            'method': self.coreset_method,
+            'rows': len(rows),
+            'fraction': len(rows) / len(X_train),
+            'selection_seconds': selection['wall_seconds'],
+            'fit_seconds': fit['wall_seconds']
+        }
+        if not self.coreset_baseline or len(rows) == len(X_train):
+            logger.info(f"{name} coreset: {len(rows)}/{len(X_train)} rows, {seconds:.1f}s")
+            return report
         
-        # Handle any remaining missing values
-        X = X.fillna(X.median())
+        baseline = clone(model)
+        with self.resources.limit('training'), \
+                self.telemetry.measure(name, 'full_baseline', shape=X_train.shape) as full:
+            baseline.fit(X_train, y_train)
+        full_accuracy = accuracy_score(y_test, baseline.predict(X_test))
+        coreset_accuracy = accuracy_score(y_test, model.predict(X_test))
+        report.update({
+            'accuracy': coreset_accuracy,
+            'full_accuracy': full_accuracy,
+            'full_fit_seconds': full['wall_seconds'],
+            'accuracy_lost': full_accuracy - coreset_accuracy,
+            'time_saved_seconds': full['wall_seconds'] - seconds,
+            'speedup': full['wall_seconds'] / max(seconds, 1e-9)
+        })
+        logger.info(f"{name} coreset: {len(rows)}/{len(X_train)} rows, accuracy {coreset_accuracy:.3f} vs "
+                    f"{full_accuracy:.3f} on all rows ({-report['accuracy_lost']:+.3f}), "
+                    f"fit {seconds:.1f}s vs {full['wall_seconds']:.1f}s ({report['speedup']:.1f}x faster)")
+        return report
+    
+    def _load_if_unchanged(self, name, expected_fingerprint):
+        """Return (model, saved metrics) if the saved artifact matches the fingerprint."""
+        metadata = read_metadata(self._metadata_file(name))
+        if not metadata or metadata.get('fingerprint') != expected_fingerprint:
+            return None
         
-        # Use pre-defined split
-        X_train = X.iloc[train_indices]
-        X_test = X.iloc[test_indices]
-        y_train = y.iloc[train_indices]
-        y_test = y.iloc[test_indices]
+        try:
+            model = self.load_model(name)
+        except FileNotFoundError:
+            return None
         
-        logger.info(f"Using pre-split data: Train={X_train.shape[0]}, Test={X_test.shape[0]}")
+        if name in SCALED_MODELS:
+            scaler = self.load_scaler(name)
+            if scaler is None:
+                return None
+            self.scalers[name] = scaler
         
-        # Train and evaluate each model
-        for name, model in self.models.items():
-            logger.info(f"Training {name}...")
+        self.resources.configure_model(model, 'training')
+        return model, metadata.get('metrics', {})
+    
+    def _fit_model(self, name, model, X_train, y_train, xgb_model=None):
+        """Fit a model; XGBoost trains on a quantized matrix cached for later CV and search."""
+        if name == 'XGBoost':
+            self.xgb_cache = XGBDataCache(X_train, y_train, nthread=self.resources.n_jobs('training'))
+            return self._fit_xgboost(model, self.xgb_cache, xgb_model=xgb_model)
+        model.fit(X_train, y_train)
+        return model
+    
+    def _fit_xgboost(self, model, cache, xgb_model=None):
+        """Train the booster natively on cached matrices and load it into the sklearn wrapper.
+        
+        With early stopping, a stratified validation split is held out by index.
+        """
+        evals = []
+        dtrain = cache.base
+        if self.early_stopping:
+            fit_idx, val_idx = train_test_split(
+                np.arange(cache.n_rows), test_size=self.validation_fraction,
+                random_state=42, stratify=cache.y
+            )
+            dtrain = cache.subset(fit_idx, 'early_stopping_fit')
+            evals = [(cache.subset(val_idx, 'early_stopping_val', ref=dtrain), 'validation')]
+        
+        booster = xgb.train(
+            model.get_xgb_params(), dtrain, num_boost_round=model.n_estimators, evals=evals,
+            early_stopping_rounds=model.early_stopping_rounds if evals else None,
+            xgb_model=xgb_model, verbose_eval=False
+        )
+        model.load_model(bytearray(booster.save_raw(raw_format='json')))
+        return model
+    
+    def _cross_validate_xgboost(self, params, n_rounds, cache, n_splits=5, name='XGBoost'):
+        """CV accuracies and out-of-fold probabilities for fixed-round XGBoost on the cached folds."""
+        scores = []
+        oof_proba = np.zeros(cache.n_rows, dtype=np.float32)
+        for fold, (dfit, dval, val_idx) in enumerate(cache.folds(n_splits)):
+            shape = (dfit.num_row(), dfit.num_col())
+            with self.telemetry.measure(name, 'fold', fold=fold, shape=shape) as stats:
+                booster = xgb.train(params, dfit, num_boost_round=n_rounds, verbose_eval=False)
+                stats['n_iterations'] = n_rounds
+            oof_proba[val_idx] = booster.predict(dval)
+            scores.append(accuracy_score(cache.y[val_idx], (oof_proba[val_idx] > 0.5).astype(int)))
+        return np.array(scores), oof_proba
+    
+    def tune_xgboost(self, param_grid, matrix=None, n_splits=5):
+        """Grid-search XGBoost hyperparameters, reusing one set of quantized CV folds.
+        
+        Without `matrix`, the folds cached by the last XGBoost training run are reused.
+        `max_bin` fixes the quantization and cannot be searched this way.
+        """
+        if 'max_bin' in param_grid:
+            raise ValueError("max_bin changes the quantized matrix; tune it separately")
+        
+        base = xgb.XGBClassifier(n_estimators=100, random_state=42, eval_metric='logloss')
+        self.resources.configure_model(base, 'training')
+        if matrix is not None:
+            cache = XGBDataCache(matrix.X_train, matrix.y_train, nthread=self.resources.n_jobs('training'))
+        elif self.xgb_cache is not None:
+            cache = self.xgb_cache
+        else:
+            raise ValueError("No training matrix given and no XGBoost data cached yet")
+        
+        candidates = []
+        with self.resources.limit('training'):
+            for candidate in ParameterGrid(param_grid):
+                params = {**base.get_xgb_params(), **candidate}
+                n_rounds = params.pop('n_estimators', base.n_estimators)
+                scores, _ = self._cross_validate_xgboost(params, n_rounds, cache, n_splits, name='XGBoost tuning')
+                candidates.append({'params': candidate, 'cv_mean': scores.mean(), 'cv_std': scores.std()})
+                logger.info(f"XGBoost {candidate} - CV: {scores.mean():.3f}")
+        
+        best = max(candidates, key=lambda c: c['cv_mean'])
+        return best, candidates
+    
+    def tune_svm(self, param_grid, matrix=None, n_splits=5):
+        """Grid-search SVM settings (e.g. `C`) on one cached RBF kernel shared by all folds.
+        
+        Without `matrix`, the kernel cached by the last SVM training run is reused.
+        `gamma` and `kernel` change the Gram matrix and cannot be searched this way.
+        """
+        if {'gamma', 'kernel'} & set(param_grid):
+            raise ValueError("gamma and kernel change the cached Gram matrix; tune them separately")
+        
+        base = SVC(random_state=42)
+        if matrix is not None:
+            X_train, _ = matrix.scaled(StandardScaler())
+            cache = KernelCache(X_train, matrix.y_train, gamma=base.gamma)
+        elif self.kernel_cache is not None:
+            cache = self.kernel_cache
+        else:
+            raise ValueError("No training matrix given and no SVM kernel cached yet")
+        
+        folds = list(StratifiedKFold(n_splits=n_splits).split(cache.X, cache.y))
+        candidates = []
+        with self.resources.limit('training'):
+            for candidate in ParameterGrid(param_grid):
+                model = clone(base).set_params(**candidate)
+                scores = []
+                for fold, (fit_idx, val_idx) in enumerate(folds):
+                    with self.telemetry.measure('SVM tuning', 'fold', fold=fold, shape=(len(fit_idx), cache.X.shape[1])):
+                        svc = cache.fit(model, cache.y[fit_idx], fit_idx)
+                        scores.append(accuracy_score(cache.y[val_idx], svc.predict(cache.block(val_idx, fit_idx))))
+                candidates.append({'params': candidate, 'cv_mean': np.mean(scores), 'cv_std': np.std(scores)})
+                logger.info(f"SVM {candidate} - CV: {np.mean(scores):.3f}")
+        
+        best = max(candidates, key=lambda c: c['cv_mean'])
+        return best, candidates
+    
+    @staticmethod
+    def _iterations_used(model):
+        """Number of boosting rounds / epochs / solver iterations the fitted model actually ran."""
+        if isinstance(model, xgb.XGBClassifier):
+            best_iteration = getattr(model, 'best_iteration', None)
+            return int(best_iteration) + 1 if best_iteration is not None else model.get_booster().num_boosted_rounds()
+        if isinstance(model, GradientBoostingClassifier):
+            return int(model.n_estimators_)
+        if isinstance(model, RandomForestClassifier):
+            return len(model.estimators_)
+        n_iter = getattr(model, 'n_iter_', None)
+        if n_iter is None:
+            return None
+        return int(np.max(n_iter))
+    
+    def build_stacked_ensemble(self, base_names=None, weights=None):
+        """Fit a stacked (or, with `weights`, blended) ensemble on cached out-of-fold predictions.
+        
+        Only the meta-learner is fitted; base models are not retrained.
+        """
+        if base_names is None and self.results:
+            base_names = [name for name in self.results if name != 'Stacked Ensemble']
+        
+        ensemble = StackedEnsemble(self.oof_path)
+        if weights:
+            ensemble.blend(weights)
+        else:
+            ensemble.fit(base_names)
+        
+        evaluation = ensemble.evaluate()
+        self.results.add(
+            'Stacked Ensemble',
+            model=ensemble,
+            accuracy=evaluation['accuracy'],
+            cv_mean=evaluation['cv_mean'],
+            cv_std=evaluation['cv_std'],
+            n_iterations=None,
+            predictions=evaluation['predictions'],
+            probabilities=evaluation['probabilities'],
+            y_test=evaluation['y_test']
+        )
+        ensemble.save(self.ensemble_path / 'stacked_ensemble.pkl')
+        logger.info(f"Stacked Ensemble ({', '.join(ensemble.base_names)}) - "
+                    f"Accuracy: {evaluation['accuracy']:.3f}, CV: {evaluation['cv_mean']:.3f}")
+        return ensemble
+    
+    def update_models(self, new_df, replay_df=None, feature_columns=None,
+                      extra_rounds=20, extra_trees=20, epochs=5):
+        """Continue training the saved models on a batch of new songs.
+        
+        Only `new_df` plus the optional `replay_df` sample (both engineered with the
+        training feature pipeline) are processed, so cost scales with the batch.
+        """
+        self.initialize_models()
+        
+        if replay_df is not None and len(replay_df):
+            new_df = pd.concat([new_df, replay_df], ignore_index=True)
+        X, y, _ = self.prepare_features(new_df)
+        if feature_columns is not None:
+            X = X[feature_columns]
+        batch_hash = hash_data(X, y)
+        logger.info(f"Incremental update on {len(X)} rows ({0 if replay_df is None else len(replay_df)} replayed)")
+        
+        for name in self.models:
+            try:
+                model = self.load_model(name)
+            except FileNotFoundError:
+                logger.warning(f"No saved artifact for {name}; skipping incremental update")
+                continue
             
+            logger.info(f"Updating {name}...")
             try:
-                # Use scaled features for SVM and Neural Network
-                if name in ['SVM', 'Neural Network']:
-                    scaler = StandardScaler()
-                    X_train_scaled = scaler.fit_transform(X_train)
-                    X_test_scaled = scaler.transform(X_test)
-                    model.fit(X_train_scaled, y_train)
-                    y_pred = model.predict(X_test_scaled)
-                    y_pred_proba = model.predict_proba(X_test_scaled)[:, 1] if hasattr(model, "predict_proba") else None
-                else:
-                    model.fit(X_train, y_train)
-                    y_pred = model.predict(X_test)
-                    y_pred_proba = model.predict_proba(X_test)[:, 1] if hasattr(model, "predict_proba") else None
-                
-                # Calculate metrics
-                accuracy = accuracy_score(y_test, y_pred)
-                cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='accuracy')
-                
-                # Store results
-                self.results[name] = {
-                    'model': model,
-                    'accuracy': accuracy,
-                    'cv_mean': cv_scores.mean(),
-                    'cv_std': cv_scores.std(),
-                    'predictions': y_pred,
-                    'probabilities': y_pred_proba,
-                    'feature_importance': getattr(model, 'feature_importances_', None),
-                    'y_test': y_test
-                }
-                
-                # Save model
-                self.save_model(model, name)
-                
-                logger.info(f"{name} - Accuracy: {accuracy:.3f}, CV: {cv_scores.mean():.3f}")
-                
+                previous = read_metadata(self._metadata_file(name)) or {}
+                self.resources.configure_model(model, 'training')
+                with self.resources.limit('training'), \
+                        self.telemetry.measure(name, 'update', shape=X.shape) as stats:
+                    n_iterations = stats['n_iterations'] = self._update_model(
+                        name, model, X, y, extra_rounds, extra_trees, epochs)
+                self.models[name] = model
+                self.results.add(name, model=model, n_rows=len(X), n_iterations=n_iterations)
+                # An updated artifact never matches a from-scratch fingerprint
+                record = fingerprint(batch_hash, X.columns, model_params(model),
+                                     incremental_from=previous.get('fingerprint'))
+                self.save_model(model, name, record, {'n_rows': len(X), 'n_iterations': n_iterations})
+                logger.info(f"{name} - updated on {len(X)} rows, Iterations: {n_iterations}")
             except Exception as e:
-                logger.error(f"Error training {name}: {e}")
+                logger.error(f"Error updating {name}: {e}")
         
+        self.telemetry.save(self.models_path / 'telemetry.json')
+        self.telemetry.log_summary()
         return self.results
     
-    def save_model(self, model, name):
-        """Save trained model to file."""
+    def _update_model(self, name, model, X, y, extra_rounds, extra_trees, epochs):
+        """Warm-start a single fitted model on new rows; returns the iterations it ran."""
+        # Out-of-core models save a scaler for every model, not only SCALED_MODELS
+        scaler = self.load_scaler(name)
+        if scaler is None and name in SCALED_MODELS:
+            logger.warning(f"No saved scaler for {name}; fitting one on the update batch")
+            scaler = StandardScaler().fit(X)
+        if scaler is not None:
+            self.scalers[name] = scaler
+            X = scaler.transform(X)
+        
+        if isinstance(model, xgb.XGBClassifier):
+            # Add boosting rounds on top of the (early-stopped) booster
+            booster = model.get_booster()[:self._iterations_used(model)]
+            model.set_params(n_estimators=extra_rounds)
+            self._fit_model(name, model, X, y, xgb_model=booster)
+        elif isinstance(model, RandomForestClassifier):
+            # New trees are grown on the new rows only; existing trees are kept
+            model.set_params(warm_start=True, n_estimators=len(model.estimators_) + extra_trees)
+            model.fit(X, y)
+        elif isinstance(model, GradientBoostingClassifier):
+            model.set_params(warm_start=True, n_estimators=model.n_estimators_ + extra_rounds)
+            model.fit(X, y)
+        elif isinstance(model, HistGradientBoostingClassifier):
+            model.set_params(warm_start=True, max_iter=model.n_iter_ + extra_rounds)
+            model.fit(X, y)
+        elif isinstance(model, MLPClassifier):
+            # partial_fit does not hold out a validation split; track the training
+            # loss instead of the validation score from here on
+            model.set_params(early_stopping=False)
+            if getattr(model, 'best_loss_', None) is None:
+                model.best_loss_ = min(model.loss_curve_)
+            for _ in range(epochs):
+                model.partial_fit(X, y)
+            # n_iter_ counts a single epoch per partial_fit call
+            return epochs
+        elif isinstance(model, SGDClassifier):
+            # Streaming logistic regression trained out of core
+            for _ in range(epochs):
+                model.partial_fit(X, y)
+            return epochs
+        elif isinstance(model, LogisticRegression):
+            # A warm-started lbfgs fit converges to the batch-only optimum and forgets
+            # the earlier training. Instead take `epochs` SGD passes on the same
+            # penalized log loss from the current coefficients, so the batch nudges
+            # the model; it stays a LogisticRegression for the fused/bundle exports.
+            # The step size is bounded by the largest row norm: the heavy-tailed
+            # ratio features would otherwise make single steps overshoot.
+            rows = np.asarray(X, dtype=np.float64)
+            step = SGDClassifier(loss='log_loss', alpha=1 / (model.C * len(X)), learning_rate='constant',
+                                 eta0=1 / max(1.0, np.einsum('ij,ij->i', rows, rows).max()),
+                                 max_iter=epochs, tol=None, random_state=42)
+            step.fit(X, y, coef_init=model.coef_.copy(), intercept_init=model.intercept_.copy())
+            model.coef_, model.intercept_ = step.coef_, step.intercept_
+            return epochs
+        elif isinstance(model, SVC):
+            # Refit on the previous support vectors plus the new rows
+            support_labels = np.repeat(model.classes_, model.n_support_)
+            model.fit(np.vstack([model.support_vectors_, X]), np.concatenate([support_labels, np.asarray(y)]))
+        else:
+            raise ValueError(f"Incremental update not supported for {type(model).__name__}")
+        return self._iterations_used(model)
+    
+    def save_model(self, model, name, record=None, metrics=None):
+        """Save trained model (and its input scaler, if any) to file.
+        
+        `record` is the artifact fingerprint; it is written with `metrics` to a
+        JSON sidecar so unchanged models can be skipped on the next run. Without
+        a record any existing sidecar is removed, so it cannot describe this model.
+        """
         filename = self.models_path / f"{name.lower().replace(' ', '_')}.pkl"
+        self.models_path.mkdir(parents=True, exist_ok=True)
         joblib.dump(model, filename)
         logger.info(f"Saved model: {filename}")
+        
+        compact = filename.with_suffix('.trees')
+        if not (self.compact_artifacts and
+                save_compact(model, compact, compress=self.compact_artifacts == 'compressed')):
+            # load_artifact prefers the compact form, so an older one must not outlive this model
+            shutil.rmtree(compact, ignore_errors=True)
+        
+        if record is not None:
+            write_metadata(self._metadata_file(name), record, metrics)
+        else:
+            self._metadata_file(name).unlink(missing_ok=True)
+        
+        if name in self.scalers:
+            self.preprocessing_path.mkdir(parents=True, exist_ok=True)
+            joblib.dump(self.scalers[name], self._scaler_file(name))
     
     def load_model(self, name):
         """Load trained model from file."""
@@ -199,6 +687,17 @@ class ModelTrainer:
         else:
             raise FileNotFoundError(f"Model {name} not found")
     
+    def load_scaler(self, name):
+        """Load the input scaler saved with a model, or None if it has none."""
+        filename = self._scaler_file(name)
+        return joblib.load(filename) if filename.exists() else None
+    
+    def _metadata_file(self, name):
+        return self.models_path / f"{name.lower().replace(' ', '_')}.json"
+    
+    def _scaler_file(self, name):
+        return self.preprocessing_path / f"{name.lower().replace(' ', '_')}_scaler.pkl"
+    
     def get_best_model(self):
         """Get the best performing model based on accuracy."""
         if not self.results:
@@ -0,0 +1,218 @@
+"""
+Out-of-core training for song catalogs that do not fit in memory.
+
+Raw song CSVs are streamed in chunks through the fitted feature pipeline into
+learners that can consume data incrementally: external-memory XGBoost and
+mini-batch (partial_fit) logistic regression and MLP. Artifacts go to their own
+folder (models/saved_models/out_of_core by default) with their own feature
+pipeline, so they never mix with the in-memory models.
+"""
+
+import os
+import time
+import tempfile
+import logging
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.linear_model import SGDClassifier
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+
+from src.features.feature_engineer import FeatureEngineer
+from src.models.model_trainer import ModelTrainer
+from src.utils.resources import ResourceGovernor
+from src.utils.telemetry import peak_memory_mb
+
+logger = logging.getLogger(__name__)
+
+# Rough in-memory cost of one engineered row while a chunk is processed:
+# the raw frame, the intermediate feature frames and the float32 matrix
+BYTES_PER_FEATURE = 8 * 6
+
+CLASSES = np.array([0, 1])
+
+
+class _ChunkIter(xgb.DataIter):
+    """Feeds streamed feature chunks to XGBoost's external-memory DMatrix."""
+
+    def __init__(self, make_chunks, cache_prefix):
+        self._make_chunks = make_chunks
+        self._chunks = None
+        super().__init__(cache_prefix=cache_prefix)
+
+    def next(self, input_data):
+        if self._chunks is None:
+            self._chunks = self._make_chunks()
+        try:
+            X, y = next(self._chunks)
+        except StopIteration:
+            return False
+        input_data(data=X, label=y)
+        return True
+
+    def reset(self):
+        self._chunks = None
+
+
+class OutOfCoreTrainer:
+    def __init__(self, feature_engineer=None, memory_budget_mb=1024, epochs=5,
+                 n_estimators=100, early_stopping_rounds=10, resources=None, trainer=None,
+                 models_path="models/saved_models/out_of_core"):
+        self.feature_engineer = feature_engineer
+        self.memory_budget_mb = memory_budget_mb
+        self.epochs = epochs
+        self.n_estimators = n_estimators
+        self.early_stopping_rounds = early_stopping_rounds
+        self.resources = resources or ResourceGovernor()
+        # Artifacts are saved through ModelTrainer so scripts can load them as usual
+        self.trainer = trainer or ModelTrainer(resources=self.resources, models_path=models_path)
+        self.chunk_rows = None
+        self.results = {}
+
+    def fit_feature_engineer(self, path, sample_fraction=0.05, max_sample_rows=200000):
+        """Fit the feature pipeline on a random sample drawn from every chunk of the catalog."""
+        sample = []
+        for chunk in pd.read_csv(path, chunksize=100000):
+            sample.append(chunk.sample(frac=sample_fraction, random_state=42))
+        sample_df = pd.concat(sample, ignore_index=True)
+        if len(sample_df) > max_sample_rows:
+            sample_df = sample_df.sample(n=max_sample_rows, random_state=42)
+
+        self.feature_engineer = FeatureEngineer()
+        self.feature_engineer.create_features(sample_df)
+        logger.info(f"Fitted feature pipeline on a {len(sample_df)}-row sample")
+        return self.feature_engineer
+
+    def _plan_chunks(self):
+        """Choose the chunk size so one chunk in flight stays inside the memory budget."""
+        n_features = len(self.feature_engineer.feature_columns)
+        bytes_per_row = n_features * BYTES_PER_FEATURE
+        self.chunk_rows = max(1000, int(self.memory_budget_mb * 1024 ** 2 // bytes_per_row))
+        logger.info(f"Streaming {self.chunk_rows} rows per chunk ({n_features} features, "
+                    f"{self.memory_budget_mb} MB budget)")
+
+    def iter_chunks(self, path):
+        """Yield (X float32, y) feature chunks streamed from a raw song CSV."""
+        columns = self.feature_engineer.feature_columns
+        for chunk in pd.read_csv(path, chunksize=self.chunk_rows):
+            features = self.feature_engineer.transform(chunk)
+            X = features[columns].to_numpy(dtype=np.float32)
+            # Features are standardized, so missing values are filled with the mean
+            X[np.isnan(X)] = 0.0
+            yield X, chunk['target'].to_numpy()
+
+    def train(self, path, validation_path=None, models=('Logistic Regression', 'Neural Network', 'XGBoost')):
+        """Train the streaming-capable models on the catalog at `path`."""
+        if self.feature_engineer is None:
+            self.fit_feature_engineer(path)
+        self._plan_chunks()
+
+        for name in models:
+            logger.info(f"Out-of-core training {name}...")
+            started = time.perf_counter()
+            try:
+                with self.resources.limit('training'):
+                    if name == 'XGBoost':
+                        model, rows, passes = self._train_xgboost(path, validation_path)
+                    else:
+                        model, rows, passes = self._train_minibatch(name, path)
+                    n_iterations = self.trainer._iterations_used(model)
+            except Exception as e:
+                logger.error(f"Error training {name} out of core: {e}")
+                continue
+
+            elapsed = time.perf_counter() - started
+            self.results[name] = {
+                'model': model,
+                'n_rows': rows,
+                # Passes over the streamed catalog; boosting rounds are in n_iterations
+                'passes': passes,
+                'fit_seconds': elapsed,
+                'rows_per_second': rows / elapsed if elapsed else float('inf'),
+                'peak_memory_mb': peak_memory_mb(),
+                'n_iterations': n_iterations
+            }
+            if validation_path:
+                self.results[name]['accuracy'] = self.evaluate(name, model, validation_path)
+            self.trainer.save_model(model, name)
+            logger.info(f"{name} - {rows} rows at {self.results[name]['rows_per_second']:.0f} rows/s, "
+                        f"peak RSS {self.results[name]['peak_memory_mb']:.0f} MB")
+
+        self.feature_engineer.save(self.trainer.preprocessing_path / 'feature_engineer.pkl')
+        return self.results
+
+    def _train_minibatch(self, name, path):
+        """Mini-batch training with partial_fit, several passes over the streamed chunks."""
+        if name == 'Logistic Regression':
+            # Averaged SGD on the log loss: a streaming logistic regression
+            model = SGDClassifier(loss='log_loss', average=True, random_state=42)
+        elif name == 'Neural Network':
+            model = MLPClassifier(hidden_layer_sizes=(100, 50), random_state=42)
+        else:
+            raise ValueError(f"{name} cannot be trained out of core")
+
+        # The feature pipeline is fitted on a sample; SGD needs statistics from
+        # the whole catalog to keep the heavy-tailed ratio features in range
+        scaler = StandardScaler()
+        for X, _ in self.iter_chunks(path):
+            scaler.partial_fit(X)
+
+        for epoch in range(self.epochs):
+            rows = 0
+            for X, y in self.iter_chunks(path):
+                model.partial_fit(scaler.transform(X), y, classes=CLASSES)
+                rows += len(X)
+            logger.info(f"{name} epoch {epoch + 1}/{self.epochs} done")
+
+        # Saved as `<stem>_scaler.pkl` next to the model, as for the in-memory scaled models
+        self.trainer.scalers[name] = scaler
+        return model, rows, self.epochs + 1
+
+    def _train_xgboost(self, path, validation_path=None):
+        """External-memory gradient boosting; quantized pages are cached on disk."""
+        with tempfile.TemporaryDirectory(prefix='xgb-cache-') as cache_dir:
+            train = self._external_matrix(path, os.path.join(cache_dir, 'train'))
+            evals = []
+            if validation_path:
+                evals = [(self._external_matrix(validation_path, os.path.join(cache_dir, 'valid'), ref=train), 'validation')]
+
+            params = {
+                'objective': 'binary:logistic',
+                'eval_metric': 'logloss',
+                'tree_method': 'hist',
+                'seed': 42,
+                'nthread': self.resources.n_jobs('training')
+            }
+            booster = xgb.train(
+                params, train, num_boost_round=self.n_estimators, evals=evals,
+                early_stopping_rounds=self.early_stopping_rounds if evals else None, verbose_eval=False
+            )
+            rows = train.num_row()
+            # Free the matrices while their page cache still exists
+            del train, evals
+
+        # Wrap in the sklearn estimator the rest of the project loads
+        model = xgb.XGBClassifier()
+        model.load_model(bytearray(booster.save_raw(raw_format='json')))
+        # Boosting rounds read the quantized page cache on disk, not the catalog
+        return model, rows, 1
+
+    def _external_matrix(self, path, cache_prefix, ref=None):
+        make_chunks = lambda: self.iter_chunks(path)
+        matrix_type = getattr(xgb, 'ExtMemQuantileDMatrix', None)
+        if matrix_type is not None:
+            return matrix_type(_ChunkIter(make_chunks, cache_prefix), ref=ref)
+        return xgb.DMatrix(_ChunkIter(make_chunks, cache_prefix))
+
+    def evaluate(self, name, model, path):
+        """Streaming accuracy on a held-out CSV."""
+        scaler = self.trainer.scalers.get(name)
+        correct = total = 0
+        for X, y in self.iter_chunks(path):
+            if scaler is not None:
+                X = scaler.transform(X)
+            correct += int((model.predict(X) == y).sum())
+            total += len(y)
+        return correct / total if total else 0.0
@@ -0,0 +1,182 @@
+"""
+Per-decade model family: one model per `decade` partition, trained
+concurrently in worker processes, and a router that scores every song with
+its own decade's model.
+
+Each partition is trained by its own `ModelTrainer` under
+`models/saved_models/partitions/<decade>/` (artifacts, fingerprints and
+out-of-fold caches work exactly as for the global models), with the core and
+memory budget split between the workers. `partitions/manifest.json` records
+the partitions, their sizes and hit rates, the feature layout and metrics.
+"""
+
+import json
+import logging
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.models.artifacts import load_artifact, read_metadata
+from src.models.model_trainer import ModelTrainer, EXCLUDE_COLUMNS, SCALED_MODELS
+from src.utils.resources import ResourceGovernor
+
+logger = logging.getLogger(__name__)
+
+PARTITION_COLUMN = 'decade'
+
+
+def _train_partition(partition, df, model_names, models_path, resource_options, trainer_options):
+    """Worker process: train the selected models on one partition's rows."""
+    resources = ResourceGovernor(**resource_options)
+    resources.apply()
+    trainer = ModelTrainer(resources=resources, models_path=models_path, **trainer_options)
+    results = trainer.train_all_models(df, model_names=model_names)
+    return partition, {
+        name: {
+            'accuracy': float(result['accuracy']),
+            'cv_mean': float(result['cv_mean']),
+            'n_iterations': None if result['n_iterations'] is None else int(result['n_iterations']),
+            'n_test': len(result['y_test'])
+        }
+        for name, result in results.items()
+    }
+
+
+class PartitionedTrainer:
+    def __init__(self, partition_column=PARTITION_COLUMN, models=None, n_workers=None, resources=None,
+                 models_path="models/saved_models/partitions", min_rows=200, **trainer_options):
+        self.partition_column = partition_column
+        self.model_names = models
+        self.n_workers = n_workers
+        self.resources = resources or ResourceGovernor()
+        self.models_path = Path(models_path)
+        # Partitions smaller than this are left to the global model
+        self.min_rows = min_rows
+        self.trainer_options = trainer_options
+        self.results = {}
+
+    def _partition_path(self, partition):
+        return self.models_path / str(partition)
+
+    def train(self, features_df):
+        """Train one model family per partition of `features_df` (engineered features)."""
+        partitions = {}
+        for key, part in features_df.groupby(self.partition_column):
+            if len(part) < self.min_rows:
+                logger.warning(f"Skipping partition {key}: {len(part)} rows < {self.min_rows}")
+                continue
+            partitions[key] = part.reset_index(drop=True)
+        if not partitions:
+            raise ValueError(f"No {self.partition_column} partition has at least {self.min_rows} rows")
+
+        model_names = self.model_names or self._default_model_names()
+        n_workers = min(self.n_workers or len(partitions), len(partitions))
+        resource_options = self.resources.worker_options(n_workers)
+        logger.info(f"Training {len(model_names)} models on {len(partitions)} {self.partition_column} partitions "
+                    f"with {n_workers} workers ({resource_options['total_cores']} cores each)")
+
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            futures = {
+                pool.submit(_train_partition, key, part, model_names, str(self._partition_path(key)),
+                            resource_options, self.trainer_options): key
+                for key, part in partitions.items()
+            }
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    _, self.results[key] = future.result()
+                    logger.info(f"Partition {key} done")
+                except Exception as e:
+                    logger.error(f"Error training partition {key}: {e}")
+
+        self._write_manifest(features_df, partitions, model_names)
+        for name, accuracy in self.routed_accuracy().items():
+            logger.info(f"{name} (per-{self.partition_column}) - routed accuracy: {accuracy:.3f}")
+        return self.results
+
+    def _default_model_names(self):
+        trainer = ModelTrainer(models_path=self.models_path, **self.trainer_options)
+        trainer.initialize_models()
+        return list(trainer.models)
+
+    def routed_accuracy(self):
+        """Accuracy of routing every held-out song to its partition's model, per algorithm."""
+        totals = {}
+        for metrics in self.results.values():
+            for name, m in metrics.items():
+                correct, count = totals.get(name, (0.0, 0))
+                totals[name] = (correct + m['accuracy'] * m['n_test'], count + m['n_test'])
+        return {name: correct / count for name, (correct, count) in totals.items() if count}
+
+    def _write_manifest(self, features_df, partitions, model_names):
+        feature_columns = [c for c in features_df.columns if c not in EXCLUDE_COLUMNS]
+        manifest = {
+            'partition_column': self.partition_column,
+            'feature_columns': feature_columns,
+            'models': list(model_names),
+            'partitions': {
+                str(key): {
+                    'rows': len(part),
+                    'hit_rate': float(part['target'].mean()),
+                    'metrics': self.results.get(key, {})
+                }
+                for key, part in partitions.items() if key in self.results
+            }
+        }
+        self.models_path.mkdir(parents=True, exist_ok=True)
+        with open(self.models_path / 'manifest.json', 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+
+class DecadeRouter:
+    """Scores each song with the model trained on its partition; partition models load on first use."""
+
+    def __init__(self, model_name, models_path="models/saved_models/partitions", fallback=None):
+        self.model_name = model_name
+        self.models_path = Path(models_path)
+        manifest = read_metadata(self.models_path / 'manifest.json')
+        if manifest is None:
+            raise FileNotFoundError(f"No partition manifest in {self.models_path}")
+        self.partition_column = manifest['partition_column']
+        self.feature_columns = manifest['feature_columns']
+        self.partitions = set(manifest['partitions'])
+        # Fitted global model for songs from partitions without their own model
+        self.fallback = fallback
+        self._models = {}
+
+    def _model(self, partition):
+        """(model, scaler) for a partition, or None if it has no trained model."""
+        partition = str(partition)
+        if partition not in self._models:
+            if partition not in self.partitions:
+                return None
+            stem = self.model_name.lower().replace(' ', '_')
+            path = self.models_path / partition
+            scaler_file = path / 'preprocessing' / f'{stem}_scaler.pkl'
+            scaler = joblib.load(scaler_file) if self.model_name in SCALED_MODELS and scaler_file.exists() else None
+            self._models[partition] = (load_artifact(path / f'{stem}.pkl'), scaler)
+        return self._models[partition]
+
+    def predict_proba(self, features_df):
+        """Class probabilities for engineered feature rows that carry the partition column."""
+        X = features_df.reindex(columns=self.feature_columns, fill_value=0).to_numpy(dtype=np.float32)
+        keys = features_df[self.partition_column].astype(str).to_numpy()
+        proba = np.empty(len(features_df), dtype=np.float64)
+        for key in pd.unique(keys):
+            rows = np.flatnonzero(keys == key)
+            routed = self._model(key)
+            if routed is None:
+                if self.fallback is None:
+                    raise KeyError(f"No model for {self.partition_column}={key} and no fallback model")
+                proba[rows] = self.fallback.predict_proba(X[rows])[:, 1]
+                continue
+            model, scaler = routed
+            X_part = scaler.transform(X[rows]) if scaler is not None else X[rows]
+            proba[rows] = model.predict_proba(X_part)[:, 1]
+        return np.column_stack([1 - proba, proba])
+
+    def predict(self, features_df):
+        return (self.predict_proba(features_df)[:, 1] > 0.5).astype(int)
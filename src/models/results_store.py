@@ -0,0 +1,154 @@
+"""
+Columnar store for per-model evaluation results.
+
+Instead of one dict per model holding its own copies of the test labels,
+predictions and probabilities, the store keeps a single shared `y_test`,
+one int8 prediction column and one float32 probability column per model,
+and scalar metrics. Fitted models are only referenced, never copied.
+
+Columns can be spilled to `.npy` files and memory-mapped back, either on
+request or automatically once they outgrow `max_memory_mb`; a spilled store
+can be reopened later with `ResultsStore.load` (e.g. by the report).
+
+Indexing a store by model name returns the familiar result dict
+(`accuracy`, `cv_mean`, ..., `model`, `predictions`, `probabilities`,
+`y_test`, `feature_importance`), built from the columns on demand.
+"""
+
+import json
+import logging
+from collections.abc import MutableMapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+COLUMNS = ('predictions', 'probabilities', 'feature_importance')
+COLUMN_DTYPES = {'predictions': np.int8, 'probabilities': np.float32, 'feature_importance': np.float32}
+INDEX_FILE = 'index.json'
+
+
+def _stem(name):
+    return name.lower().replace(' ', '_')
+
+
+def _to_builtin(value):
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class ResultsStore(MutableMapping):
+    def __init__(self, spill_path=None, max_memory_mb=None):
+        self.spill_path = Path(spill_path) if spill_path is not None else None
+        self.max_memory_mb = max_memory_mb
+        self.y_test = None
+        self.columns = {column: {} for column in COLUMNS}
+        self.metrics = {}
+        self.models = {}
+
+    def add(self, name, y_test=None, predictions=None, probabilities=None, feature_importance=None,
+            model=None, **metrics):
+        """Store one model's results; `y_test` must match the labels already stored."""
+        if y_test is not None:
+            y_test = np.asarray(y_test)
+            if self.y_test is None:
+                self.y_test = y_test.astype(np.int8)
+            elif len(y_test) != len(self.y_test) or not np.array_equal(y_test, self.y_test):
+                raise ValueError(f"Results for {name} were computed on a different test set")
+
+        self.discard(name)
+        arrays = {'predictions': predictions, 'probabilities': probabilities, 'feature_importance': feature_importance}
+        for column, values in arrays.items():
+            if values is not None:
+                self.columns[column][name] = np.asarray(values, dtype=COLUMN_DTYPES[column])
+        self.metrics[name] = {key: _to_builtin(value) for key, value in metrics.items()}
+        if model is not None:
+            self.models[name] = model
+        self._maybe_spill()
+
+    def discard(self, name):
+        for values in self.columns.values():
+            values.pop(name, None)
+        self.metrics.pop(name, None)
+        self.models.pop(name, None)
+
+    def __setitem__(self, name, result):
+        self.add(name, **result)
+
+    def __getitem__(self, name):
+        if name not in self.metrics:
+            raise KeyError(name)
+        result = dict(self.metrics[name])
+        result['model'] = self.models.get(name)
+        for column in COLUMNS:
+            result[column] = self.columns[column].get(name)
+        result['y_test'] = self.y_test if result['predictions'] is not None else None
+        return result
+
+    def __delitem__(self, name):
+        if name not in self.metrics:
+            raise KeyError(name)
+        self.discard(name)
+
+    def __iter__(self):
+        return iter(self.metrics)
+
+    def __len__(self):
+        return len(self.metrics)
+
+    def metrics_frame(self):
+        """One row of scalar metrics per model."""
+        return pd.DataFrame.from_dict(self.metrics, orient='index').rename_axis('model').reset_index()
+
+    def nbytes(self):
+        """Bytes of columns held in memory (memory-mapped columns are not counted)."""
+        arrays = [self.y_test] + [a for values in self.columns.values() for a in values.values()]
+        return sum(a.nbytes for a in arrays if a is not None and not isinstance(a, np.memmap))
+
+    def _maybe_spill(self):
+        if self.max_memory_mb and self.spill_path is not None and self.nbytes() > self.max_memory_mb * 1024 ** 2:
+            self.spill()
+
+    def spill(self, path=None):
+        """Write every column to `path` (default: `spill_path`) and memory-map it back."""
+        path = Path(path) if path is not None else self.spill_path
+        if path is None:
+            raise ValueError("No spill path configured")
+        path.mkdir(parents=True, exist_ok=True)
+
+        if self.y_test is not None:
+            self.y_test = self._spill_array(path / 'y_test.npy', self.y_test)
+        for column, values in self.columns.items():
+            for name in values:
+                values[name] = self._spill_array(path / f'{_stem(name)}.{column}.npy', values[name])
+
+        index = {
+            name: {'metrics': metrics, 'columns': [c for c in COLUMNS if name in self.columns[c]]}
+            for name, metrics in self.metrics.items()
+        }
+        with open(path / INDEX_FILE, 'w') as f:
+            json.dump(index, f, indent=2, default=str)
+        logger.info(f"Spilled results for {len(self.metrics)} models to {path}")
+        return path
+
+    @staticmethod
+    def _spill_array(file, values):
+        if not (isinstance(values, np.memmap) and Path(values.filename) == file.resolve()):
+            np.save(file, values)
+        return np.load(file, mmap_mode='r')
+
+    @classmethod
+    def load(cls, path):
+        """Reopen a spilled store (columns memory-mapped, no fitted models)."""
+        path = Path(path)
+        with open(path / INDEX_FILE) as f:
+            index = json.load(f)
+        store = cls(spill_path=path)
+        if (path / 'y_test.npy').exists():
+            store.y_test = np.load(path / 'y_test.npy', mmap_mode='r')
+        for name, entry in index.items():
+            store.metrics[name] = entry['metrics']
+            for column in entry['columns']:
+                store.columns[column][name] = np.load(path / f'{_stem(name)}.{column}.npy', mmap_mode='r')
+        return store
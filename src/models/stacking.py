@@ -0,0 +1,122 @@
+"""
+Stacked / blended ensemble over cached out-of-fold base-model predictions.
+
+During training every base model's cross-validation produces out-of-fold hit
+probabilities for the training rows; those are stored (with the test-set
+probabilities) under `models/saved_models/oof/`. Adding a base model or
+changing the blend only refits the small meta-learner on the stored arrays.
+"""
+
+import numpy as np
+import joblib
+import logging
+from pathlib import Path
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import cross_val_score
+
+logger = logging.getLogger(__name__)
+
+
+class StackedEnsemble:
+    def __init__(self, oof_path, meta_learner=None):
+        self.oof_path = Path(oof_path)
+        self.meta_learner = meta_learner or LogisticRegression(random_state=42)
+        self.base_names = []
+        self.weights = None
+
+    def _file(self, name):
+        return self.oof_path / f"{name.lower().replace(' ', '_')}.npz"
+
+    def save_predictions(self, name, oof, test, y_train, y_test, data_hash):
+        """Store a base model's out-of-fold and test-set probabilities."""
+        self.oof_path.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            self._file(name), oof=np.asarray(oof, dtype=np.float32), test=np.asarray(test, dtype=np.float32),
+            y_train=y_train, y_test=y_test, data_hash=data_hash
+        )
+
+    def has_predictions(self, name, data_hash):
+        """Whether predictions for `name` are cached for the given training data."""
+        try:
+            with np.load(self._file(name)) as cached:
+                return str(cached['data_hash']) == data_hash
+        except (OSError, KeyError):
+            return False
+
+    def available_models(self):
+        """Names (file stems) of every base model with cached predictions."""
+        return sorted(p.stem for p in self.oof_path.glob('*.npz'))
+
+    def load_predictions(self, base_names):
+        """Stack cached probabilities into (P_oof, P_test, y_train, y_test), one column per model."""
+        oof, test, data_hash = [], [], None
+        for name in base_names:
+            with np.load(self._file(name)) as cached:
+                if data_hash is None:
+                    data_hash = str(cached['data_hash'])
+                    y_train, y_test = cached['y_train'], cached['y_test']
+                elif str(cached['data_hash']) != data_hash:
+                    raise ValueError(f"Cached predictions for {name} come from different training data")
+                oof.append(cached['oof'])
+                test.append(cached['test'])
+        return np.column_stack(oof), np.column_stack(test), y_train, y_test
+
+    @staticmethod
+    def _meta_features(P):
+        # Log-odds are a better input for a linear meta-learner than raw probabilities
+        P = np.clip(P, 1e-6, 1 - 1e-6)
+        return np.log(P / (1 - P))
+
+    def fit(self, base_names=None):
+        """Fit the meta-learner on cached out-of-fold probabilities."""
+        self.base_names = list(base_names or self.available_models())
+        P_oof, _, y_train, _ = self.load_predictions(self.base_names)
+        self.meta_learner.fit(self._meta_features(P_oof), y_train)
+        self.weights = None
+        logger.info(f"Fitted stacked ensemble over {len(self.base_names)} base models")
+        return self
+
+    def blend(self, weights):
+        """Use a fixed weighted average of base probabilities instead of a meta-learner."""
+        self.base_names = list(weights)
+        total = float(sum(weights.values()))
+        self.weights = np.array([weights[name] / total for name in self.base_names])
+        return self
+
+    def predict_proba(self, base_probabilities):
+        """Hit probability from base-model probabilities ordered like `base_names`."""
+        P = np.asarray(base_probabilities, dtype=np.float64)
+        if self.weights is not None:
+            return P @ self.weights
+        return self.meta_learner.predict_proba(self._meta_features(P))[:, 1]
+
+    def evaluate(self, cv=5):
+        """Accuracy on the cached test probabilities, plus meta-learner CV on the OOF arrays."""
+        P_oof, P_test, y_train, y_test = self.load_predictions(self.base_names)
+        probabilities = self.predict_proba(P_test)
+        predictions = (probabilities > 0.5).astype(int)
+
+        if self.weights is not None:
+            cv_scores = np.array([accuracy_score(y_train, (P_oof @ self.weights) > 0.5)])
+        else:
+            cv_scores = cross_val_score(self.meta_learner, self._meta_features(P_oof), y_train, cv=cv, scoring='accuracy')
+
+        return {
+            'accuracy': accuracy_score(y_test, predictions),
+            'cv_mean': cv_scores.mean(),
+            'cv_std': cv_scores.std(),
+            'predictions': predictions,
+            'probabilities': probabilities,
+            'y_test': y_test
+        }
+
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        joblib.dump(self, path)
+        logger.info(f"Saved stacked ensemble: {path}")
+
+    @staticmethod
+    def load(path):
+        return joblib.load(path)
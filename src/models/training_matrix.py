@@ -0,0 +1,103 @@
+"""
+Training matrix builder: one C-contiguous float32 array per training run.
+"""
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold, train_test_split
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class TrainingMatrix:
+    """Features stored as a single float32 array with train rows first.
+
+    The train and test sets are views into that array; scaled copies and CV
+    folds are written into buffers that are allocated once and reused.
+    """
+
+    def __init__(self, X, y, feature_columns, n_train, groups=None):
+        self.X = X
+        self.y = y
+        self.feature_columns = list(feature_columns)
+        self.n_train = n_train
+        # Partition label (decade) of every row, used to stratify subsets
+        self.groups = groups
+        self._scaled = None
+        self._fold_buffer = None
+
+    @classmethod
+    def from_frame(cls, df, feature_columns, train_indices=None, test_indices=None,
+                   test_size=0.25, random_state=42):
+        """Build the matrix from a feature DataFrame, filling missing values with column medians."""
+        y_all = df['target'].to_numpy()
+        if train_indices is None or test_indices is None:
+            train_indices, test_indices = train_test_split(
+                np.arange(len(df)), test_size=test_size, random_state=random_state, stratify=y_all
+            )
+        order = np.concatenate([np.asarray(train_indices, dtype=np.intp), np.asarray(test_indices, dtype=np.intp)])
+
+        # Filled column by column so no intermediate full-size frame is created
+        X = np.empty((len(order), len(feature_columns)), dtype=np.float32)
+        for j, col in enumerate(feature_columns):
+            values = df[col].to_numpy(dtype=np.float32, na_value=np.nan)
+            column = X[:, j]
+            column[:] = values[order]
+            missing = np.isnan(column)
+            if missing.any():
+                column[missing] = np.nanmedian(values)
+
+        groups = df['decade'].to_numpy()[order] if 'decade' in df.columns else None
+        matrix = cls(X, y_all[order], feature_columns, len(train_indices), groups=groups)
+        logger.info(f"Built training matrix: {X.shape[0]} x {X.shape[1]} float32 "
+                    f"({X.nbytes / 1024 ** 2:.1f} MB), Train={matrix.n_train}, Test={len(test_indices)}")
+        return matrix
+
+    @property
+    def X_train(self):
+        return self.X[:self.n_train]
+
+    @property
+    def X_test(self):
+        return self.X[self.n_train:]
+
+    @property
+    def y_train(self):
+        return self.y[:self.n_train]
+
+    @property
+    def y_test(self):
+        return self.y[self.n_train:]
+
+    @property
+    def groups_train(self):
+        return None if self.groups is None else self.groups[:self.n_train]
+
+    def scaled(self, scaler):
+        """Fit `scaler` on the train rows and standardize all rows into the reused buffer.
+
+        Returns (train view, test view); the buffer is overwritten by the next call.
+        """
+        scaler.fit(self.X_train)
+        if self._scaled is None:
+            self._scaled = np.empty_like(self.X)
+        np.subtract(self.X, scaler.mean_.astype(np.float32), out=self._scaled)
+        np.divide(self._scaled, scaler.scale_.astype(np.float32), out=self._scaled)
+        return self._scaled[:self.n_train], self._scaled[self.n_train:]
+
+    def folds(self, n_splits=5, scaled=False):
+        """Yield (X_fit, y_fit, X_val, y_val, val_indices) for stratified CV over the train rows.
+
+        With `scaled` the folds are drawn from the last `scaled` output. Fold rows
+        are gathered into one reused buffer, valid until the next fold.
+        """
+        X_train = (self._scaled if scaled else self.X)[:self.n_train]
+        y_train = self.y_train
+        if self._fold_buffer is None:
+            self._fold_buffer = np.empty_like(X_train)
+
+        for fit_idx, val_idx in StratifiedKFold(n_splits=n_splits).split(X_train, y_train):
+            n_fit = len(fit_idx)
+            X_fit = np.take(X_train, fit_idx, axis=0, out=self._fold_buffer[:n_fit])
+            X_val = np.take(X_train, val_idx, axis=0, out=self._fold_buffer[n_fit:])
+            yield X_fit, y_train[fit_idx], X_val, y_train[val_idx], val_idx
@@ -0,0 +1,225 @@
+"""
+Export fitted tree ensembles to the compact flat-array format in
+`src.inference.trees`.
+
+Supported: RandomForestClassifier (mean of leaf probabilities),
+GradientBoostingClassifier, HistGradientBoostingClassifier and XGBClassifier
+(sum of leaf margins through a logistic link), all binary.
+"""
+
+import numpy as np
+import logging
+from sklearn.ensemble import (
+    GradientBoostingClassifier, HistGradientBoostingClassifier, RandomForestClassifier
+)
+
+from src.inference.trees import CompactTreeEnsemble
+
+logger = logging.getLogger(__name__)
+
+
+def _float32_floor(threshold):
+    """Largest float32 <= threshold, so `x <= t` is unchanged for float32 inputs."""
+    t32 = threshold.astype(np.float32)
+    above = t32.astype(np.float64) > threshold
+    t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+    return t32
+
+
+def _depth(left, right, is_leaf):
+    """Depth of a tree given per-node child indices (root is node 0)."""
+    depth, level = 0, np.array([0])
+    while True:
+        level = level[~is_leaf[level]]
+        if not len(level):
+            return depth
+        level = np.concatenate([left[level], right[level]])
+        depth += 1
+
+
+def _sklearn_tree(tree, value):
+    """Node arrays of a fitted sklearn `tree_` with the given per-node output."""
+    is_leaf = tree.children_left == -1
+    missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=bool)).astype(bool)
+    return dict(
+        is_leaf=is_leaf, feature=tree.feature, threshold=tree.threshold,
+        left=tree.children_left, right=tree.children_right,
+        missing=np.where(missing_left, tree.children_left, tree.children_right),
+        value=value, max_depth=tree.max_depth
+    )
+
+
+def _breadth_first(tree):
+    """Node order in which every internal node's two children are adjacent (left, then right)."""
+    order, level = [np.array([0])], np.array([0])
+    while True:
+        internal = level[~tree['is_leaf'][level]]
+        if not len(internal):
+            return np.concatenate(order)
+        level = np.column_stack([tree['left'][internal], tree['right'][internal]]).ravel()
+        order.append(level)
+
+
+def _flatten(trees):
+    """Concatenate per-tree node arrays into global node arrays.
+
+    Nodes are renumbered breadth-first so the right child of every internal
+    node directly follows its left child. Leaves get feature 0 and an infinite
+    threshold and point to themselves (left and missing), so the traversal can
+    keep stepping rows that have already reached a leaf.
+    """
+    features, thresholds, lefts, missings, values, roots = [], [], [], [], [], []
+    offset, max_depth = 0, 0
+    for tree in trees:
+        order = _breadth_first(tree)
+        position = np.empty(len(tree['is_leaf']), dtype=np.int64)
+        position[order] = np.arange(len(order)) + offset
+        own = position[order]
+        is_leaf = tree['is_leaf'][order]
+        left = np.where(is_leaf, 0, tree['left'][order])
+        missing = np.where(is_leaf, 0, tree['missing'][order])
+
+        features.append(np.where(is_leaf, 0, tree['feature'][order]))
+        thresholds.append(np.where(is_leaf, np.inf, tree['threshold'][order]))
+        lefts.append(np.where(is_leaf, own, position[left]))
+        missings.append(np.where(is_leaf, own, position[missing]))
+        values.append(np.where(is_leaf, tree['value'][order], 0.0))
+        roots.append(offset)
+        max_depth = max(max_depth, tree['max_depth'])
+        offset += len(order)
+
+    feature = np.concatenate(features)
+    feature_dtype = np.int16 if feature.max(initial=0) < np.iinfo(np.int16).max else np.int32
+    if offset >= np.iinfo(np.int32).max:
+        raise ValueError("Ensemble too large for int32 node indices")
+
+    return dict(
+        feature=feature.astype(feature_dtype),
+        threshold=_float32_floor(np.concatenate(thresholds).astype(np.float64)),
+        left=np.concatenate(lefts).astype(np.int32),
+        missing=np.concatenate(missings).astype(np.int32),
+        value=np.concatenate(values).astype(np.float32),
+        roots=np.array(roots, dtype=np.int32),
+        max_depth=max_depth
+    )
+
+
+def _ensemble(model, trees, aggregation, n_features, raw_score=None):
+    """Build the compact ensemble; for additive models the intercept is recovered
+    from the library's own raw score on a probe row."""
+    arrays = _flatten(trees)
+    meta = {
+        'model_type': type(model).__name__,
+        'aggregation': aggregation,
+        'n_features': int(n_features),
+        'n_trees': len(trees),
+        'max_depth': int(arrays.pop('max_depth')),
+        'classes': model.classes_.tolist(),
+        'base_score': 0.0
+    }
+    if getattr(model, 'feature_importances_', None) is not None:
+        meta['feature_importances'] = np.asarray(model.feature_importances_, dtype=float).tolist()
+
+    compact = CompactTreeEnsemble(meta=meta, **arrays)
+    if raw_score is not None:
+        probe = np.zeros((1, n_features), dtype=np.float32)
+        meta['base_score'] = float(raw_score(probe)[0] - compact.decision_function(probe)[0])
+    return compact
+
+
+def export_random_forest(model):
+    """Flatten a fitted binary RandomForestClassifier."""
+    def class1_probability(tree):
+        counts = tree.value[:, 0, :]
+        return counts[:, 1] / counts.sum(axis=1)
+
+    trees = [_sklearn_tree(est.tree_, class1_probability(est.tree_)) for est in model.estimators_]
+    return _ensemble(model, trees, 'mean', model.n_features_in_)
+
+
+def export_gradient_boosting(model):
+    """Flatten a fitted binary GradientBoostingClassifier (learning rate folded into the leaves)."""
+    trees = [
+        _sklearn_tree(est.tree_, est.tree_.value[:, 0, 0] * model.learning_rate)
+        for est in model.estimators_[:, 0]
+    ]
+    return _ensemble(model, trees, 'logistic', model.n_features_in_, model.decision_function)
+
+
+def export_hist_gradient_boosting(model):
+    """Flatten a fitted binary HistGradientBoostingClassifier without categorical splits."""
+    trees = []
+    for predictors in model._predictors:
+        nodes = predictors[0].nodes
+        if nodes['is_categorical'].any():
+            return None
+        is_leaf = nodes['is_leaf'].astype(bool)
+        left, right = nodes['left'].astype(np.int64), nodes['right'].astype(np.int64)
+        trees.append(dict(
+            is_leaf=is_leaf, feature=nodes['feature_idx'], threshold=nodes['num_threshold'],
+            left=left, right=right, missing=np.where(nodes['missing_go_to_left'], left, right),
+            value=nodes['value'], max_depth=_depth(left, right, is_leaf)
+        ))
+    return _ensemble(model, trees, 'logistic', model.n_features_in_, model.decision_function)
+
+
+def export_xgboost(model):
+    """Flatten a fitted binary XGBClassifier (trees up to the best iteration when early stopped)."""
+    import xgboost as xgb
+
+    booster = model.get_booster()
+    n_features = booster.num_features()
+    names = booster.feature_names or [f'f{i}' for i in range(n_features)]
+    feature_index = {name: i for i, name in enumerate(names)}
+    n_trees = getattr(model, 'best_iteration', None)
+    n_trees = None if n_trees is None else n_trees + 1
+
+    nodes = booster.trees_to_dataframe()
+    trees = []
+    for _, tree in nodes.groupby('Tree', sort=True):
+        if n_trees is not None and len(trees) == n_trees:
+            break
+        position = {node_id: i for i, node_id in enumerate(tree['ID'])}
+        is_leaf = (tree['Feature'] == 'Leaf').to_numpy()
+        child = lambda column: np.array([position.get(c, -1) for c in tree[column]], dtype=np.int64)
+        left, right, missing = child('Yes'), child('No'), child('Missing')
+        split = tree['Split'].to_numpy(dtype=np.float32)
+        trees.append(dict(
+            is_leaf=is_leaf,
+            feature=np.array([feature_index.get(f, 0) for f in tree['Feature']]),
+            # XGBoost goes left when x < split; for float32 x that is x <= the next float32 down
+            threshold=np.where(is_leaf, 0.0, np.nextafter(split, np.float32(-np.inf))).astype(np.float64),
+            left=left, right=right, missing=missing,
+            value=tree['Gain'].to_numpy(), max_depth=_depth(left, right, is_leaf)
+        ))
+
+    def raw_score(X):
+        iteration_range = (0, n_trees) if n_trees is not None else (0, 0)
+        return booster.predict(xgb.DMatrix(X), output_margin=True, iteration_range=iteration_range)
+
+    return _ensemble(model, trees, 'logistic', n_features, raw_score)
+
+
+def export_tree_ensemble(model):
+    """Compact form of a supported tree ensemble, or None if the model type is not supported."""
+    if len(getattr(model, 'classes_', [])) != 2:
+        return None
+    if isinstance(model, RandomForestClassifier):
+        return export_random_forest(model)
+    if isinstance(model, GradientBoostingClassifier):
+        return export_gradient_boosting(model)
+    if isinstance(model, HistGradientBoostingClassifier):
+        return export_hist_gradient_boosting(model)
+    if type(model).__name__ == 'XGBClassifier' and model.get_params().get('objective') == 'binary:logistic':
+        return export_xgboost(model)
+    return None
+
+
+def save_compact(model, path, compress=False):
+    """Export and save `model`; returns the artifact path or None if unsupported."""
+    compact = export_tree_ensemble(model)
+    if compact is None:
+        return None
+    path = compact.save(path, compress=compress)
+    logger.info(f"Saved compact tree artifact: {path} ({compact.n_nodes} nodes, {compact.nbytes() / 1024 ** 2:.1f} MB)")
+    return path
@@ -0,0 +1,20 @@
+"""
+Long-running local scoring service with dynamic micro-batching.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    'MicroBatcher': '.batcher',
+    'MultiModelScorer': '.multi_model',
+    'SongScorer': '.service',
+    'ScoringServer': '.service',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
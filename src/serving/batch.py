@@ -0,0 +1,213 @@
+"""
+Streaming batch scoring for catalogs larger than memory.
+
+The input CSV is read in chunks of `chunk_rows` songs. Each chunk is engineered
+and scored in a worker process (each worker loads the feature pipeline and
+model once), and only the id columns plus the hit probability and prediction
+are appended to the output CSV, in input order. At most two chunks per worker
+are in flight, so memory stays constant however long the catalog is.
+
+With a `cache_path`, every worker reads and writes the same on-disk prediction
+cache, so re-scoring a catalog only computes the songs added since the last run.
+
+`top_k` streams the catalog the same way but keeps only the K most likely hits
+per partition (e.g. per decade), optionally among songs matching decade or
+feature-range filters, and returns them as a ranked table.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.serving.cache import COUNTERS, hit_rate
+from src.serving.service import SongScorer
+from src.serving.topk import TopK, matching_rows
+from src.utils.resources import ResourceGovernor
+from src.utils.telemetry import peak_memory_mb
+
+logger = logging.getLogger(__name__)
+
+ID_COLUMNS = ['id', 'uri', 'track', 'artist']
+
+# Scorer of this (worker) process, loaded once by `_init_worker`
+_scorer = None
+
+
+def _init_worker(model, models_path, resource_options, fused=False, cache_entries=0, cache_path=None):
+    global _scorer
+    resources = ResourceGovernor(**resource_options)
+    resources.apply()
+    _scorer = SongScorer(model, models_path, resources=resources, fused=fused,
+                         cache_entries=cache_entries, cache_path=cache_path)
+
+
+def _score_chunk(chunk, id_columns):
+    """Id columns of a raw chunk plus its hit probabilities and predictions, the
+    chunk's cache hit/miss counts and the worker's (pid, peak RSS in MB)."""
+    before = dict(_scorer.cache.counts) if _scorer.cache is not None else None
+    probabilities = _scorer.predict_proba(chunk)
+    scored = chunk[id_columns].copy()
+    scored['probability'] = probabilities
+    scored['prediction'] = (probabilities > 0.5).astype(np.int8)
+    counts = {c: _scorer.cache.counts[c] - before[c] for c in COUNTERS} if before is not None else None
+    return scored, counts, (os.getpid(), peak_memory_mb())
+
+
+def _top_chunk(chunk, columns, k, partition):
+    """The chunk's own top `k` songs per partition (with `columns` and the probability)."""
+    scored, counts, memory = _score_chunk(chunk, columns)
+    return TopK.select(scored.drop(columns='prediction'), k, partition), counts, memory
+
+
+class BatchScorer:
+    def __init__(self, model="Random Forest", models_path="models/saved_models", n_workers=None,
+                 chunk_rows=50000, id_columns=None, resources=None, fused=False, cache_entries=0, cache_path=None):
+        self.model = str(model)
+        self.models_path = str(models_path)
+        self.resources = resources or ResourceGovernor()
+        self.n_workers = n_workers or self.resources.n_jobs('scoring')
+        self.chunk_rows = chunk_rows
+        self.id_columns = id_columns
+        self.fused = fused
+        self.cache_entries = cache_entries
+        self.cache_path = str(cache_path) if cache_path else None
+
+    def _id_columns(self, input_path):
+        header = pd.read_csv(input_path, nrows=0).columns
+        if self.id_columns:
+            missing = [c for c in self.id_columns if c not in header]
+            if missing:
+                raise ValueError(f"Id columns {missing} not in {input_path}")
+            return list(self.id_columns)
+        return [c for c in ID_COLUMNS if c in header]
+
+    def _chunks(self, input_path, values=None, ranges=None):
+        """Raw chunks; without id columns a `row` column (position in the input) identifies songs.
+
+        With `values` / `ranges` only matching songs are kept (see `matching_rows`).
+        """
+        offset = 0
+        for chunk in pd.read_csv(input_path, chunksize=self.chunk_rows):
+            chunk.index = pd.RangeIndex(offset, offset + len(chunk), name='row')
+            offset += len(chunk)
+            if values or ranges:
+                chunk = chunk[matching_rows(chunk, values, ranges)]
+                if not len(chunk):
+                    continue
+            yield chunk
+
+    def _results(self, chunks, task, *args):
+        """`task(chunk, *args)` for every chunk, across the worker pool, in input order."""
+        init_args = (self.model, self.models_path, self.resources.worker_options(self.n_workers), self.fused,
+                     self.cache_entries, self.cache_path)
+        if self.n_workers == 1:
+            _init_worker(*init_args)
+            for chunk in chunks:
+                yield task(chunk, *args)
+            return
+        with ProcessPoolExecutor(self.n_workers, initializer=_init_worker, initargs=init_args) as pool:
+            pending = deque()
+            for chunk in chunks:
+                pending.append(pool.submit(task, chunk, *args))
+                # Bounded read-ahead
+                while len(pending) >= 2 * self.n_workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    def _summary(self, n_rows, started, cache_counts, worker_peaks):
+        """Run summary; `worker_peaks` maps each worker pid to its peak RSS (MB)."""
+        seconds = time.perf_counter() - started
+        summary = {
+            'rows': n_rows,
+            'seconds': seconds,
+            'rows_per_second': n_rows / seconds if seconds > 0 else None,
+            'workers': self.n_workers,
+            # The parent only reads chunks and collects results; scoring happens in the workers
+            'peak_memory_mb': peak_memory_mb(),
+            'worker_peak_memory_mb': max(worker_peaks.values(), default=None),
+            'workers_total_peak_memory_mb': sum(worker_peaks.values()) if worker_peaks else None
+        }
+        logger.info(f"Scored {n_rows} rows in {seconds:.1f}s ({summary['rows_per_second'] or 0:.0f} rows/s), "
+                    f"peak RSS {summary['peak_memory_mb']:.0f} MB (parent), "
+                    f"{summary['worker_peak_memory_mb'] or 0:.0f} MB (largest worker)")
+        if self.cache_entries or self.cache_path:
+            summary['cache'] = {**cache_counts, 'hit_rate': hit_rate(cache_counts)}
+            logger.info(f"Prediction cache: {summary['cache']}")
+        return summary
+
+    def score_csv(self, input_path, output_path):
+        """Score every song in `input_path` and write ids and scores to `output_path`."""
+        input_path, output_path = Path(input_path), Path(output_path)
+        id_columns = self._id_columns(input_path)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Scoring {input_path} in chunks of {self.chunk_rows} rows with {self.n_workers} workers")
+
+        started = time.perf_counter()
+        n_rows = 0
+        cache_counts = dict.fromkeys(COUNTERS, 0)
+        worker_peaks = {}
+        with open(output_path, 'w', newline='') as out:
+            header = True
+            # Results arrive in input order
+            for scored, counts, (pid, peak) in self._results(self._chunks(input_path), _score_chunk, id_columns):
+                scored.to_csv(out, header=header, index=not id_columns, float_format='%.6f')
+                header = False
+                n_rows += len(scored)
+                worker_peaks[pid] = max(worker_peaks.get(pid, 0), peak)
+                for c in counts or {}:
+                    cache_counts[c] += counts[c]
+        return self._summary(n_rows, started, cache_counts, worker_peaks)
+
+    def top_k(self, input_path, k=1000, partition='decade', values=None, ranges=None, columns=None):
+        """The `k` most likely hits in `input_path` per `partition` value (or overall
+        with `partition=None`), as a ranked table, and the run summary.
+
+        `values` (column -> allowed values) and `ranges` (column -> (low, high))
+        restrict the candidates before scoring; `columns` are extra input columns
+        copied to the table. Memory grows with `k`, not with the catalog.
+        """
+        input_path = Path(input_path)
+        header = pd.read_csv(input_path, nrows=0).columns
+        id_columns = self._id_columns(input_path)
+        columns = id_columns + [c for c in dict.fromkeys([partition, *(columns or [])])
+                                 if c is not None and c not in id_columns]
+        wanted = set(columns) | set(values or {}) | set(ranges or {})
+        missing = sorted(c for c in wanted if c not in header)
+        if missing:
+            raise ValueError(f"Columns {missing} not in {input_path}")
+        logger.info(f"Selecting the top {k} songs{f' per {partition}' if partition else ''} from {input_path} "
+                    f"in chunks of {self.chunk_rows} rows with {self.n_workers} workers")
+
+        started = time.perf_counter()
+        n_rows = 0
+        cache_counts = dict.fromkeys(COUNTERS, 0)
+        worker_peaks = {}
+
+        def counted(chunks):
+            nonlocal n_rows
+            for chunk in chunks:
+                n_rows += len(chunk)
+                yield chunk
+
+        selection = TopK(k, partition)
+        for best, counts, (pid, peak) in self._results(counted(self._chunks(input_path, values, ranges)),
+                                                       _top_chunk, columns, k, partition):
+            selection.push(best)
+            worker_peaks[pid] = max(worker_peaks.get(pid, 0), peak)
+            for c in counts or {}:
+                cache_counts[c] += counts[c]
+        summary = self._summary(n_rows, started, cache_counts, worker_peaks)
+
+        table = selection.ranked()
+        if not id_columns:
+            table.insert(1, 'row', table.index)
+        table = table.reset_index(drop=True)
+        summary['selected'] = len(table)
+        return table, summary
@@ -0,0 +1,142 @@
+"""
+Dynamic micro-batching for the scoring service.
+
+Request threads hand their songs to a `MicroBatcher` and wait on a future.
+A single worker thread takes the oldest queued request, keeps collecting until
+`max_batch_size` songs are queued or `max_wait_ms` has passed, scores them all
+with one call and hands each request its slice of the scores. If that call
+fails, the batch's requests are retried one by one, so a bad request only fails
+itself. Under load this turns many small requests into a few large vectorized
+calls; when idle a lone request waits at most `max_wait_ms`.
+
+Request latency (queued to scored) is kept over a sliding window for the
+p50/p99 figures in `stats()`.
+"""
+
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class MicroBatcher:
+    def __init__(self, score_batch, max_batch_size=512, max_wait_ms=5.0, latency_window=10000):
+        self.score_batch = score_batch
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._latencies = deque(maxlen=latency_window)
+        self._batch_seconds = deque(maxlen=latency_window)
+        self._lock = threading.Lock()
+        self.n_requests = 0
+        self.n_rows = 0
+        self.n_batches = 0
+        self.started = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, rows):
+        """Queue a list of rows; the returned future resolves to their scores."""
+        future = Future()
+        self._queue.put((rows, future, time.perf_counter()))
+        return future
+
+    def score(self, rows, timeout=None):
+        return self.submit(rows).result(timeout)
+
+    def close(self):
+        """Stop the worker once the requests queued so far have been scored."""
+        self._queue.put(_STOP)
+        self._thread.join()
+
+    def _collect(self):
+        """Block for one request, then gather more until the batch is full or the wait is over."""
+        first = self._queue.get()
+        if first is _STOP:
+            return None
+        batch, size = [first], len(first[0])
+        deadline = first[2] + self.max_wait
+        while size < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self._queue.put(_STOP)
+                break
+            batch.append(item)
+            size += len(item[0])
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            if batch is None:
+                return
+            rows = [row for item in batch for row in item[0]]
+            start = time.perf_counter()
+            try:
+                scores = self.score_batch(rows)
+                offset, results = 0, []
+                for item_rows, _, _ in batch:
+                    results.append(scores[offset:offset + len(item_rows)])
+                    offset += len(item_rows)
+            except Exception as e:
+                logger.error(f"Error scoring batch of {len(rows)} rows: {e}")
+                results = self._score_each(batch) if len(batch) > 1 else [e]
+
+            done = time.perf_counter()
+            for (_, future, _), result in zip(batch, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                self._latencies.extend(done - queued for _, _, queued in batch)
+                self._batch_seconds.append(done - start)
+                self.n_requests += len(batch)
+                self.n_rows += len(rows)
+                self.n_batches += 1
+
+    def _score_each(self, batch):
+        """Score the requests of a failed batch one by one, so a bad request only fails itself."""
+        results = []
+        for item_rows, _, _ in batch:
+            try:
+                results.append(self.score_batch(item_rows))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    def stats(self):
+        """Request counts, mean batch size, throughput and latency percentiles (ms)."""
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            batch_ms = np.array(self._batch_seconds) * 1000
+            n_requests, n_rows, n_batches = self.n_requests, self.n_rows, self.n_batches
+        elapsed = time.perf_counter() - self.started
+
+        def percentile(values, q):
+            return round(float(np.percentile(values, q)), 3) if len(values) else None
+
+        return {
+            'requests': n_requests,
+            'rows': n_rows,
+            'batches': n_batches,
+            'mean_batch_rows': round(n_rows / n_batches, 1) if n_batches else None,
+            'rows_per_second': round(n_rows / elapsed, 1) if elapsed > 0 else None,
+            'latency_p50_ms': percentile(latencies, 50),
+            'latency_p99_ms': percentile(latencies, 99),
+            'batch_p50_ms': percentile(batch_ms, 50),
+            'max_batch_size': self.max_batch_size,
+            'max_wait_ms': self.max_wait * 1000
+        }
@@ -0,0 +1,144 @@
+"""
+Prediction cache for repeated scoring.
+
+A song's hit probability only depends on its raw input row and on the model
+artifacts it is scored with, so it is cached under a 128-bit hash of the row
+(id columns excluded, numbers compared as float64) keyed by the artifacts'
+content fingerprint. Re-training or updating a model changes the fingerprint,
+so stale scores are never returned.
+
+Two tiers:
+- memory: a bounded LRU of `max_entries` songs
+- disk (optional): an SQLite file shared by runs, processes and models, so
+  re-scoring a catalog only computes the songs that were not scored before
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns that identify a song but do not change its score
+IGNORED_COLUMNS = {'id', 'uri', 'track', 'artist', 'target'}
+COUNTERS = ('memory_hits', 'disk_hits', 'misses')
+
+
+def hit_rate(counts):
+    """Share of lookups answered from either tier."""
+    lookups = sum(counts[c] for c in COUNTERS)
+    return (counts['memory_hits'] + counts['disk_hits']) / lookups if lookups else None
+
+
+class PredictionCache:
+    def __init__(self, fingerprint, max_entries=100000, path=None):
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.path = Path(path) if path else None
+        # Two independent 64-bit row hashes, both seeded with the artifact fingerprint
+        self._hash_keys = (fingerprint[:16], fingerprint[16:32])
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._connection = None
+        self._connection_pid = None
+        self.counts = dict.fromkeys(COUNTERS, 0)
+
+    def keys(self, songs):
+        """One 16-byte key per raw song row (a DataFrame or a list of dicts)."""
+        raw_df = songs if isinstance(songs, pd.DataFrame) else pd.DataFrame.from_records(songs)
+        columns = sorted(c for c in raw_df.columns if c not in IGNORED_COLUMNS)
+        values = pd.DataFrame({
+            c: raw_df[c].astype(np.float64) if pd.api.types.is_numeric_dtype(raw_df[c]) else raw_df[c].astype(str)
+            for c in columns
+        })
+        hashes = np.column_stack([
+            pd.util.hash_pandas_object(values, index=False, hash_key=key).to_numpy() for key in self._hash_keys
+        ])
+        return [row.tobytes() for row in hashes]
+
+    def _db(self):
+        """SQLite connection of this process (connections do not survive a fork)."""
+        if self._connection is None or self._connection_pid != os.getpid():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, timeout=60, check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS predictions (key BLOB PRIMARY KEY, probability REAL) WITHOUT ROWID'
+            )
+            connection.execute('CREATE TEMP TABLE IF NOT EXISTS lookup (key BLOB PRIMARY KEY)')
+            self._connection, self._connection_pid = connection, os.getpid()
+        return self._connection
+
+    def _disk_get(self, keys):
+        db = self._db()
+        with db:
+            db.execute('DELETE FROM lookup')
+            db.executemany('INSERT OR IGNORE INTO lookup VALUES (?)', ((key,) for key in keys))
+            rows = db.execute('SELECT key, probability FROM predictions JOIN lookup USING (key)').fetchall()
+        return dict(rows)
+
+    def _remember(self, key, probability):
+        self._memory[key] = probability
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, keys):
+        """Cached probabilities (NaN where missing) and a mask of the keys that were found."""
+        probabilities = np.full(len(keys), np.nan)
+        found = np.zeros(len(keys), dtype=bool)
+        with self._lock:
+            for i, key in enumerate(keys):
+                probability = self._memory.get(key)
+                if probability is not None:
+                    self._memory.move_to_end(key)
+                    probabilities[i], found[i] = probability, True
+            memory_hits = int(found.sum())
+
+            if self.path is not None and memory_hits < len(keys):
+                missing = np.flatnonzero(~found)
+                stored = self._disk_get([keys[i] for i in missing])
+                for i in missing:
+                    probability = stored.get(keys[i])
+                    if probability is not None:
+                        self._remember(keys[i], probability)
+                        probabilities[i], found[i] = probability, True
+
+            self.counts['memory_hits'] += memory_hits
+            self.counts['disk_hits'] += int(found.sum()) - memory_hits
+            self.counts['misses'] += len(keys) - int(found.sum())
+        return probabilities, found
+
+    def put(self, keys, probabilities):
+        """Cache freshly computed probabilities in both tiers."""
+        probabilities = [float(p) for p in probabilities]
+        with self._lock:
+            for key, probability in zip(keys, probabilities):
+                self._remember(key, probability)
+            if self.path is not None:
+                db = self._db()
+                with db:
+                    db.executemany('INSERT OR REPLACE INTO predictions VALUES (?, ?)', zip(keys, probabilities))
+
+    def stats(self):
+        with self._lock:
+            counts = dict(self.counts)
+            entries = len(self._memory)
+        return {
+            **counts,
+            'hit_rate': hit_rate(counts),
+            'memory_entries': entries,
+            'max_entries': self.max_entries,
+            'disk_path': str(self.path) if self.path else None
+        }
+
+    def close(self):
+        if self._connection is not None and self._connection_pid == os.getpid():
+            self._connection.close()
+        self._connection = None
@@ -0,0 +1,221 @@
+"""
+Score one feature matrix with several models at once.
+
+`MultiModelScorer` builds the float32 feature matrix once and gives every model
+a view of it: the matrix itself, a column slice when the model was trained on a
+contiguous subset of the columns, or the scaled matrix of its input scaler.
+Each distinct scaler (the SVM and neural network share their fitted
+parameters) is applied once. The models then run concurrently on a thread
+pool and split the stage's thread budget between them. Tree traversal, BLAS and
+libsvm work releases the GIL, so the threads share the matrix without copying
+it.
+
+    scorer = MultiModelScorer.from_saved('models/saved_models')
+    table = scorer.score(X)      # one column per model plus the 'ensemble' probability
+"""
+
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.models.artifacts import load_artifact
+from src.utils.resources import ResourceGovernor
+
+logger = logging.getLogger(__name__)
+
+# Models trained on standardized inputs (keywords of their saved file / display names)
+SCALED_KEYWORDS = ['svm', 'neural']
+# Models whose labels come from the decision function, not their (Platt-scaled)
+# probabilities; the two can disagree on borderline songs
+DECISION_LABEL_MODELS = {'SVC', 'NuSVC'}
+ENSEMBLE_METHODS = ('mean', 'vote')
+
+
+def model_display_name(model_file):
+    """'random_forest.pkl' -> 'Random Forest'."""
+    return Path(model_file).stem.replace('_', ' ').title()
+
+
+def load_scalers(model_names, X_reference=None, models_path="models/saved_models"):
+    """Input scalers saved at training time for any of the models; the SVM / neural
+    network without one share a StandardScaler fitted once on `X_reference`."""
+    preprocessing = Path(models_path) / 'preprocessing'
+    scalers, fitted = {}, None
+    for model_name in model_names:
+        scaler_file = preprocessing / f"{model_name.lower().replace(' ', '_')}_scaler.pkl"
+        if scaler_file.exists():
+            scalers[model_name] = joblib.load(scaler_file)
+        elif X_reference is not None and any(keyword in model_name.lower() for keyword in SCALED_KEYWORDS):
+            if fitted is None:
+                from sklearn.preprocessing import StandardScaler
+                fitted = StandardScaler().fit(X_reference)
+            scalers[model_name] = fitted
+    return scalers
+
+
+def ensemble_probability(probabilities, method='mean'):
+    """Combine per-model hit probabilities: their mean, or the fraction of models voting hit."""
+    if method not in ENSEMBLE_METHODS:
+        raise ValueError(f"Unknown ensemble method {method!r}; expected one of {ENSEMBLE_METHODS}")
+    stacked = np.column_stack(list(probabilities))
+    if method == 'vote':
+        return (stacked > 0.5).mean(axis=1)
+    return stacked.mean(axis=1)
+
+
+def _scaler_key(scaler):
+    """Scalers with the same fitted parameters produce the same matrix and share it."""
+    if hasattr(scaler, 'mean_') and hasattr(scaler, 'scale_'):
+        return type(scaler).__name__, np.asarray(scaler.mean_).tobytes(), np.asarray(scaler.scale_).tobytes()
+    return id(scaler)
+
+
+class MultiModelScorer:
+    def __init__(self, models, scalers=None, feature_columns=None, resources=None, stage='scoring',
+                 n_workers=None, ensemble='mean', feature_engineer=None):
+        if not models:
+            raise ValueError("MultiModelScorer needs at least one model")
+        self.models = dict(models)
+        self.scalers = {name: scaler for name, scaler in (scalers or {}).items() if name in self.models}
+        self.feature_columns = list(feature_columns) if feature_columns is not None else None
+        self.feature_engineer = feature_engineer
+        self.resources = resources or ResourceGovernor()
+        self.stage = stage
+        self.ensemble = ensemble
+        self.n_workers = max(1, min(n_workers or self.resources.n_jobs(stage), len(self.models)))
+
+        # Models running side by side split the stage budget (model n_jobs and BLAS pools)
+        threads = max(1, self.resources.n_jobs(stage) // self.n_workers)
+        blas = self.resources.blas_threads
+        self.model_resources = ResourceGovernor(total_cores=threads, blas_threads=min(blas, threads) if blas else None)
+        for model in self.models.values():
+            self.model_resources.configure_model(model, stage)
+        self.timings = {}
+
+    @classmethod
+    def from_saved(cls, models_path="models/saved_models", model_names=None, X_reference=None, **options):
+        """Load every saved model (or those in `model_names`) with its input scaler.
+
+        The fitted feature pipeline is loaded too when saved, so `score_songs` can
+        take raw song rows.
+        """
+        models_path = Path(models_path)
+        models = {}
+        for model_file in sorted(models_path.glob('*.pkl')):
+            name = model_display_name(model_file)
+            if model_names is None or name in model_names or model_file.stem in model_names:
+                models[name] = load_artifact(model_file)
+        if not models:
+            raise FileNotFoundError(f"No saved models in {models_path}")
+
+        feature_engineer, feature_columns = None, options.pop('feature_columns', None)
+        fe_file = models_path / 'preprocessing' / 'feature_engineer.pkl'
+        if fe_file.exists():
+            from src.features.feature_engineer import FeatureEngineer
+            feature_engineer = FeatureEngineer.load(fe_file)
+            feature_columns = feature_columns or feature_engineer.feature_columns
+
+        logger.info(f"Loaded {len(models)} models for multi-model scoring: {', '.join(models)}")
+        return cls(models, load_scalers(models, X_reference, models_path), feature_columns,
+                   feature_engineer=feature_engineer, **options)
+
+    def matrix(self, X):
+        """The shared float32, C-contiguous feature matrix (no copy if X already is one)."""
+        if isinstance(X, pd.DataFrame):
+            if self.feature_columns is not None:
+                # Missing columns (e.g., one-hot decade columns) are filled with zeros
+                X = X.reindex(columns=self.feature_columns, fill_value=0)
+            X = X.to_numpy(dtype=np.float32)
+        return np.ascontiguousarray(X, dtype=np.float32)
+
+    def _columns(self, model, n_columns):
+        """Column selection for a model trained on a subset of the features, or None for all."""
+        names = getattr(model, 'feature_names_in_', None)
+        if names is not None and self.feature_columns is not None:
+            index = np.array([self.feature_columns.index(name) for name in names])
+        else:
+            index = np.arange(getattr(model, 'n_features_in_', n_columns))
+        if len(index) == n_columns and (index == np.arange(n_columns)).all():
+            return None
+        if (np.diff(index) == 1).all():
+            return slice(index[0], index[-1] + 1)
+        return index
+
+    def inputs(self, X):
+        """Per-model input arrays: views of the shared matrix, and one scaled matrix per distinct scaler."""
+        X = self.matrix(X)
+        scaled, inputs = {}, {}
+        for name, model in self.models.items():
+            scaler = self.scalers.get(name)
+            if scaler is None:
+                base = X
+            else:
+                key = _scaler_key(scaler)
+                if key not in scaled:
+                    scaled[key] = np.ascontiguousarray(scaler.transform(X))
+                base = scaled[key]
+            columns = self._columns(model, X.shape[1])
+            inputs[name] = base if columns is None else base[:, columns]
+        return inputs
+
+    def _run(self, name, X_model, labels):
+        model = self.models[name]
+        started = time.perf_counter()
+        probability = model.predict_proba(X_model)[:, 1] if hasattr(model, 'predict_proba') else None
+        predictions = None
+        if labels:
+            if probability is None or type(model).__name__ in DECISION_LABEL_MODELS:
+                predictions = model.predict(X_model)
+            else:
+                # Same labels as `predict` for forests, boosting, MLPs and linear models
+                predictions = np.asarray(model.classes_)[(probability > 0.5).astype(int)]
+        if probability is None:
+            probability = predictions.astype(float) if predictions is not None else model.predict(X_model).astype(float)
+        self.timings[name] = time.perf_counter() - started
+        return probability, predictions
+
+    def run(self, X, labels=False):
+        """Score X with every model concurrently.
+
+        Returns `{name: (hit probabilities, predicted labels or None)}`; a model that
+        fails is logged and left out.
+        """
+        inputs = self.inputs(X)
+        results = {}
+        with self.model_resources.limit(self.stage), ThreadPoolExecutor(self.n_workers) as pool:
+            futures = {name: pool.submit(self._run, name, X_model, labels) for name, X_model in inputs.items()}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    logger.error(f"{name} failed to score: {e}")
+        return results
+
+    def predict_proba(self, X):
+        """Hit probability of every row under every model, `{name: probabilities}`."""
+        return {name: probability for name, (probability, _) in self.run(X).items()}
+
+    def ensemble_proba(self, probabilities, method=None):
+        return ensemble_probability(probabilities.values(), method or self.ensemble)
+
+    def score(self, X, method=None, index=None):
+        """Table with one hit-probability column per model, `hit_votes` and the ensemble probability."""
+        probabilities = self.predict_proba(X)
+        if index is None and isinstance(X, pd.DataFrame):
+            index = X.index
+        table = pd.DataFrame(probabilities, index=index)
+        table['hit_votes'] = (table[list(probabilities)] > 0.5).sum(axis=1)
+        table['ensemble'] = self.ensemble_proba(probabilities, method) if probabilities else np.nan
+        return table
+
+    def score_songs(self, songs, method=None):
+        """`score` for raw song rows, engineered once with the fitted feature pipeline."""
+        if self.feature_engineer is None:
+            raise ValueError("No fitted feature pipeline; pass feature matrices to `score` instead")
+        songs_df = songs if isinstance(songs, pd.DataFrame) else pd.DataFrame(songs)
+        return self.score(self.feature_engineer.transform(songs_df), method, index=songs_df.index)
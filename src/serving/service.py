@@ -0,0 +1,218 @@
+"""
+Local HTTP scoring service.
+
+`SongScorer` loads the fitted feature pipeline, a saved model and its input
+scaler once and scores raw song rows (the same columns as the training CSVs).
+`ScoringServer` exposes it over HTTP, with concurrent requests coalesced into
+micro-batches by a `MicroBatcher`:
+
+    POST /predict   {"songs": [{...}, ...]}   (or a list of songs, or one song)
+                    -> {"model": ..., "probabilities": [...], "predictions": [...]}
+                    (400 naming the columns if raw inputs are missing or not numeric)
+    GET  /stats     request/batch counts, throughput, p50/p99 latency (and cache hit rates)
+    GET  /health    {"status": "ok", "model": ...}
+"""
+
+import json
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.inference.linear import FusedLinearScorer
+from src.models.artifacts import hash_files, load_artifact
+from src.serving.batcher import MicroBatcher
+from src.serving.cache import PredictionCache
+from src.utils.resources import ResourceGovernor
+
+logger = logging.getLogger(__name__)
+
+
+class SongScorer:
+    """Feature pipeline, model and scaler kept in memory for repeated scoring.
+
+    With `fused=True` the model's fused raw-column scorer (`<stem>.fused.json`,
+    exported for logistic regression) is used instead: no feature pipeline,
+    DataFrames or scikit-learn at scoring time.
+
+    With `cache_entries` (and optionally a `cache_path` for the on-disk tier)
+    scores are cached per raw song row, so repeated songs are not re-scored.
+    """
+
+    def __init__(self, model="Random Forest", models_path="models/saved_models", resources=None, fused=False,
+                 cache_entries=0, cache_path=None):
+        self.models_path = Path(models_path)
+        model_file = Path(model)
+        if not model_file.exists():
+            model_file = self.models_path / f"{model.lower().replace(' ', '_')}.pkl"
+        if fused:
+            model_file = model_file.with_suffix('.fused.json')
+        if not model_file.exists():
+            raise FileNotFoundError(f"No saved model {model_file}")
+
+        self.model_name = model_file.name.split('.')[0]
+        self.resources = resources or ResourceGovernor()
+        self.fused = FusedLinearScorer.load(model_file) if fused else None
+        if self.fused is not None:
+            artifact_files = [model_file]
+            self.input_columns = list(self.fused.inputs)
+            logger.info(f"Loaded fused {self.model_name} scorer ({len(self.fused.inputs)} raw inputs)")
+        else:
+            from src.features.feature_engineer import FeatureEngineer
+
+            # Feature pipeline and scalers are saved next to the model they belong to
+            preprocessing = model_file.parent / 'preprocessing'
+            self.feature_engineer = FeatureEngineer.load(preprocessing / 'feature_engineer.pkl')
+            self.feature_columns = self.feature_engineer.feature_columns
+            self.input_columns = self.feature_engineer.input_columns()
+            self.model = self.resources.configure_model(load_artifact(model_file), 'scoring')
+            scaler_file = preprocessing / f'{self.model_name}_scaler.pkl'
+            self.scaler = joblib.load(scaler_file) if scaler_file.exists() else None
+            artifact_files = [model_file, preprocessing / 'feature_engineer.pkl']
+            artifact_files += [scaler_file] if self.scaler is not None else []
+            logger.info(f"Loaded {self.model_name} ({len(self.feature_columns)} features) for scoring")
+
+        self.cache = None
+        if cache_entries or cache_path:
+            self.cache = PredictionCache(hash_files(*artifact_files), max_entries=cache_entries, path=cache_path)
+
+    def validate(self, songs):
+        """Copies of the song dicts with every raw input column as a float.
+
+        Raises ValueError naming the columns that are missing or not numeric, so a
+        bad request is rejected before it joins a batch.
+        """
+        missing, invalid, cleaned = set(), set(), []
+        for song in songs:
+            song = dict(song)
+            for column in self.input_columns:
+                value = song.get(column)
+                if value is None:
+                    missing.add(column)
+                    continue
+                try:
+                    number = float(value)
+                except (TypeError, ValueError):
+                    number = None
+                if number is None or isinstance(value, bool) or not np.isfinite(number):
+                    invalid.add(column)
+                    continue
+                song[column] = number
+            cleaned.append(song)
+
+        problems = []
+        if missing:
+            problems.append(f"missing columns {sorted(missing)}")
+        if invalid:
+            problems.append(f"non-numeric values in {sorted(invalid)}")
+        if problems:
+            raise ValueError('; '.join(problems))
+        return cleaned
+
+    def features(self, songs):
+        """Model input matrix for raw song rows (a DataFrame or a list of dicts)."""
+        raw_df = songs if isinstance(songs, pd.DataFrame) else pd.DataFrame.from_records(songs)
+        features_df = self.feature_engineer.transform(raw_df)
+        X = features_df[self.feature_columns].to_numpy(dtype=np.float32)
+        return self.scaler.transform(X) if self.scaler is not None else X
+
+    def predict_proba(self, songs):
+        """Hit probability of every song; with a cache only the songs not seen before are scored."""
+        if self.cache is None:
+            return self._predict_proba(songs)
+        raw_df = songs if isinstance(songs, pd.DataFrame) else pd.DataFrame.from_records(songs)
+        keys = self.cache.keys(raw_df)
+        probabilities, found = self.cache.get(keys)
+        if not found.all():
+            missing = np.flatnonzero(~found)
+            probabilities[missing] = self._predict_proba(raw_df.iloc[missing])
+            self.cache.put([keys[i] for i in missing], probabilities[missing])
+        return probabilities
+
+    def _predict_proba(self, songs):
+        if self.fused is not None:
+            return self.fused.predict_proba(songs)[:, 1]
+        with self.resources.limit('scoring'):
+            return self.model.predict_proba(self.features(songs))[:, 1]
+
+
+class ScoringHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'model': self.server.scorer.model_name})
+        elif self.path == '/stats':
+            stats = self.server.batcher.stats()
+            if self.server.scorer.cache is not None:
+                stats['cache'] = self.server.scorer.cache.stats()
+            self._send_json(200, stats)
+        else:
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send_json(404, {'error': f'Unknown path {self.path}'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'null')
+        except ValueError as e:
+            self._send_json(400, {'error': f'Invalid JSON: {e}'})
+            return
+
+        songs = payload.get('songs') if isinstance(payload, dict) and 'songs' in payload else payload
+        songs = [songs] if isinstance(songs, dict) else songs
+        if not songs or not isinstance(songs, list) or not all(isinstance(song, dict) for song in songs):
+            self._send_json(400, {'error': 'Expected {"songs": [{...}, ...]}'})
+            return
+        try:
+            songs = self.server.scorer.validate(songs)
+        except ValueError as e:
+            self._send_json(400, {'error': f'Invalid songs: {e}'})
+            return
+
+        try:
+            probabilities = self.server.batcher.score(songs, timeout=self.server.request_timeout)
+        except Exception as e:
+            self._send_json(500, {'error': f'Scoring failed: {e}'})
+            return
+        self._send_json(200, {
+            'model': self.server.scorer.model_name,
+            'probabilities': [round(float(p), 6) for p in probabilities],
+            'predictions': [int(p > 0.5) for p in probabilities]
+        })
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} - {format % args}")
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Room for many clients connecting at once (the socketserver default is 5)
+    request_queue_size = 128
+
+    def __init__(self, scorer, host='127.0.0.1', port=8000, max_batch_size=512, max_wait_ms=5.0,
+                 request_timeout=30.0):
+        super().__init__((host, port), ScoringHandler)
+        self.scorer = scorer
+        self.batcher = MicroBatcher(scorer.predict_proba, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+        self.request_timeout = request_timeout
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+        logger.info(f"Scoring stats: {self.batcher.stats()}")
+        if self.scorer.cache is not None:
+            logger.info(f"Prediction cache: {self.scorer.cache.stats()}")
+            self.scorer.cache.close()
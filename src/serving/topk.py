@@ -0,0 +1,67 @@
+"""
+Bounded top-K selection for streamed catalog scores.
+
+`TopK` keeps at most K rows per partition (e.g. per decade) while scored chunks
+stream through it, so finding the most likely hits among millions of songs
+needs memory proportional to K, not to the catalog. Each chunk is reduced to
+its own per-partition top K first (in the worker that scored it), then merged
+into the running selection. Ties keep the song that came first in the input.
+
+`matching_rows` filters raw chunks by column values (e.g. decades) and
+inclusive feature ranges before they are scored.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def matching_rows(frame, values=None, ranges=None):
+    """Boolean mask of rows whose columns take one of `values[column]` and lie
+    within `ranges[column] = (low, high)` (inclusive; None leaves a side open)."""
+    mask = np.ones(len(frame), dtype=bool)
+    for column, allowed in (values or {}).items():
+        mask &= frame[column].astype(str).isin([str(value) for value in allowed]).to_numpy()
+    for column, (low, high) in (ranges or {}).items():
+        column_values = frame[column].to_numpy(dtype=np.float64)
+        if low is not None:
+            mask &= column_values >= low
+        if high is not None:
+            mask &= column_values <= high
+    return mask
+
+
+class TopK:
+    def __init__(self, k, partition=None, score='probability'):
+        if k < 1:
+            raise ValueError(f"k must be positive, got {k}")
+        self.k = k
+        self.partition = partition
+        self.score = score
+        self.rows = None
+
+    @staticmethod
+    def select(frame, k, partition=None, score='probability'):
+        """The (at most) `k` highest-scoring rows of `frame`, per `partition` value."""
+        ordered = frame.sort_values(score, ascending=False, kind='stable')
+        if partition is None:
+            return ordered.head(k)
+        return ordered[ordered.groupby(partition, sort=False, dropna=False).cumcount().to_numpy() < k]
+
+    def push(self, frame):
+        """Merge a scored chunk into the running selection."""
+        if not len(frame):
+            return
+        # Kept rows go first, so on ties they win over later input rows
+        merged = frame if self.rows is None else pd.concat([self.rows, frame])
+        self.rows = self.select(merged, self.k, self.partition, self.score)
+
+    def ranked(self):
+        """Ranked table: `rank` (1 = most likely hit) within each partition, best first."""
+        if self.rows is None:
+            return pd.DataFrame(columns=['rank'])
+        table = self.rows.copy()
+        if self.partition is None:
+            table.insert(0, 'rank', np.arange(1, len(table) + 1))
+            return table
+        table.insert(0, 'rank', table.groupby(self.partition, sort=False, dropna=False).cumcount().to_numpy() + 1)
+        return table.sort_values([self.partition, 'rank'], kind='stable')
@@ -0,0 +1,20 @@
+"""
+Shared utilities: configuration loading, compute resource control and
+training telemetry.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    'load_config': '.config',
+    'ResourceGovernor': '.resources',
+    'TrainingTelemetry': '.telemetry',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        return getattr(import_module(_EXPORTS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,23 @@
+"""
+Project configuration loading.
+"""
+
+from pathlib import Path
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "config.yaml"
+
+
+def load_config(path=None):
+    """Load the project configuration from `config/config.yaml`."""
+    import yaml
+
+    path = Path(path) if path else DEFAULT_CONFIG_PATH
+    if not path.exists():
+        logger.warning(f"Config file {path} not found, using defaults")
+        return {}
+
+    with open(path) as f:
+        return yaml.safe_load(f) or {}
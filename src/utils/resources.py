@@ -0,0 +1,125 @@
+"""
+Compute resource governor: thread budgets, BLAS/OpenMP limits and a memory ceiling.
+"""
+
+import os
+import logging
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('training', 'evaluation', 'scoring')
+
+# How `memory_limit_gb` is enforced: 'rss' checks resident memory against the
+# budget (through the training telemetry) without a hard limit; 'address_space'
+# sets RLIMIT_AS, a hard cap on *virtual* address space
+MEMORY_LIMIT_MODES = ('rss', 'address_space')
+
+# Environment variables read by OpenMP and the common BLAS builds. They only
+# affect libraries loaded after they are set (and child processes), so
+# `apply` also limits already-loaded thread pools through threadpoolctl.
+THREAD_ENV_VARS = [
+    'OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS',
+    'BLIS_NUM_THREADS', 'VECLIB_MAXIMUM_THREADS', 'NUMEXPR_NUM_THREADS'
+]
+
+# Estimators that accept n_jobs without using it (for binary problems, and at all
+# since scikit-learn 1.8, which warns when it is set)
+IGNORED_N_JOBS = ('LogisticRegression',)
+
+
+class ResourceGovernor:
+    def __init__(self, total_cores=None, training_threads=None, evaluation_threads=None,
+                 scoring_threads=None, blas_threads=None, memory_limit_gb=None, memory_limit_mode='rss'):
+        if memory_limit_mode not in MEMORY_LIMIT_MODES:
+            raise ValueError(f"Unknown memory_limit_mode {memory_limit_mode!r}; expected one of {MEMORY_LIMIT_MODES}")
+        self.total_cores = min(total_cores or os.cpu_count() or 1, os.cpu_count() or 1)
+        self.stage_threads = {
+            'training': training_threads,
+            'evaluation': evaluation_threads,
+            'scoring': scoring_threads
+        }
+        self.blas_threads = blas_threads
+        self.memory_limit_gb = memory_limit_gb
+        self.memory_limit_mode = memory_limit_mode
+
+    @classmethod
+    def from_config(cls, config=None, **overrides):
+        """Build a governor from the `resources` config section; non-None overrides win."""
+        settings = dict((config or {}).get('resources') or {})
+        settings.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**settings)
+
+    @property
+    def memory_limit_bytes(self):
+        if not self.memory_limit_gb:
+            return None
+        return int(self.memory_limit_gb * 1024 ** 3)
+
+    def n_jobs(self, stage='training'):
+        """Thread budget for a stage, capped by the total core budget."""
+        threads = self.stage_threads.get(stage) or self.total_cores
+        return max(1, min(threads, self.total_cores))
+
+    def worker_options(self, n_workers):
+        """Constructor options that split the core and memory budget evenly between worker processes."""
+        cores = max(1, self.total_cores // n_workers)
+        blas = self.blas_threads
+        memory = self.memory_limit_gb
+        return {
+            'total_cores': cores,
+            'blas_threads': min(blas, cores) if blas else None,
+            'memory_limit_gb': memory / n_workers if memory else None,
+            'memory_limit_mode': self.memory_limit_mode
+        }
+
+    def apply(self):
+        """Apply process-wide limits: thread env vars, BLAS/OpenMP pools and, in
+        'address_space' mode, the memory ceiling."""
+        blas = str(self.blas_threads or self.total_cores)
+        for var in THREAD_ENV_VARS:
+            os.environ[var] = blas
+
+        try:
+            from threadpoolctl import threadpool_limits
+            threadpool_limits(limits=int(blas))
+        except ImportError:
+            logger.warning("threadpoolctl not available; BLAS limits apply to new processes only")
+
+        if self.memory_limit_bytes and self.memory_limit_mode == 'address_space':
+            # RLIMIT_AS counts reserved virtual memory, not resident memory: threaded
+            # OpenBLAS and XGBoost reserve large arenas, so a cap near the RSS target
+            # raises spurious MemoryErrors. Leave generous headroom above it.
+            try:
+                import resource
+                _, hard = resource.getrlimit(resource.RLIMIT_AS)
+                resource.setrlimit(resource.RLIMIT_AS, (self.memory_limit_bytes, hard))
+            except (ImportError, ValueError, OSError) as e:
+                logger.warning(f"Could not set memory ceiling: {e}")
+
+        budgets = {stage: self.n_jobs(stage) for stage in STAGES}
+        logger.info(
+            f"Resources: {self.total_cores} cores, stage threads {budgets}, "
+            f"BLAS threads {blas}, memory limit {self.memory_limit_gb or 'none'} GB"
+            + (f" ({self.memory_limit_mode})" if self.memory_limit_gb else '')
+        )
+
+    @contextmanager
+    def limit(self, stage='training'):
+        """Restrict BLAS/OpenMP pools while running a stage."""
+        try:
+            from threadpoolctl import threadpool_limits
+        except ImportError:
+            yield self.n_jobs(stage)
+            return
+
+        with threadpool_limits(limits=self.blas_threads or self.n_jobs(stage)):
+            yield self.n_jobs(stage)
+
+    def configure_model(self, model, stage='training'):
+        """Set a model's own thread count (n_jobs) to the stage budget where supported."""
+        if type(model).__name__ in IGNORED_N_JOBS:
+            return model
+        if hasattr(model, 'get_params') and 'n_jobs' in model.get_params(deep=False):
+            model.set_params(n_jobs=self.n_jobs(stage))
+        return model
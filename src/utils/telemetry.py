@@ -0,0 +1,159 @@
+"""
+Training telemetry: wall/CPU time, peak memory, input shape and iterations
+for every model phase (fit, predict, cross-validation and each CV fold).
+
+Peak resident memory is read from /proc/self/status (VmHWM), whose
+high-water mark is reset per phase through /proc/self/clear_refs. Where that
+is unavailable the process-lifetime peak from getrusage is reported instead.
+With `trace_memory` the tracemalloc peak of Python and NumPy allocations made
+during the phase is recorded as well; allocations inside native libraries
+(XGBoost, BLAS) only show up in the resident figure. Tracing slows training
+noticeably (~1.5x on the bundled data), so it is off by default.
+
+With `memory_budget_mb`, every top-level phase whose peak resident memory
+exceeds the budget is flagged (`over_memory_budget`) and logged as a warning.
+This is how the resource governor's default 'rss' memory limit is checked.
+"""
+
+import json
+import time
+import logging
+import platform
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_STATUS = Path('/proc/self/status')
+_CLEAR_REFS = Path('/proc/self/clear_refs')
+
+
+def peak_memory_mb():
+    """Peak resident memory of this process in MB (0 where getrusage is unavailable)."""
+    try:
+        import resource
+    except ImportError:
+        return 0.0
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _rss_mb():
+    """(current, peak) resident memory in MB, peak since the last reset."""
+    try:
+        fields = dict(line.split(':', 1) for line in _STATUS.read_text().splitlines() if ':' in line)
+        return int(fields['VmRSS'].split()[0]) / 1024, int(fields['VmHWM'].split()[0]) / 1024
+    except (OSError, KeyError, ValueError):
+        return None, peak_memory_mb()
+
+
+def _reset_rss_peak():
+    try:
+        _CLEAR_REFS.write_text('5')
+        return True
+    except OSError:
+        return False
+
+
+class TrainingTelemetry:
+    def __init__(self, trace_memory=False, memory_budget_mb=None):
+        self.trace_memory = trace_memory
+        self.memory_budget_mb = memory_budget_mb
+        self.records = []
+        self._active = []
+        self.started = datetime.now(timezone.utc).isoformat()
+
+    def _refresh_peaks(self):
+        """Fold the current peaks into every open phase, then reset them for a nested phase."""
+        _, rss_peak = _rss_mb()
+        traced_peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        for frame in self._active:
+            frame['rss_peak'] = max(frame['rss_peak'], rss_peak)
+            frame['traced_peak'] = max(frame['traced_peak'], traced_peak - frame['traced_start'])
+        _reset_rss_peak()
+        if tracemalloc.is_tracing():
+            tracemalloc.reset_peak()
+
+    @contextmanager
+    def measure(self, model, phase, fold=None, shape=None):
+        """Record one phase; the yielded dict can be extended (e.g. with `n_iterations`)."""
+        started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start()
+        self._refresh_peaks()
+
+        rss_start, _ = _rss_mb()
+        frame = {
+            'rss_peak': 0.0,
+            'traced_peak': 0,
+            'traced_start': tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+        }
+        record = {'model': model, 'phase': phase}
+        if fold is not None:
+            record['fold'] = fold
+        if shape is not None:
+            record['rows'], record['columns'] = int(shape[0]), int(shape[1])
+        self._active.append(frame)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            record['wall_seconds'] = time.perf_counter() - wall
+            record['cpu_seconds'] = time.process_time() - cpu
+            self._refresh_peaks()
+            self._active.pop()
+            record['rss_start_mb'] = rss_start
+            record['peak_rss_mb'] = frame['rss_peak']
+            if tracemalloc.is_tracing():
+                record['peak_traced_mb'] = max(frame['traced_peak'], 0) / 1024 ** 2
+            if started_tracing:
+                tracemalloc.stop()
+            if self.memory_budget_mb and not self._active and frame['rss_peak'] > self.memory_budget_mb:
+                record['over_memory_budget'] = True
+                logger.warning(f"{model} {phase}: peak RSS {frame['rss_peak']:.0f} MB exceeds the "
+                               f"{self.memory_budget_mb:.0f} MB memory budget")
+            self.records.append(record)
+
+    def summary(self):
+        """One row per model: seconds per phase, CPU seconds, peak memory and iterations."""
+        import pandas as pd
+
+        if not self.records:
+            return pd.DataFrame()
+        df = pd.DataFrame(self.records)
+        top = df[df['phase'] != 'fold']
+        wall = top.pivot_table(index='model', columns='phase', values='wall_seconds', aggfunc='sum')
+        wall.columns = [f'{phase}_seconds' for phase in wall.columns]
+        summary = wall.join(top.groupby('model').agg(
+            cpu_seconds=('cpu_seconds', 'sum'),
+            peak_rss_mb=('peak_rss_mb', 'max')
+        ))
+        if 'peak_traced_mb' in df:
+            summary['peak_traced_mb'] = df.groupby('model')['peak_traced_mb'].max()
+        if 'n_iterations' in df:
+            summary['n_iterations'] = top.groupby('model')['n_iterations'].max()
+        summary['total_seconds'] = top.groupby('model')['wall_seconds'].sum()
+        return summary.sort_values('total_seconds', ascending=False)
+
+    def log_summary(self):
+        summary = self.summary()
+        if summary.empty:
+            return summary
+        logger.info("Training telemetry (slowest first):\n" + summary.round(2).to_string())
+        return summary
+
+    def save(self, path):
+        """Write every phase record plus run metadata as JSON."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            'started': self.started,
+            'finished': datetime.now(timezone.utc).isoformat(),
+            'host': platform.node(),
+            'records': self.records
+        }
+        with open(path, 'w') as f:
+            json.dump(payload, f, indent=2, default=str)
+        logger.info(f"Saved training telemetry: {path}")
+        return path
@@ -2,9 +2,6 @@
 Visualization utilities for hit song prediction.
 """
 
-import matplotlib.pyplot as plt
-import seaborn as sns
-import pandas as pd
 import numpy as np
 from pathlib import Path
 import logging
@@ -14,11 +11,18 @@ logger = logging.getLogger(__name__)
 class Plotter:
     def __init__(self):
         self.figures_path = Path("reports/figures")
-        self.figures_path.mkdir(parents=True, exist_ok=True)
+    
+    def _pyplot(self):
+        """matplotlib's pyplot with the project style, imported on the first plot."""
+        import matplotlib.pyplot as plt
+        
         plt.style.use('seaborn-v0_8')
+        self.figures_path.mkdir(parents=True, exist_ok=True)
+        return plt
         
     def plot_target_distribution(self, df):
         """Plot distribution of target variable."""
+        plt = self._pyplot()
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
         
         # Count plot
@@ -47,6 +51,7 @@ class Plotter:
     
     def plot_feature_correlations(self, df):
         """Plot correlation matrix of features."""
+        plt = self._pyplot()
         # Select only numerical columns for correlation
         numerical_cols = df.select_dtypes(include=[np.number]).columns
         corr_matrix = df[numerical_cols].corr()
@@ -72,6 +77,7 @@ class Plotter:
     
     def plot_model_comparison(self, results):
         """Plot comparison of model performances."""
+        plt = self._pyplot()
         models = list(results.keys())
         accuracies = [results[model]['accuracy'] for model in models]
         cv_scores = [results[model]['cv_mean'] for model in models]
@@ -103,10 +109,12 @@ class Plotter:
         plt.close()
         logger.info("Saved model comparison plot")
     
-    def plot_feature_importance(self, model, feature_names, model_name):
-        """Plot feature importance for tree-based models."""
-        if hasattr(model, 'feature_importances_'):
-            importances = model.feature_importances_
+    def plot_feature_importance(self, model, feature_names, model_name, importances=None):
+        """Plot feature importance for tree-based models (or precomputed `importances`)."""
+        if importances is None:
+            importances = getattr(model, 'feature_importances_', None)
+        if importances is not None:
+            plt = self._pyplot()
             indices = np.argsort(importances)[::-1]
             
             plt.figure(figsize=(10, 8))
@@ -131,7 +139,7 @@ class Plotter:
         # Plot feature importance for tree-based models
         feature_columns = [col for col in df.columns if col not in ['target', 'decade']]
         for model_name, result in results.items():
-            model = result['model']
-            self.plot_feature_importance(model, feature_columns, model_name)
+            self.plot_feature_importance(result.get('model'), feature_columns, model_name,
+                                         result.get('feature_importance'))
         
         logger.info("All visualizations created successfully")
\ No newline at end of file
@@ -0,0 +1,52 @@
+"""
+Tests for streaming chunked batch scoring.
+"""
+
+import sys
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.serving.batch import BatchScorer
+from tests.test_top_k import raw_songs
+
+
+class TestBatchScoring:
+    def test_score_csv_keeps_input_order(self, tmp_path):
+        """Chunks scored by several workers are written in input order; the summary covers every worker."""
+        train = raw_songs(500, 0)
+        fe = FeatureEngineer()
+        features = fe.create_features(train)
+        model = LogisticRegression(max_iter=1000).fit(features[fe.feature_columns].to_numpy(np.float32), train['target'])
+        fe.save(tmp_path / 'preprocessing' / 'feature_engineer.pkl')
+        joblib.dump(model, tmp_path / 'logistic_regression.pkl')
+        songs = raw_songs(2000, 1).drop(columns='target')
+        catalog = tmp_path / 'catalog.csv'
+        songs.to_csv(catalog, index=False)
+
+        expected = model.predict_proba(fe.transform(songs)[fe.feature_columns].to_numpy(np.float32))[:, 1]
+        scorer = BatchScorer('Logistic Regression', tmp_path, n_workers=2, chunk_rows=150)
+        summary = scorer.score_csv(catalog, tmp_path / 'scores.csv')
+        scores = pd.read_csv(tmp_path / 'scores.csv')
+        assert list(scores['track']) == list(songs['track'])
+        np.testing.assert_allclose(scores['probability'], expected, atol=1e-5)
+        assert (scores['prediction'] == (scores['probability'] > 0.5)).all()
+
+        assert summary['rows'] == 2000 and summary['workers'] == 2
+        assert 0 < summary['worker_peak_memory_mb'] <= summary['workers_total_peak_memory_mb']
+        assert summary['workers_total_peak_memory_mb'] <= 2 * summary['worker_peak_memory_mb']
+
+        # Without id columns the input position identifies each song
+        songs.drop(columns='track').to_csv(catalog, index=False)
+        BatchScorer('Logistic Regression', tmp_path, n_workers=2, chunk_rows=150).score_csv(catalog, tmp_path / 'rows.csv')
+        rows = pd.read_csv(tmp_path / 'rows.csv')
+        assert list(rows['row']) == list(range(2000))
+        np.testing.assert_allclose(rows['probability'], expected, atol=1e-5)
+        print("✅ Batch score_csv test passed")
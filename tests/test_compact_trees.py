@@ -0,0 +1,88 @@
+"""
+Unit tests for the compact tree-ensemble artifact format.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+from sklearn.datasets import make_classification
+from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+import xgboost as xgb
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.inference.trees import CompactTreeEnsemble
+from src.models.artifacts import load_artifact
+from src.models.model_trainer import ModelTrainer
+from src.models.tree_export import export_random_forest, export_tree_ensemble, save_compact
+
+
+def fitted_forest():
+    X, y = make_classification(n_samples=600, n_features=12, random_state=0)
+    X = X.astype(np.float32)
+    model = RandomForestClassifier(n_estimators=25, random_state=42).fit(X, y)
+    return model, X
+
+
+class TestCompactTrees:
+    def test_random_forest_parity(self):
+        """Compact forest probabilities match sklearn's."""
+        model, X = fitted_forest()
+        compact = export_random_forest(model)
+        np.testing.assert_allclose(compact.predict_proba(X), model.predict_proba(X), atol=1e-6)
+        np.testing.assert_array_equal(compact.predict(X), model.predict(X))
+        assert compact.feature.dtype == np.int16 and compact.threshold.dtype == np.float32
+        print("✅ Random forest parity test passed")
+
+    def test_save_and_mmap_load(self, tmp_path):
+        """Artifacts round-trip memory-mapped and compressed."""
+        model, X = fitted_forest()
+        expected = model.predict_proba(X)[:, 1]
+
+        mapped = CompactTreeEnsemble.load(save_compact(model, tmp_path / 'rf.trees'), mmap=True)
+        assert isinstance(mapped.threshold, np.memmap)
+        np.testing.assert_allclose(mapped.predict_proba(X)[:, 1], expected, atol=1e-6)
+
+        packed = CompactTreeEnsemble.load(save_compact(model, tmp_path / 'rf.trees', compress=True))
+        assert not (tmp_path / 'rf.trees' / 'threshold.npy').exists()
+        np.testing.assert_allclose(packed.predict_proba(X)[:, 1], expected, atol=1e-6)
+        print("✅ Compact artifact save/load test passed")
+
+    def test_boosted_parity_with_missing_values(self):
+        """Gradient boosting and XGBoost (with NaN inputs) match their libraries' probabilities."""
+        X, y = make_classification(n_samples=800, n_features=10, random_state=1)
+        X = X.astype(np.float32)
+        X_missing = X.copy()
+        X_missing[np.random.default_rng(0).random(X.shape) < 0.1] = np.nan
+
+        gb = GradientBoostingClassifier(n_estimators=30, random_state=42).fit(X, y)
+        np.testing.assert_allclose(export_tree_ensemble(gb).predict_proba(X), gb.predict_proba(X), atol=1e-6)
+
+        booster = xgb.XGBClassifier(n_estimators=30, max_depth=4, n_jobs=1).fit(X_missing, y)
+        compact = export_tree_ensemble(booster)
+        np.testing.assert_allclose(compact.predict_proba(X_missing), booster.predict_proba(X_missing), atol=1e-5)
+        assert compact.meta['aggregation'] == 'logistic'
+        print("✅ Boosted ensemble parity test passed")
+
+    def test_resave_drops_stale_compact_artifact(self, tmp_path):
+        """Saving a model twice never leaves the first model's `.trees/` to be loaded."""
+        forest, X = fitted_forest()
+        trainer = ModelTrainer(models_path=tmp_path)
+        trainer.save_model(forest, 'Random Forest')
+        assert isinstance(load_artifact(tmp_path / 'random_forest.pkl'), CompactTreeEnsemble)
+
+        # Not exportable: the forest's compact artifact is removed
+        linear = LogisticRegression().fit(X, forest.predict(X))
+        trainer.save_model(linear, 'Random Forest')
+        assert not (tmp_path / 'random_forest.trees').exists()
+        assert isinstance(load_artifact(tmp_path / 'random_forest.pkl'), LogisticRegression)
+
+        # Compact export switched off
+        trainer.save_model(forest, 'Random Forest')
+        ModelTrainer(models_path=tmp_path, compact_artifacts=None).save_model(forest, 'Random Forest')
+        assert not (tmp_path / 'random_forest.trees').exists()
+        assert isinstance(load_artifact(tmp_path / 'random_forest.pkl'), RandomForestClassifier)
+        print("✅ Stale compact artifact test passed")
@@ -0,0 +1,67 @@
+"""
+Tests for early stopping of the iterative learners.
+"""
+
+import sys
+from argparse import Namespace
+from pathlib import Path
+from sklearn.datasets import make_classification
+import xgboost as xgb
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.main import training_options
+from src.models.model_trainer import ModelTrainer
+
+
+def noisy_data():
+    # Label noise makes the validation loss plateau well before 100 rounds
+    return make_classification(n_samples=1500, n_features=10, n_informative=4, flip_y=0.3, random_state=0)
+
+
+def cli_args(**flags):
+    return Namespace(**{'early_stopping': None, 'hist_boosting': None, 'coreset_size': None,
+                        'coreset_method': None, **flags})
+
+
+class TestEarlyStopping:
+    def test_boosting_stops_early(self):
+        """GB and HGB stop on the validation split and report the iterations they ran."""
+        X, y = noisy_data()
+        for hist_boosting, attribute in [(False, 'n_estimators_'), (True, 'n_iter_')]:
+            trainer = ModelTrainer(hist_boosting=hist_boosting, early_stopping_rounds=3)
+            trainer.initialize_models()
+            model = trainer.models['Gradient Boosting'].fit(X, y)
+            assert getattr(model, attribute) < 100, attribute
+            assert ModelTrainer._iterations_used(model) == getattr(model, attribute)
+
+            trainer = ModelTrainer(hist_boosting=hist_boosting, early_stopping=False)
+            trainer.initialize_models()
+            model = trainer.models['Gradient Boosting'].fit(X, y)
+            assert ModelTrainer._iterations_used(model) == 100
+
+        booster = xgb.XGBClassifier(n_estimators=100, early_stopping_rounds=3, n_jobs=1)
+        booster.fit(X[:1200], y[:1200], eval_set=[(X[1200:], y[1200:])], verbose=False)
+        assert ModelTrainer._iterations_used(booster) == booster.best_iteration + 1 < 100
+        print("✅ Boosting early stopping test passed")
+
+    def test_training_options_merge(self):
+        """Config `model` settings are used unless a CLI flag was given; other keys are dropped."""
+        config = {'model': {'early_stopping': True, 'early_stopping_rounds': 5,
+                            'validation_fraction': 0.2, 'hist_boosting': True, 'test_size': 0.3}}
+        assert training_options(config, cli_args()) == {
+            'early_stopping': True, 'early_stopping_rounds': 5, 'validation_fraction': 0.2, 'hist_boosting': True
+        }
+        # --no-early-stopping wins over the config
+        options = training_options(config, cli_args(early_stopping=False))
+        assert options['early_stopping'] is False and options['early_stopping_rounds'] == 5
+        assert training_options(None, cli_args(early_stopping=False)) == {'early_stopping': False}
+
+        trainer = ModelTrainer(**options)
+        trainer.initialize_models()
+        assert trainer.models['Gradient Boosting'].early_stopping is False
+        assert trainer.models['Neural Network'].early_stopping is False
+        assert trainer.models['XGBoost'].early_stopping_rounds is None
+        print("✅ Training options merge test passed")
@@ -0,0 +1,50 @@
+"""
+Unit tests for the fused feature-plus-linear scorer.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.inference.linear import FusedLinearScorer
+from src.models.linear_export import export_fused_linear
+
+
+def raw_songs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    columns = ['danceability', 'energy', 'speechiness', 'acousticness', 'instrumentalness', 'liveness', 'valence']
+    df = pd.DataFrame(rng.random((n, len(columns))), columns=columns)
+    df['loudness'] = rng.uniform(-20, 0, n)
+    df['tempo'] = rng.uniform(60, 180, n)
+    df['duration_ms'] = rng.uniform(120000, 400000, n)
+    df['decade'] = rng.choice(['60s', '80s', '00s', '10s'], n)
+    return df
+
+
+class TestFusedLinear:
+    def test_matches_feature_pipeline_and_model(self, tmp_path):
+        """Fused raw-column scores match FeatureEngineer + LogisticRegression, before and after a save."""
+        train = raw_songs(500)
+        feature_engineer = FeatureEngineer()
+        features = feature_engineer.create_features(train)
+        X = features[feature_engineer.feature_columns].to_numpy(dtype=np.float64)
+        y = (train['energy'] * train['danceability'] + 0.1 * np.random.default_rng(1).random(500) > 0.3).astype(int)
+        model = LogisticRegression(max_iter=1000).fit(X, y)
+
+        new = raw_songs(200, seed=2)
+        new.loc[:9, 'decade'] = '50s'
+        expected = model.predict_proba(
+            feature_engineer.transform(new)[feature_engineer.feature_columns].to_numpy(dtype=np.float64)
+        )
+        scorer = FusedLinearScorer.load(export_fused_linear(feature_engineer, model).save(tmp_path / 'lr.fused.json'))
+
+        np.testing.assert_allclose(scorer.predict_proba(new), expected, atol=1e-9)
+        np.testing.assert_allclose(scorer.predict_proba(new.to_dict('records'))[:, 1], expected[:, 1], atol=1e-9)
+        print("✅ Fused linear parity test passed")
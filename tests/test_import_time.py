@@ -0,0 +1,59 @@
+"""
+Import-time budget for the scoring entry points.
+
+Each check runs in a fresh interpreter, so modules imported by other tests do
+not hide a regression.
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+project_root = Path(__file__).parent.parent
+
+# Scoring must not pull in plotting or the training-only libraries
+TRAINING_ONLY = ['matplotlib', 'seaborn', 'xgboost', 'sklearn']
+
+# Modules a scoring-only invocation imports, with their wall-time budget in seconds
+SCORING_IMPORTS = {
+    'src.inference': 0.5,
+    'src.inference.runtime': 0.5,
+    'src.models.artifacts': 1.5,
+    'src.serving.batch': 2.0,
+}
+
+
+def import_in_subprocess(module):
+    code = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        f"import {module}\n"
+        "print(json.dumps({'seconds': time.perf_counter() - started, 'modules': list(sys.modules)}))\n"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=project_root, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+class TestImportTime:
+    def test_scoring_imports_stay_light(self):
+        """Scoring modules import within budget and without training or plotting libraries."""
+        for module, budget in SCORING_IMPORTS.items():
+            result = import_in_subprocess(module)
+            loaded = [name for name in TRAINING_ONLY if name in result['modules']]
+            assert not loaded, f"{module} imports {loaded}"
+            assert result['seconds'] < budget, f"{module} took {result['seconds']:.2f}s (budget {budget}s)"
+        print("✅ Import-time budget test passed")
+
+    def test_inference_runtime_needs_only_numpy(self):
+        """The bundle runtime imports neither pandas nor any training library."""
+        modules = import_in_subprocess('src.inference.runtime')['modules']
+        loaded = [name for name in TRAINING_ONLY + ['pandas', 'scipy', 'joblib'] if name in modules]
+        assert not loaded, f"src.inference.runtime imports {loaded}"
+        print("✅ NumPy-only runtime test passed")
+
+    def test_package_exports_are_lazy(self):
+        """`src.models` only loads the trainer when `ModelTrainer` is accessed."""
+        result = import_in_subprocess('src.models')
+        assert 'src.models.model_trainer' not in result['modules']
+        print("✅ Lazy package export test passed")
@@ -0,0 +1,68 @@
+"""
+Parity tests for the NumPy-only inference runtime against the full
+FeatureEngineer + scikit-learn path.
+"""
+
+import sys
+import time
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.inference.runtime import InferenceBundle
+from src.models.bundle_export import save_bundle
+
+
+def raw_songs(n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        column: rng.random(n) for column in
+        ['danceability', 'energy', 'valence', 'acousticness', 'instrumentalness', 'liveness', 'speechiness']
+    })
+    df['loudness'] = rng.normal(-8, 3, n)
+    df['tempo'] = rng.uniform(60, 180, n)
+    df['duration_ms'] = rng.integers(90000, 420000, n)
+    df['decade'] = rng.choice(['80s', '90s', '00s', '10s'], n)
+    df['track'] = [f'song {i}' for i in range(n)]
+    df['target'] = ((df['danceability'] + df['energy'] > 1) ^ (rng.random(n) < 0.1)).astype(int)
+    return df
+
+
+class TestInferenceRuntime:
+    def test_bundles_match_feature_pipeline_and_sklearn(self, tmp_path):
+        """Bundled forest, logistic regression, neural network and SVM match the training stack."""
+        train, new = raw_songs(600, 0), raw_songs(300, 1)
+        fe = FeatureEngineer()
+        features = fe.create_features(train)
+        X = features[fe.feature_columns].to_numpy(dtype=np.float32)
+        y = train['target']
+        scaler = StandardScaler().fit(X)
+        X_new = fe.transform(new)[fe.feature_columns].to_numpy(dtype=np.float32)
+
+        models = {
+            'random_forest': (RandomForestClassifier(n_estimators=20, random_state=42).fit(X, y), None),
+            'logistic_regression': (LogisticRegression(max_iter=1000).fit(X, y), None),
+            'neural_network': (MLPClassifier(hidden_layer_sizes=(16, 8), max_iter=300, random_state=42)
+                               .fit(scaler.transform(X), y), scaler),
+            'svm': (SVC(probability=True, random_state=42).fit(scaler.transform(X), y), scaler)
+        }
+        for name, (model, model_scaler) in models.items():
+            expected = model.predict_proba(model_scaler.transform(X_new) if model_scaler else X_new)
+            path = save_bundle(fe, model, tmp_path / f'{name}.bundle', scaler=model_scaler)
+
+            started = time.perf_counter()
+            bundle = InferenceBundle.load(path)
+            assert time.perf_counter() - started < 0.1, f"{name} bundle took too long to load"
+            np.testing.assert_allclose(bundle.predict_proba(new), expected, atol=1e-6, err_msg=name)
+            np.testing.assert_allclose(bundle.predict_proba(new.to_dict('records')), expected, atol=1e-6, err_msg=name)
+        print("✅ Inference runtime parity test passed")
@@ -0,0 +1,70 @@
+"""
+Unit tests for the scoring service's micro-batcher.
+"""
+
+import sys
+import threading
+from pathlib import Path
+import numpy as np
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.serving.batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    def test_concurrent_requests_share_batches(self):
+        """Concurrent requests are scored together and each gets back its own rows' scores."""
+        batch_sizes = []
+
+        def score_batch(rows):
+            batch_sizes.append(len(rows))
+            return np.array(rows, dtype=float) * 2
+
+        batcher = MicroBatcher(score_batch, max_batch_size=64, max_wait_ms=50)
+        results = {}
+
+        def request(i):
+            results[i] = batcher.score([i, i + 100], timeout=5)
+
+        threads = [threading.Thread(target=request, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        batcher.close()
+
+        for i in range(20):
+            np.testing.assert_array_equal(results[i], [2 * i, 2 * (i + 100)])
+        assert sum(batch_sizes) == 40 and len(batch_sizes) < 20
+        stats = batcher.stats()
+        assert stats['requests'] == 20 and stats['latency_p99_ms'] >= stats['latency_p50_ms']
+        print("✅ Micro-batching test passed")
+
+    def test_scoring_errors_reach_every_request(self):
+        """A failing batch raises in every request that was part of it."""
+        def score_batch(rows):
+            raise ValueError("bad rows")
+
+        batcher = MicroBatcher(score_batch, max_wait_ms=1)
+        future = batcher.submit([{'danceability': 0.5}])
+        assert isinstance(future.exception(timeout=5), ValueError)
+        batcher.close()
+        print("✅ Batch error propagation test passed")
+
+    def test_bad_request_only_fails_itself(self):
+        """When a coalesced batch fails, its requests are retried alone and only the bad one fails."""
+        def score_batch(rows):
+            if any(row == 'bad' for row in rows):
+                raise ValueError("bad rows")
+            return np.array(rows, dtype=float)
+
+        batcher = MicroBatcher(score_batch, max_batch_size=64, max_wait_ms=200)
+        good, bad = batcher.submit([1.0, 2.0]), batcher.submit(['bad'])
+        np.testing.assert_array_equal(good.result(timeout=5), [1.0, 2.0])
+        assert isinstance(bad.exception(timeout=5), ValueError)
+        batcher.close()
+        assert batcher.stats()['batches'] == 1
+        print("✅ Batch error isolation test passed")
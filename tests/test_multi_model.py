@@ -0,0 +1,75 @@
+"""
+Tests for scoring one feature matrix with several models at once.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.neural_network import MLPClassifier
+from sklearn.preprocessing import StandardScaler
+from sklearn.svm import SVC
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.serving.multi_model import MultiModelScorer
+
+
+def feature_matrix(n, seed):
+    rng = np.random.default_rng(seed)
+    X = pd.DataFrame(rng.normal(size=(n, 6)), columns=[f'f{i}' for i in range(6)])
+    y = ((X['f0'] + X['f1'] > 0) ^ (rng.random(n) < 0.1)).astype(int)
+    return X, y
+
+
+class TestMultiModelScorer:
+    def test_matches_separate_scoring_and_shares_inputs(self):
+        """Concurrent scoring matches per-model calls; unscaled models share one matrix, scaled ones one copy."""
+        X, y = feature_matrix(400, 0)
+        X_new, _ = feature_matrix(200, 1)
+        scaler = StandardScaler().fit(X.to_numpy(np.float32))
+        X_scaled = scaler.transform(X.to_numpy(np.float32))
+        models = {
+            'Random Forest': RandomForestClassifier(n_estimators=20, random_state=42).fit(X.to_numpy(np.float32), y),
+            'Logistic Regression': LogisticRegression().fit(X.to_numpy(np.float32), y),
+            'Svm': SVC(probability=True, random_state=42).fit(X_scaled, y),
+            'Neural Network': MLPClassifier(hidden_layer_sizes=(8,), max_iter=500, random_state=42).fit(X_scaled, y)
+        }
+        # Separately loaded scalers with the same fitted parameters share the scaled matrix
+        scalers = {'Svm': scaler, 'Neural Network': StandardScaler().fit(X.to_numpy(np.float32))}
+        scorer = MultiModelScorer(models, scalers, list(X.columns), n_workers=4)
+
+        inputs = scorer.inputs(X_new)
+        assert inputs['Random Forest'] is inputs['Logistic Regression']
+        assert inputs['Svm'] is inputs['Neural Network']
+        assert inputs['Random Forest'].dtype == np.float32 and inputs['Random Forest'].flags['C_CONTIGUOUS']
+
+        scored = scorer.run(X_new, labels=True)
+        X_values = X_new.to_numpy(np.float32)
+        for name, model in models.items():
+            X_model = scalers[name].transform(X_values) if name in scalers else X_values
+            np.testing.assert_allclose(scored[name][0], model.predict_proba(X_model)[:, 1], err_msg=name)
+            np.testing.assert_array_equal(scored[name][1], model.predict(X_model), err_msg=name)
+        print("✅ Multi-model parity test passed")
+
+    def test_ensemble_mean_and_vote(self):
+        """The table holds per-model columns, hit votes and the mean or vote-share ensemble."""
+        X, y = feature_matrix(300, 2)
+        X_values = X.to_numpy(np.float32)
+        models = {
+            'A': LogisticRegression().fit(X_values, y),
+            'B': RandomForestClassifier(n_estimators=10, random_state=0).fit(X_values, y),
+            'C': LogisticRegression(C=0.01).fit(X_values, y)
+        }
+        scorer = MultiModelScorer(models, feature_columns=list(X.columns))
+        table = scorer.score(X)
+        assert list(table.columns) == ['A', 'B', 'C', 'hit_votes', 'ensemble']
+        np.testing.assert_allclose(table['ensemble'], table[['A', 'B', 'C']].mean(axis=1))
+
+        voted = scorer.score(X, method='vote')
+        np.testing.assert_allclose(voted['ensemble'], voted['hit_votes'] / 3)
+        print("✅ Ensemble test passed")
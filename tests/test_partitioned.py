@@ -0,0 +1,53 @@
+"""
+Tests for the per-decade model family and its router.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.models.artifacts import load_artifact, read_metadata
+from src.models.partitioned import DecadeRouter, PartitionedTrainer
+from tests.test_top_k import raw_songs
+
+
+class TestPartitioned:
+    def test_train_and_route(self, tmp_path):
+        """Large decades get their own model; the router uses it and sends the rest to the fallback."""
+        songs = raw_songs(1000, 0)
+        songs.loc[songs.index[:900], 'decade'] = np.where(songs.index[:900] % 2, '80s', '90s')
+        songs.loc[songs.index[900:], 'decade'] = '00s'  # 100 rows: below min_rows
+        fe = FeatureEngineer()
+        features = fe.create_features(songs)
+
+        trainer = PartitionedTrainer(models=['Logistic Regression'], n_workers=2, models_path=tmp_path, min_rows=200)
+        results = trainer.train(features)
+        assert set(results) == {'80s', '90s'}
+        assert 0.7 < trainer.routed_accuracy()['Logistic Regression'] <= 1
+        manifest = read_metadata(tmp_path / 'manifest.json')
+        assert set(manifest['partitions']) == {'80s', '90s'}
+        assert manifest['partitions']['80s']['rows'] == 450
+
+        fallback = LogisticRegression(max_iter=1000).fit(
+            features[fe.feature_columns].to_numpy(np.float32), features['target'])
+        router = DecadeRouter('Logistic Regression', tmp_path, fallback=fallback)
+        probabilities = router.predict_proba(features)[:, 1]
+
+        X = features[fe.feature_columns].to_numpy(np.float32)
+        for decade in ['80s', '90s']:
+            rows = (features['decade'] == decade).to_numpy()
+            model = load_artifact(tmp_path / decade / 'logistic_regression.pkl')
+            np.testing.assert_allclose(probabilities[rows], model.predict_proba(X[rows])[:, 1])
+        rows = (features['decade'] == '00s').to_numpy()
+        np.testing.assert_allclose(probabilities[rows], fallback.predict_proba(X[rows])[:, 1])
+
+        with pytest.raises(KeyError):
+            DecadeRouter('Logistic Regression', tmp_path).predict(features)
+        print("✅ Per-decade training and routing test passed")
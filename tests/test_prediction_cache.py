@@ -0,0 +1,59 @@
+"""
+Unit tests for the scoring prediction cache.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.serving.cache import PredictionCache
+
+FINGERPRINT = 'a' * 64
+
+
+def songs(n, offset=0):
+    return pd.DataFrame({
+        'id': np.arange(n) + offset,
+        'danceability': np.linspace(0, 1, n) + offset,
+        'tempo': np.arange(n) + 100 + offset,
+        'decade': ['10s'] * n
+    })
+
+
+class TestPredictionCache:
+    def test_memory_lru_and_keys(self):
+        """Keys ignore id columns and int/float differences; the LRU keeps the newest entries."""
+        cache = PredictionCache(FINGERPRINT, max_entries=3)
+        batch = songs(4)
+        keys = cache.keys(batch)
+        assert keys == cache.keys(batch.assign(id=batch['id'] + 1000, tempo=batch['tempo'].astype(float)))
+        assert keys != PredictionCache('b' * 64).keys(batch)
+
+        cache.put(keys, [0.1, 0.2, 0.3, 0.4])
+        probabilities, found = cache.get(keys)
+        np.testing.assert_array_equal(found, [False, True, True, True])
+        np.testing.assert_allclose(probabilities[1:], [0.2, 0.3, 0.4])
+        stats = cache.stats()
+        assert stats['memory_hits'] == 3 and stats['misses'] == 1 and stats['hit_rate'] == 0.75
+        print("✅ In-memory LRU cache test passed")
+
+    def test_disk_tier_survives_restarts(self, tmp_path):
+        """A new cache instance reads scores written by an earlier one from disk."""
+        keys = PredictionCache(FINGERPRINT).keys(songs(5))
+        first = PredictionCache(FINGERPRINT, max_entries=10, path=tmp_path / 'cache.sqlite')
+        first.put(keys[:3], [0.5, 0.6, 0.7])
+        first.close()
+
+        second = PredictionCache(FINGERPRINT, max_entries=10, path=tmp_path / 'cache.sqlite')
+        probabilities, found = second.get(keys)
+        np.testing.assert_array_equal(found, [True, True, True, False, False])
+        np.testing.assert_allclose(probabilities[:3], [0.5, 0.6, 0.7])
+        second.get(keys[:3])
+        assert second.stats()['disk_hits'] == 3 and second.stats()['memory_hits'] == 3
+        second.close()
+        print("✅ On-disk cache tier test passed")
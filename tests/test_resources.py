@@ -0,0 +1,77 @@
+"""
+Tests for the compute resource governor.
+"""
+
+import os
+import subprocess
+import sys
+import warnings
+from pathlib import Path
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.resources import ResourceGovernor
+
+
+def rlimit_after_apply(mode):
+    """RLIMIT_AS soft limit of a child process after `apply` (a hard cap must not hit the test process)."""
+    code = (
+        "import resource; from src.utils.resources import ResourceGovernor; "
+        f"ResourceGovernor(total_cores=1, memory_limit_gb=64, memory_limit_mode={mode!r}).apply(); "
+        "print(resource.getrlimit(resource.RLIMIT_AS)[0])"
+    )
+    output = subprocess.run([sys.executable, '-c', code], cwd=project_root, capture_output=True,
+                            text=True, check=True).stdout
+    return int(output.split()[-1])
+
+
+class TestResourceGovernor:
+    def test_thread_budgets(self):
+        """Stage budgets fall back to the core budget and never exceed it."""
+        cores = os.cpu_count() or 1
+        resources = ResourceGovernor(total_cores=cores, training_threads=cores + 8, scoring_threads=1)
+        assert resources.n_jobs('training') == cores
+        assert resources.n_jobs('evaluation') == cores
+        assert resources.n_jobs('scoring') == 1
+
+        with resources.limit('scoring') as threads:
+            assert threads == 1
+
+        forest = resources.configure_model(RandomForestClassifier(), 'scoring')
+        assert forest.n_jobs == 1
+        # LogisticRegression ignores n_jobs, and recent scikit-learn warns when it is set
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            linear = resources.configure_model(LogisticRegression(), 'scoring')
+            linear.fit([[0.0], [1.0], [2.0], [3.0]], [0, 0, 1, 1])
+        assert linear.n_jobs is None
+        print("✅ Thread budget test passed")
+
+    def test_worker_options_split_budget(self):
+        """Worker processes share the cores, BLAS threads and memory budget evenly."""
+        resources = ResourceGovernor(total_cores=1, blas_threads=4, memory_limit_gb=6,
+                                     memory_limit_mode='address_space')
+        resources.total_cores = 8  # independent of the machine running the test
+        options = resources.worker_options(3)
+        assert options == {'total_cores': 2, 'blas_threads': 2, 'memory_limit_gb': 2.0,
+                           'memory_limit_mode': 'address_space'}
+        assert ResourceGovernor(**options).memory_limit_mode == 'address_space'
+        assert ResourceGovernor(total_cores=1).worker_options(4)['total_cores'] == 1
+
+        with pytest.raises(ValueError):
+            ResourceGovernor(memory_limit_mode='virtual')
+        print("✅ Worker options test passed")
+
+    @pytest.mark.skipif(sys.platform == 'win32', reason="RLIMIT_AS is POSIX only")
+    def test_memory_limit_modes(self):
+        """Only 'address_space' sets RLIMIT_AS; 'rss' leaves the address space uncapped."""
+        import resource
+        inherited = resource.getrlimit(resource.RLIMIT_AS)[0]
+        assert rlimit_after_apply('rss') == inherited
+        assert rlimit_after_apply('address_space') == 64 * 1024 ** 3
+        print("✅ Memory limit mode test passed")
@@ -0,0 +1,45 @@
+"""
+Unit tests for the columnar results store.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models.results_store import ResultsStore
+
+
+class TestResultsStore:
+    def test_columns_share_labels_and_round_trip(self, tmp_path):
+        """Results share one y_test, use compact dtypes and survive a spill/load round trip."""
+        y_test = np.array([0, 1, 1, 0, 1])
+        store = ResultsStore(spill_path=tmp_path)
+        store.add('Logistic Regression', y_test=y_test, predictions=[0, 1, 0, 0, 1],
+                  probabilities=[0.1, 0.9, 0.4, 0.2, 0.8], accuracy=0.8, cv_mean=0.75)
+        store.add('Random Forest', y_test=y_test, predictions=[0, 1, 1, 0, 1],
+                  probabilities=[0.2, 0.7, 0.6, 0.3, 0.9], feature_importance=[0.5, 0.5], accuracy=1.0, cv_mean=0.9)
+
+        result = store['Logistic Regression']
+        assert result['y_test'] is store['Random Forest']['y_test']
+        assert result['predictions'].dtype == np.int8 and result['probabilities'].dtype == np.float32
+
+        store.spill()
+        reloaded = ResultsStore.load(tmp_path)
+        assert list(reloaded) == ['Logistic Regression', 'Random Forest']
+        assert isinstance(reloaded['Random Forest']['probabilities'], np.memmap)
+        np.testing.assert_array_equal(reloaded['Random Forest']['y_test'], y_test)
+        assert reloaded.metrics_frame().set_index('model').loc['Random Forest', 'accuracy'] == 1.0
+        print("✅ Results store round-trip test passed")
+
+    def test_rejects_different_test_set(self):
+        """Results computed on another test set cannot share the store."""
+        store = ResultsStore()
+        store.add('A', y_test=[0, 1, 1], predictions=[0, 1, 1], accuracy=1.0)
+        with pytest.raises(ValueError):
+            store.add('B', y_test=[1, 1, 0], predictions=[1, 1, 0], accuracy=1.0)
+        print("✅ Test-set mismatch test passed")
@@ -0,0 +1,50 @@
+"""
+Tests for the stacked ensemble over cached out-of-fold predictions.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pytest
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models.stacking import StackedEnsemble
+
+
+def noisy_probabilities(y, noise, rng):
+    return np.clip(y + rng.normal(0, noise, len(y)), 0.01, 0.99)
+
+
+class TestStackedEnsemble:
+    def test_fit_blend_and_cache_checks(self, tmp_path):
+        """The meta-learner favours the better base model; blends and stale caches behave."""
+        rng = np.random.default_rng(0)
+        y_train, y_test = rng.integers(0, 2, 600), rng.integers(0, 2, 200)
+        ensemble = StackedEnsemble(tmp_path)
+        for name, noise in [('Good Model', 0.3), ('Weak Model', 0.9)]:
+            ensemble.save_predictions(name, noisy_probabilities(y_train, noise, rng),
+                                      noisy_probabilities(y_test, noise, rng), y_train, y_test, 'hash-a')
+
+        assert ensemble.has_predictions('Good Model', 'hash-a')
+        assert not ensemble.has_predictions('Good Model', 'hash-b')
+        assert not ensemble.has_predictions('Missing Model', 'hash-a')
+        assert ensemble.available_models() == ['good_model', 'weak_model']
+
+        ensemble.fit()
+        good, weak = ensemble.meta_learner.coef_[0]
+        assert good > weak
+        stacked = ensemble.evaluate(cv=3)
+        assert stacked['accuracy'] > 0.8 and len(stacked['predictions']) == 200
+
+        # A fixed blend is a weighted average of the base probabilities
+        ensemble.blend({'good_model': 3, 'weak_model': 1})
+        np.testing.assert_allclose(ensemble.predict_proba([[1.0, 0.0], [0.0, 1.0]]), [0.75, 0.25])
+
+        StackedEnsemble(tmp_path).save_predictions('Weak Model', np.zeros(600), np.zeros(200),
+                                                  y_train, y_test, 'hash-b')
+        with pytest.raises(ValueError):
+            ensemble.load_predictions(['good_model', 'weak_model'])
+        print("✅ Stacked ensemble test passed")
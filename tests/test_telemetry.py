@@ -0,0 +1,55 @@
+"""
+Unit tests for the training telemetry recorder.
+"""
+
+import sys
+import json
+from pathlib import Path
+import numpy as np
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.utils.telemetry import TrainingTelemetry
+
+
+class TestTrainingTelemetry:
+    def test_nested_phases_and_summary(self, tmp_path):
+        """Fold records nest inside a CV phase; the summary counts each phase once."""
+        telemetry = TrainingTelemetry(trace_memory=True)
+        with telemetry.measure('Model', 'fit', shape=(100, 4)) as stats:
+            stats['n_iterations'] = 7
+        with telemetry.measure('Model', 'cv'):
+            for fold in range(2):
+                with telemetry.measure('Model', 'fold', fold=fold):
+                    np.ones(1_000_000).sum()
+
+        fit, fold0, fold1, cv = telemetry.records
+        assert fit['rows'] == 100 and fit['columns'] == 4 and fit['n_iterations'] == 7
+        assert fold0['fold'] == 0 and fold0['peak_traced_mb'] >= 7
+        assert cv['peak_traced_mb'] >= fold0['peak_traced_mb'] - 0.1
+        assert cv['wall_seconds'] >= fold0['wall_seconds'] + fold1['wall_seconds']
+
+        summary = telemetry.summary()
+        assert summary.loc['Model', 'cv_seconds'] == cv['wall_seconds']
+        assert summary.loc['Model', 'n_iterations'] == 7
+
+        saved = json.loads(telemetry.save(tmp_path / 'telemetry.json').read_text())
+        assert len(saved['records']) == 4
+        print("✅ Telemetry nesting test passed")
+
+    def test_rss_over_budget_is_flagged(self):
+        """Top-level phases whose peak RSS exceeds the memory budget are flagged."""
+        telemetry = TrainingTelemetry(memory_budget_mb=1)
+        with telemetry.measure('Model', 'cv'):
+            with telemetry.measure('Model', 'fold', fold=0):
+                np.ones(1_000_000).sum()
+        fold, cv = telemetry.records
+        assert cv['over_memory_budget'] and 'over_memory_budget' not in fold
+
+        telemetry = TrainingTelemetry(memory_budget_mb=1_000_000)
+        with telemetry.measure('Model', 'fit'):
+            pass
+        assert 'over_memory_budget' not in telemetry.records[0]
+        print("✅ Memory budget check test passed")
@@ -0,0 +1,87 @@
+"""
+Tests for streaming top-K hit selection.
+"""
+
+import sys
+from pathlib import Path
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.serving.batch import BatchScorer
+from src.serving.topk import TopK, matching_rows
+
+
+def raw_songs(n, seed):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        column: rng.random(n) for column in
+        ['danceability', 'energy', 'valence', 'acousticness', 'instrumentalness', 'liveness', 'speechiness']
+    })
+    df['loudness'] = rng.normal(-8, 3, n)
+    df['tempo'] = rng.uniform(60, 180, n)
+    df['duration_ms'] = rng.integers(90000, 420000, n)
+    df['decade'] = rng.choice(['80s', '90s', '00s', '10s'], n)
+    df['track'] = [f'song {seed}-{i}' for i in range(n)]
+    df['target'] = ((df['danceability'] + df['energy'] > 1) ^ (rng.random(n) < 0.1)).astype(int)
+    return df
+
+
+class TestTopK:
+    def test_streamed_selection_matches_full_sort(self):
+        """Chunk-by-chunk selection equals sorting everything, ties going to earlier rows."""
+        rng = np.random.default_rng(0)
+        scores = pd.DataFrame({
+            'decade': rng.choice(['80s', '90s', '00s'], 5000),
+            'probability': rng.integers(0, 50, 5000) / 50  # many ties
+        })
+        selection = TopK(20, 'decade')
+        for start in range(0, len(scores), 700):
+            selection.push(TopK.select(scores.iloc[start:start + 700], 20, 'decade'))
+        table = selection.ranked()
+
+        expected = scores.sort_values('probability', ascending=False, kind='stable').groupby('decade').head(20)
+        for decade, rows in table.groupby('decade'):
+            assert list(rows.index) == list(expected[expected['decade'] == decade].index)
+            assert list(rows['rank']) == list(range(1, 21))
+
+        mask = matching_rows(scores, {'decade': ['80s']}, {'probability': (0.5, None)})
+        assert (scores[mask]['decade'] == '80s').all() and (scores[mask]['probability'] >= 0.5).all()
+        print("✅ Streaming top-K selection test passed")
+
+    def test_batch_top_k_matches_full_scoring(self, tmp_path):
+        """`BatchScorer.top_k` returns the best songs of a full scoring pass, per decade and filtered."""
+        train = raw_songs(500, 0)
+        fe = FeatureEngineer()
+        features = fe.create_features(train)
+        model = LogisticRegression(max_iter=1000).fit(features[fe.feature_columns].to_numpy(np.float32), train['target'])
+        (tmp_path / 'preprocessing').mkdir()
+        fe.save(tmp_path / 'preprocessing' / 'feature_engineer.pkl')
+        joblib.dump(model, tmp_path / 'logistic_regression.pkl')
+        catalog = tmp_path / 'catalog.csv'
+        raw_songs(3000, 1).drop(columns='target').to_csv(catalog, index=False)
+
+        scorer = BatchScorer('Logistic Regression', tmp_path, n_workers=1, chunk_rows=400)
+        scorer.score_csv(catalog, tmp_path / 'scores.csv')
+        full = pd.read_csv(tmp_path / 'scores.csv').merge(pd.read_csv(catalog)[['track', 'decade', 'tempo']], on='track')
+        full = full.sort_values('probability', ascending=False, kind='stable')
+
+        table, summary = scorer.top_k(catalog, k=25)
+        assert summary['rows'] == 3000 and summary['selected'] == 100
+        assert summary['worker_peak_memory_mb'] > 0
+        for decade, rows in table.groupby('decade'):
+            assert list(rows['track']) == list(full[full['decade'] == decade]['track'].head(25))
+
+        table, summary = scorer.top_k(catalog, k=10, partition=None, values={'decade': ['90s']},
+                                      ranges={'tempo': (100, 140)}, columns=['tempo'])
+        candidates = full[(full['decade'] == '90s') & full['tempo'].between(100, 140)]
+        assert summary['rows'] == len(candidates)
+        assert list(table['track']) == list(candidates['track'].head(10))
+        assert list(table['rank']) == list(range(1, 11))
+        print("✅ Batch top-K test passed")
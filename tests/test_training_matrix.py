@@ -0,0 +1,72 @@
+"""
+Unit tests for the float32 training matrix builder.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.preprocessing import StandardScaler
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models.training_matrix import TrainingMatrix
+
+
+def make_features(n=40):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'danceability': rng.random(n),
+        'energy': rng.random(n),
+        'decade_10s': rng.random(n) > 0.5,
+        'target': np.tile([0, 1], n // 2)
+    })
+    df.loc[3, 'energy'] = np.nan
+    return df
+
+
+class TestTrainingMatrix:
+    def test_split_matches_train_test_split(self):
+        """Train/test rows follow the stratified split and are views of one float32 array."""
+        df = make_features()
+        columns = ['danceability', 'energy', 'decade_10s']
+        matrix = TrainingMatrix.from_frame(df, columns)
+
+        train_idx, test_idx = train_test_split(
+            np.arange(len(df)), test_size=0.25, random_state=42, stratify=df['target']
+        )
+        assert matrix.X.dtype == np.float32 and matrix.X.flags['C_CONTIGUOUS']
+        assert np.shares_memory(matrix.X_train, matrix.X) and np.shares_memory(matrix.X_test, matrix.X)
+        np.testing.assert_array_equal(matrix.y_test, df['target'].to_numpy()[test_idx])
+        np.testing.assert_allclose(matrix.X_train[:, 0], df['danceability'].to_numpy()[train_idx], rtol=1e-6)
+        assert not np.isnan(matrix.X).any()
+        print("✅ Training matrix split test passed")
+
+    def test_missing_values_use_column_median(self):
+        """Missing values are filled with the column median."""
+        df = make_features()
+        matrix = TrainingMatrix.from_frame(df, ['energy'], train_indices=np.arange(len(df)), test_indices=[])
+        np.testing.assert_allclose(matrix.X[3, 0], df['energy'].median(), rtol=1e-6)
+        print("✅ Median fill test passed")
+
+    def test_scaled_buffer_and_folds(self):
+        """Scaling reuses one buffer and folds follow StratifiedKFold."""
+        df = make_features()
+        matrix = TrainingMatrix.from_frame(df, ['danceability', 'energy'])
+
+        X_train_scaled, _ = matrix.scaled(StandardScaler())
+        expected = StandardScaler().fit_transform(matrix.X_train.astype(np.float64))
+        np.testing.assert_allclose(X_train_scaled, expected, rtol=1e-4, atol=1e-5)
+        buffer = matrix._scaled
+        matrix.scaled(StandardScaler())
+        assert matrix._scaled is buffer
+
+        expected_folds = list(StratifiedKFold(n_splits=5).split(matrix.X_train, matrix.y_train))
+        for (X_fit, y_fit, X_val, y_val, val_idx), (fit_idx, expected_val) in zip(matrix.folds(5), expected_folds):
+            np.testing.assert_array_equal(val_idx, expected_val)
+            np.testing.assert_array_equal(X_fit, matrix.X_train[fit_idx])
+            np.testing.assert_array_equal(X_val, matrix.X_train[expected_val])
+        print("✅ Scaled buffer and fold test passed")
@@ -0,0 +1,44 @@
+"""
+Tests for skipping unchanged models on retraining.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.features.feature_engineer import FeatureEngineer
+from src.models.model_trainer import ModelTrainer
+from tests.test_top_k import raw_songs
+
+
+def retrained(caplog, features_df, models_path, **options):
+    """Train the logistic regression; True if it was fitted rather than loaded."""
+    caplog.clear()
+    with caplog.at_level(logging.INFO, logger='src.models.model_trainer'):
+        ModelTrainer(models_path=models_path, **options).train_all_models(
+            features_df, model_names=['Logistic Regression'])
+    return 'unchanged' not in caplog.text
+
+
+class TestTrainingSkip:
+    def test_changed_options_invalidate_skip(self, tmp_path, caplog):
+        """An unchanged run reuses the saved model; any changed trainer option retrains it."""
+        features_df = FeatureEngineer().create_features(raw_songs(400, 0))
+
+        assert retrained(caplog, features_df, tmp_path)
+        assert not retrained(caplog, features_df, tmp_path)
+        for option, value in [('validation_fraction', 0.2), ('early_stopping_rounds', 5),
+                              ('hist_boosting', True), ('early_stopping', False)]:
+            assert retrained(caplog, features_df, tmp_path, **{option: value}), option
+            # Back to the defaults: the artifact no longer matches them either
+            assert retrained(caplog, features_df, tmp_path)
+
+        # Kernel-cache options only concern the SVM
+        cached = ModelTrainer(svm_kernel_cache=True, kernel_memory_mb=512)
+        assert cached._training_options('SVM') != ModelTrainer()._training_options('SVM')
+        assert cached._training_options('Logistic Regression') == ModelTrainer()._training_options('Logistic Regression')
+        print("✅ Training skip invalidation test passed")
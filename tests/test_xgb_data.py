@@ -0,0 +1,42 @@
+"""
+Tests for the quantized XGBoost data cache.
+"""
+
+import sys
+from pathlib import Path
+import numpy as np
+from sklearn.datasets import make_classification
+import xgboost as xgb
+
+# Fix import path
+project_root = Path(__file__).parent.parent
+sys.path.append(str(project_root))
+
+from src.models.xgb_data import XGBDataCache
+
+
+class TestXGBDataCache:
+    def test_folds_are_built_once_and_match_fresh_matrices(self):
+        """CV folds are cached, binned with the base cuts and unaffected by the reused row buffer."""
+        X, y = make_classification(n_samples=900, n_features=8, random_state=0)
+        cache = XGBDataCache(X, y, nthread=1)
+
+        folds = cache.folds(3)
+        again = cache.folds(3)
+        for (fit, val, val_idx), (fit_again, val_again, _) in zip(folds, again):
+            assert fit is fit_again and val is val_again
+            assert fit.num_row() + val.num_row() == cache.n_rows == 900
+            assert val.num_row() == len(val_idx)
+        assert len(cache._subsets) == 6
+
+        # Later folds overwrite the shared buffer; the first fold's bins must be unchanged
+        fit, _, val_idx = folds[0]
+        fit_idx = np.setdiff1d(np.arange(900), val_idx)
+        fresh = xgb.QuantileDMatrix(cache.X[fit_idx], y[fit_idx], ref=cache.base, nthread=1)
+        params = {'objective': 'binary:logistic', 'nthread': 1, 'seed': 0}
+        cached_model = xgb.train(params, fit, num_boost_round=10)
+        fresh_model = xgb.train(params, fresh, num_boost_round=10)
+        test = xgb.DMatrix(cache.X)
+        np.testing.assert_array_equal(cached_model.predict(test), fresh_model.predict(test))
+        assert fit.get_quantile_cut()[1].tolist() == cache.base.get_quantile_cut()[1].tolist()
+        print("✅ XGBoost data cache test passed")